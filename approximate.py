@@ -0,0 +1,673 @@
+"""
+Модуль приближенной статистики по выборке вакансий.
+
+Выборка стратифицирована по годам: для каждого года хранится резервуар из
+случайных строк (StratifiedReservoir) и точное количество строк года. Средние,
+количества и доли оцениваются по формулам стратифицированной выборки, рядом с
+оценкой печатается половина 95% доверительного интервала. Медиана и перцентили
+считаются по выборке с границей ошибки ранга по неравенству
+Дворецкого-Кифера-Вольфовица, а при полном проходе по данным - по
+объединяемым скетчам KllSketch с границей ошибки ранга по неравенству Хефдинга
+"""
+
+import codecs
+import csv
+import math
+import numpy as np
+import pandas as pd
+import timestamps
+
+Z_95 = 1.959963984540054
+QUANTILES = (0.1, 0.5, 0.9)
+QUANTILE_CONFIDENCE = 0.99
+
+
+class KllSketch:
+    """
+    Объединяемый скетч квантилей KLL. Элементы уровня h имеют вес 2^h; при
+    переполнении уровня он сортируется, и каждый второй элемент со случайным
+    сдвигом переносится на следующий уровень. Каждое сжатие уровня h меняет ранг
+    любого значения на 0 или ±2^h с равной вероятностью, поэтому граница ошибки
+    ранга считается по сумме квадратов весов сжатий
+
+    Attributes:
+        k (int): Емкость верхнего уровня
+        count (int): Количество добавленных значений
+        levels (list): Массивы значений по уровням
+        squared_weights (int): Сумма квадратов весов выполненных сжатий
+    """
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self.squared_weights = 0
+        self.rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        """
+        Метод возвращает емкость уровня: чем ниже уровень, тем меньше емкость
+
+        Args:
+            level (int): Номер уровня
+
+        Returns:
+            (int): Емкость уровня
+        """
+        return max(2, math.ceil(self.k * (2 / 3) ** (len(self.levels) - level - 1)))
+
+    def update(self, values):
+        """
+        Метод добавляет значения в скетч, пропуски не учитываются
+
+        Args:
+            values (ndarray): Значения
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += len(values)
+        self.compress()
+
+    def merge(self, other):
+        """
+        Метод добавляет в скетч значения другого скетча
+
+        Args:
+            other (KllSketch): Скетч
+
+        Returns:
+            (KllSketch): Этот скетч
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.squared_weights += other.squared_weights
+        self.compress()
+        return self
+
+    def compress(self):
+        """
+        Метод сжимает переполненные уровни
+        """
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) <= self.capacity(level):
+                level += 1
+                continue
+            items = np.sort(self.levels[level])
+            leftover = items[len(items) - len(items) % 2:]
+            promoted = items[self.rng.integers(2):len(items) - len(leftover):2]
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            self.levels[level] = leftover
+            self.squared_weights += 4 ** level
+            level = 0
+
+    def rank_error(self, confidence=QUANTILE_CONFIDENCE):
+        """
+        Метод возвращает границу ошибки нормированного ранга
+
+        Args:
+            confidence (float): Доверительная вероятность
+
+        Returns:
+            (float): Ошибка ранга в долях от количества значений
+        """
+        if not self.count:
+            return 0.0
+        return math.sqrt(2 * self.squared_weights * math.log(2 / (1 - confidence))) / self.count
+
+    def quantiles(self, probabilities):
+        """
+        Метод оценивает квантили
+
+        Args:
+            probabilities (iterable): Уровни квантилей от 0 до 1
+
+        Returns:
+            (ndarray): Квантили, NaN для пустого скетча
+        """
+        probabilities = np.asarray(probabilities, dtype=float)
+        if not self.count:
+            return np.full(len(probabilities), np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level) for level, items in enumerate(self.levels)])
+        return weighted_quantiles(values, weights, probabilities)
+
+    def quantile_bounds(self, probabilities=QUANTILES, confidence=QUANTILE_CONFIDENCE):
+        """
+        Метод возвращает квантили и значения на границах ошибки ранга
+
+        Returns:
+            (ndarray, ndarray, ndarray, float): Квантили, нижние и верхние границы, ошибка ранга
+        """
+        return rank_bounds(self.quantiles, probabilities, self.rank_error(confidence))
+
+
+class StratifiedReservoir:
+    """
+    Стратифицированная выборка: для каждой страты хранятся строки с наименьшими
+    случайными приоритетами. Это равномерная выборка без возвращения из строк
+    страты, и две выборки объединяются без повторного чтения данных
+
+    Attributes:
+        capacity (int): Количество строк выборки в страте
+        population (dict): Страта -> количество просмотренных строк
+        keys (dict): Страта -> приоритеты строк выборки
+        columns (dict): Страта -> словарь колонок строк выборки
+    """
+    def __init__(self, capacity, seed=None):
+        self.capacity = capacity
+        self.population = {}
+        self.keys = {}
+        self.columns = {}
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, strata, **columns):
+        """
+        Метод просматривает строки и оставляет в выборке случайные из них
+
+        Args:
+            strata (ndarray): Страта каждой строки
+            **columns (ndarray): Колонки строк
+        """
+        strata = np.asarray(strata)
+        keys = self.rng.random(len(strata))
+        codes, uniques = factorize(strata)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for code, stratum in enumerate(uniques.tolist()):
+            rows = order[bounds[code]:bounds[code + 1]]
+            self.population[stratum] = self.population.get(stratum, 0) + len(rows)
+            self.keep(stratum, keys[rows], {name: np.asarray(values)[rows] for name, values in columns.items()})
+
+    def keep(self, stratum, keys, columns):
+        """
+        Метод объединяет строки с выборкой страты и оставляет capacity строк с
+        наименьшими приоритетами
+
+        Args:
+            stratum: Страта
+            keys (ndarray): Приоритеты строк
+            columns (dict): Колонки строк
+        """
+        if stratum in self.keys:
+            keys = np.concatenate([self.keys[stratum], keys])
+            columns = {name: np.concatenate([self.columns[stratum][name], values]) for name, values in columns.items()}
+        if len(keys) > self.capacity:
+            rows = np.argpartition(keys, self.capacity - 1)[:self.capacity]
+            keys = keys[rows]
+            columns = {name: values[rows] for name, values in columns.items()}
+        self.keys[stratum] = keys
+        self.columns[stratum] = columns
+
+    def merge(self, other):
+        """
+        Метод объединяет выборку с выборкой другой части данных
+
+        Args:
+            other (StratifiedReservoir): Выборка с той же емкостью и колонками
+
+        Returns:
+            (StratifiedReservoir): Эта выборка
+        """
+        for stratum, keys in other.keys.items():
+            self.population[stratum] = self.population.get(stratum, 0) + other.population[stratum]
+            self.keep(stratum, keys, other.columns[stratum])
+        return self
+
+    def sample(self):
+        """
+        Метод возвращает строки выборки
+
+        Returns:
+            (list, ndarray, ndarray, dict): Страты в порядке появления, коды страт
+            строк выборки, количество строк каждой страты и колонки выборки
+        """
+        strata = list(self.keys)
+        codes = np.repeat(np.arange(len(strata)), [len(self.keys[stratum]) for stratum in strata])
+        names = next(iter(self.columns.values())).keys() if self.columns else []
+        columns = {name: np.concatenate([self.columns[stratum][name] for stratum in strata]) for name in names}
+        return strata, codes, np.array([self.population[stratum] for stratum in strata]), columns
+
+
+def factorize(values):
+    """
+    Функция кодирует значения в порядке первого появления, пропуски получают код -1
+
+    Args:
+        values (ndarray): Значения
+
+    Returns:
+        (ndarray, ndarray): Коды и уникальные значения
+
+    >>> factorize(np.array([2021, 2020, 2021]))
+    (array([0, 1, 0]), array([2021, 2020]))
+    """
+    codes, uniques = pd.factorize(values)
+    return codes.astype(np.int64), np.asarray(uniques)
+
+
+def group_sketches(codes, keys, values, k=200, seed=0):
+    """
+    Функция строит скетч KllSketch значений каждой группы
+
+    Args:
+        codes (ndarray): Коды групп строк, -1 - строка вне групп
+        keys (list): Значения кодов
+        values (ndarray): Значения строк
+        k (int): Емкость верхнего уровня скетчей
+        seed (int or SeedSequence): Зерно, из которого np.random.SeedSequence
+            порождает независимое зерно каждого скетча
+
+    Returns:
+        (dict): Значение кода -> скетч, только для кодов со строками
+    """
+    seeds = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(keys) + 1))
+    sketches = {}
+    for code, key in enumerate(keys):
+        if bounds[code + 1] > bounds[code]:
+            sketches[key] = KllSketch(k, seeds.spawn(1)[0])
+            sketches[key].update(values[order[bounds[code]:bounds[code + 1]]])
+    return sketches
+
+
+def weighted_quantiles(values, weights, probabilities):
+    """
+    Функция считает квантили значений с весами
+
+    Args:
+        values (ndarray): Значения
+        weights (ndarray): Веса значений
+        probabilities (ndarray): Уровни квантилей
+
+    Returns:
+        (ndarray): Наименьшие значения, доля веса не больших которых не меньше уровня
+
+    >>> weighted_quantiles(np.array([3.0, 1.0, 2.0]), np.array([1.0, 1.0, 2.0]), np.array([0.25, 0.5, 1.0]))
+    array([1., 2., 3.])
+    """
+    order = np.argsort(values, kind='stable')
+    cumulative = np.cumsum(weights[order])
+    positions = np.searchsorted(cumulative, np.asarray(probabilities) * cumulative[-1] * (1 - 1e-12))
+    return values[order][np.minimum(positions, len(values) - 1)]
+
+
+def rank_bounds(quantiles, probabilities, error):
+    """
+    Функция возвращает квантили и значения на границах ошибки ранга
+
+    Args:
+        quantiles (function): Функция уровней -> квантили
+        probabilities (iterable): Уровни квантилей
+        error (float): Ошибка нормированного ранга
+
+    Returns:
+        (ndarray, ndarray, ndarray, float): Квантили, нижние и верхние границы, ошибка ранга
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    return (quantiles(probabilities), quantiles(np.clip(probabilities - error, 0, 1)),
+            quantiles(np.clip(probabilities + error, 0, 1)), error)
+
+
+def sample_quantile_bounds(values, weights, probabilities=QUANTILES, confidence=QUANTILE_CONFIDENCE):
+    """
+    Функция оценивает квантили по выборке с весами. Граница ошибки ранга - по
+    неравенству Дворецкого-Кифера-Вольфовица для эффективного размера выборки с
+    поправкой на конечность совокупности sqrt(1 - n/N): если выборка содержит все
+    строки (все веса равны 1), ошибка нулевая
+
+    Args:
+        values (ndarray): Значения выборки, NaN пропускаются
+        weights (ndarray): Веса строк выборки
+        probabilities (iterable): Уровни квантилей
+        confidence (float): Доверительная вероятность
+
+    Returns:
+        (ndarray, ndarray, ndarray, float): Квантили, нижние и верхние границы, ошибка ранга
+    """
+    valid = ~np.isnan(values)
+    values, weights = values[valid], weights[valid]
+    if not len(values):
+        nan = np.full(len(probabilities), np.nan)
+        return nan, nan, nan, 1.0
+    effective = weights.sum() ** 2 / (weights ** 2).sum()
+    correction = max(0.0, 1 - len(values) / weights.sum())
+    error = math.sqrt(math.log(2 / (1 - confidence)) / (2 * effective) * correction)
+    return rank_bounds(lambda levels: weighted_quantiles(values, weights, levels), probabilities, error)
+
+
+def domain_estimates(strata, population, domains, domain_count, values=None):
+    """
+    Функция оценивает количество строк и среднее значение в доменах (годах,
+    городах, профессиях) по стратифицированной выборке. Домен может пересекать
+    страты; среднее оценивается как отношение взвешенных сумм, его дисперсия - по
+    линеаризации
+
+    Args:
+        strata (ndarray): Код страты каждой строки выборки
+        population (ndarray): Количество строк каждой страты
+        domains (ndarray): Код домена каждой строки выборки, -1 - строка вне доменов
+        domain_count (int): Количество доменов
+        values (ndarray or None): Значения строк выборки, NaN не входят в среднее
+
+    Returns:
+        (ndarray, ndarray, ndarray, ndarray): Оценки количества строк и половины их
+        95% интервалов, оценки средних и половины их 95% интервалов (средние - если
+        переданы values)
+    """
+    if domain_count == 0:
+        empty = np.zeros(0)
+        return empty, empty, None if values is None else empty, None if values is None else empty
+    population = np.asarray(population, dtype=float)
+    sizes = np.bincount(strata, minlength=len(population)).astype(float)
+    weights = np.divide(population, sizes, out=np.zeros_like(population), where=sizes > 0)
+    # Множитель дисперсии страты: N^2 (1 - n/N) / n
+    factors = np.divide(population ** 2 * (1 - sizes / np.maximum(population, 1)), sizes,
+                        out=np.zeros_like(population), where=sizes > 0)
+
+    def cells(mask, column=None):
+        index = strata[mask] * domain_count + domains[mask]
+        data = None if column is None else column[mask]
+        return np.bincount(index, weights=data, minlength=len(population) * domain_count).astype(float).reshape(
+            len(population), domain_count)
+
+    def variance(sums, squares):
+        centered = squares - np.divide(sums ** 2, sizes[:, None], out=np.zeros_like(sums),
+                                       where=sizes[:, None] > 0)
+        spread = np.divide(centered, sizes[:, None] - 1, out=np.zeros_like(sums), where=sizes[:, None] > 1)
+        return (factors[:, None] * np.maximum(spread, 0)).sum(axis=0)
+
+    in_domain = domains >= 0
+    counts = cells(in_domain)
+    totals = (weights[:, None] * counts).sum(axis=0)
+    # Для индикатора домена сумма квадратов совпадает с суммой
+    total_errors = Z_95 * np.sqrt(variance(counts, counts))
+    if values is None:
+        return totals, total_errors, None, None
+
+    values = np.asarray(values, dtype=float)
+    valid = in_domain & ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    value_totals = (weights[:, None] * cells(valid)).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (weights[:, None] * cells(valid, filled)).sum(axis=0) / value_totals
+    deviations = np.where(valid, filled - np.nan_to_num(means)[np.maximum(domains, 0)], 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_errors = Z_95 * np.sqrt(variance(cells(valid, deviations), cells(valid, deviations ** 2))) / value_totals
+    return totals, total_errors, means, mean_errors
+
+
+def stratified_statistics(strata, population, year_codes, years, salary, cities, job_masks, share=0.01, limit=10,
+                          sketches=None):
+    """
+    Функция считает приближенную статистику по стратифицированной выборке:
+    средние зарплаты и количество вакансий по годам и для профессий, уровень
+    зарплат и доли вакансий крупнейших городов, медиану и перцентили по годам и
+    городам
+
+    Args:
+        strata (ndarray): Код страты каждой строки выборки
+        population (ndarray): Количество строк каждой страты
+        year_codes (ndarray): Код года каждой строки выборки; если страты - годы,
+            совпадает со strata, и количество вакансий по годам известно точно
+        years (list): Годы в порядке кодов
+        salary (ndarray): Зарплаты строк выборки, NaN - зарплата не указана
+        cities (ndarray): Город каждой строки выборки
+        job_masks (dict): Профессия -> маска строк выборки
+        share (float): Минимальная доля вакансий города
+        limit (int): Количество городов
+        sketches (dict or None): Скетчи KllSketch по годам ('years') и городам
+            ('cities'), построенные по всем строкам. Квантили года или города без
+            скетча оцениваются по выборке
+
+    Returns:
+        (dict): Оценки и половины 95% интервалов, квантили с границами и размеры
+        выборки; ключи описаны в print_statistics
+    """
+    population = np.asarray(population)
+    sizes = np.bincount(strata, minlength=len(population))
+    weights = np.divide(population, sizes, out=np.zeros(len(population)), where=sizes > 0)[strata]
+    year_totals, year_total_errors, year_means, year_errors = domain_estimates(
+        strata, population, year_codes, len(years), salary)
+    city_codes, city_names = factorize(np.asarray(cities, dtype=object))
+    city_totals, city_total_errors, city_means, city_errors = domain_estimates(
+        strata, population, city_codes, len(city_names), salary)
+    count = population.sum()
+
+    order = np.lexsort((np.arange(len(city_names)), -city_totals))
+    top = [code for code in order if city_totals[code] / count > share][:limit]
+    top_by_salary = sorted(top, key=lambda code: -np.nan_to_num(city_means[code]))
+
+    jobs = {}
+    for job_name, mask in job_masks.items():
+        job_domains = np.where(mask, year_codes, -1)
+        totals, total_errors, means, errors = domain_estimates(strata, population, job_domains, len(years), salary)
+        jobs[job_name] = {'salary': dict(zip(years, zip(means, errors))),
+                          'count': dict(zip(years, zip(totals, total_errors)))}
+
+    if sketches is None:
+        sketches = {'years': {}, 'cities': {}}
+    year_quantiles = {}
+    for code, year in enumerate(years):
+        sketch = sketches['years'].get(year)
+        rows = year_codes == code
+        year_quantiles[year] = sketch.quantile_bounds() if sketch else sample_quantile_bounds(salary[rows],
+                                                                                              weights[rows])
+    city_quantiles = {}
+    for code in top:
+        sketch = sketches['cities'].get(city_names[code])
+        rows = city_codes == code
+        city_quantiles[city_names[code]] = sketch.quantile_bounds() if sketch else sample_quantile_bounds(
+            salary[rows], weights[rows])
+
+    return {'years': years,
+            'salary_by_years': dict(zip(years, zip(year_means, year_errors))),
+            'vacs_by_years': dict(zip(years, zip(year_totals, year_total_errors))),
+            'jobs': jobs,
+            'salary_by_cities': {city_names[code]: (city_means[code], city_errors[code]) for code in top_by_salary},
+            'vacs_by_cities': {city_names[code]: (city_totals[code] / count, city_total_errors[code] / count)
+                               for code in top},
+            'quantiles_by_years': year_quantiles,
+            'quantiles_by_cities': city_quantiles,
+            'sample_size': int(len(strata)),
+            'population': int(count)}
+
+
+def format_estimate(value, error, digits=0):
+    """
+    Функция форматирует оценку с половиной доверительного интервала
+
+    Args:
+        value (float): Оценка
+        error (float): Половина интервала
+        digits (int): Количество знаков после запятой
+
+    Returns:
+        (str): Оценка вида 41230 ± 830, 0 для пустой оценки
+
+    >>> format_estimate(41230.7, 829.6), format_estimate(0.31234, 0.00123, 4), format_estimate(float('nan'), 0)
+    ('41230 ± 830', '0.3123 ± 0.0012', '0')
+    """
+    if np.isnan(value):
+        return '0'
+    if digits == 0:
+        return f'{int(value)} ± {int(round(error if not np.isnan(error) else 0))}'
+    return f'{value:.{digits}f} ± {error:.{digits}f}'
+
+
+def format_count(value, error):
+    """
+    Функция форматирует оценку количества: точное количество печатается без интервала
+
+    Args:
+        value (float): Оценка
+        error (float): Половина интервала
+
+    Returns:
+        (int or str): Количество или оценка с интервалом
+
+    >>> format_count(120.0, 0.0), format_count(120.4, 15.2)
+    (120, '120 ± 15')
+    """
+    return int(round(value)) if error == 0 else format_estimate(round(value), error)
+
+
+def format_quantiles(bounds):
+    """
+    Функция форматирует p10, медиану и p90 с границами
+
+    Args:
+        bounds (tuple): Результат quantile_bounds
+
+    Returns:
+        (str): Квантили вида p10 20000 [19500..20400], медиана ..., ранг ±1.2%
+    """
+    values, lower, upper, error = bounds
+    if np.isnan(values).all():
+        return 'нет данных'
+    parts = [f'{name} {int(value)} [{int(low)}..{int(high)}]'
+             for name, value, low, high in zip(('p10', 'медиана', 'p90'), values, lower, upper)]
+    return ', '.join(parts) + f', ранг ±{error:.1%}'
+
+
+def print_statistics(result, job_name):
+    """
+    Функция печатает приближенную статистику в порядке отчетов report_out
+
+    Args:
+        result (dict): Результат stratified_statistics
+        job_name (str): Профессия
+    """
+    job = result['jobs'][job_name]
+    print('Приближенная статистика: выборка', result['sample_size'], 'из', result['population'],
+          'строк, рядом с оценками - половина 95% доверительного интервала')
+    print('Динамика уровня зарплат по годам:',
+          {year: format_estimate(*value) for year, value in result['salary_by_years'].items()})
+    print('Динамика количества вакансий по годам:',
+          {year: format_count(*value) for year, value in result['vacs_by_years'].items()})
+    print('Динамика уровня зарплат по годам для выбранной профессии:',
+          {year: format_estimate(*value) for year, value in job['salary'].items()})
+    print('Динамика количества вакансий по годам для выбранной профессии:',
+          {year: format_estimate(*value) for year, value in job['count'].items()})
+    print('Уровень зарплат по городам (в порядке убывания):',
+          {city: format_estimate(*value) for city, value in result['salary_by_cities'].items()})
+    print('Доля вакансий по городам (в порядке убывания):',
+          {city: format_estimate(*value, digits=4) for city, value in result['vacs_by_cities'].items()})
+    print(f'Медиана и перцентили зарплат по годам ({QUANTILE_CONFIDENCE:.0%} границы):')
+    for year, bounds in result['quantiles_by_years'].items():
+        print(f'  {year}: {format_quantiles(bounds)}')
+    print(f'Медиана и перцентили зарплат по городам ({QUANTILE_CONFIDENCE:.0%} границы):')
+    for city, bounds in result['quantiles_by_cities'].items():
+        print(f'  {city}: {format_quantiles(bounds)}')
+
+
+def sample_csv(file_name, capacity, seed=0):
+    """
+    Функция выбирает по capacity случайных строк CSV с вакансиями для каждого года
+    публикации, не разбирая остальные строки. Как и report_out_old.DataSet.read_csv,
+    строки с пустыми полями или другим количеством полей пропускаются. Если файл
+    без кавычек и дата публикации - последняя колонка, границы строк, проверки и
+    годы считаются по байтам файла средствами NumPy
+
+    Args:
+        file_name (str): Имя файла
+        capacity (int): Количество строк выборки в каждом году
+        seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        (list, list, dict): Названия колонок, строки выборки и количество
+        подходящих строк каждого года
+    """
+    with open(file_name, 'rb') as file:
+        data = file.read()
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+    header_end = data.find(b'\n')
+    if header_end < 0:
+        header_end = len(data)
+    columns = next(csv.reader([data[:header_end].decode('utf-8').rstrip('\r')]), [])
+    reservoir = StratifiedReservoir(capacity, seed)
+    if not columns:
+        return columns, [], reservoir.population
+
+    fast = columns[-1] == 'published_at' and b'"' not in data
+    if fast:
+        starts, ends, valid = line_bounds(data, header_end, len(columns))
+        years = line_years(data, ends[valid])
+        fast = years is not None
+    if fast:
+        lines = np.flatnonzero(valid)
+        reservoir.add(years, line=lines)
+        _, _, _, sample = reservoir.sample()
+        rows = [next(csv.reader([data[starts[line]:ends[line]].decode('utf-8')])) for line in sample['line']]
+        return columns, rows, reservoir.population
+
+    rows = [row for row in csv.reader(data[header_end + 1:].decode('utf-8').splitlines())
+            if len(row) == len(columns) and row.count('') == 0]
+    published = columns.index('published_at')
+    reservoir.add(np.array([timestamps.parse(row[published])[1] for row in rows], dtype=np.int64),
+                  line=np.arange(len(rows)))
+    _, _, _, sample = reservoir.sample()
+    return columns, [rows[line] for line in sample['line']], reservoir.population
+
+
+def line_bounds(data, header_end, column_count):
+    """
+    Функция находит границы строк файла без кавычек и проверяет их так же, как
+    report_out_old.DataSet.read_csv
+
+    Args:
+        data (bytes): Содержимое файла
+        header_end (int): Позиция конца строки заголовка
+        column_count (int): Количество колонок
+
+    Returns:
+        (ndarray, ndarray, ndarray): Начала и концы строк (без перевода строки) и
+        маска строк с нужным количеством непустых полей
+    """
+    array = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(array == ord('\n'))
+    newlines = newlines[newlines > header_end]
+    starts = np.concatenate([[header_end + 1], newlines + 1])
+    ends = np.concatenate([newlines, [len(array)]])
+    starts, ends = starts[starts < len(array)], ends[starts < len(array)]
+    ends = ends - ((ends > starts) & (array[np.maximum(ends - 1, 0)] == ord('\r')))
+
+    commas = np.flatnonzero(array == ord(','))
+    commas = commas[commas > header_end]
+    comma_lines = np.searchsorted(starts, commas, side='right') - 1
+    valid = (ends > starts) & (np.bincount(comma_lines, minlength=len(starts)) == column_count - 1)
+    # Пустое поле - запятая в начале или в конце строки или две запятые подряд
+    non_empty = ends > starts
+    valid[non_empty] &= (array[starts[non_empty]] != ord(',')) & (array[ends[non_empty] - 1] != ord(','))
+    valid[comma_lines[1:][np.diff(commas) == 1]] = False
+    return starts, ends, valid
+
+
+def line_years(data, ends):
+    """
+    Функция читает год из даты публикации вида 2022-05-31T17:32:31+0300 в конце строк
+
+    Args:
+        data (bytes): Содержимое файла
+        ends (ndarray): Концы строк
+
+    Returns:
+        (ndarray or None): Годы или None, если дата хотя бы одной строки в другом формате
+    """
+    array = np.frombuffer(data, dtype=np.uint8)
+    if len(ends) and ends.min() < 25:
+        return None
+    date_start = ends - 24
+    separators = ((array[date_start - 1] == ord(',')) & (array[date_start + 4] == ord('-'))
+                  & (array[date_start + 10] == ord('T')))
+    digits = np.stack([array[date_start + i].astype(np.int64) - ord('0') for i in range(4)])
+    if not separators.all() or ((digits < 0) | (digits > 9)).any():
+        return None
+    return digits[0] * 1000 + digits[1] * 100 + digits[2] * 10 + digits[3]
@@ -0,0 +1,4 @@
+"""
+Пакет с замерами производительности модулей проекта.
+Скрипты запускаются из корня репозитория: python -m benchmarks.<имя>
+"""
@@ -0,0 +1,68 @@
+"""
+Замер статистики task3.4.2 по vacancies_new.csv: загрузка файла целиком и
+get_statistics против чтения по частям get_chunked_statistics. Печатается время,
+пик памяти Python по tracemalloc и совпадение результатов
+
+Запуск: python -m benchmarks.bench_chunked_report --rows 2000000 --chunksize 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import cli
+import timestamps
+import vacancy_schema
+from benchmarks.synthetic import write_csv
+
+JOB_NAME = 'Программист'
+
+
+def full_statistics(task, file_name):
+    """
+    Функция считает статистику по файлу, загруженному целиком, как load_vacancies
+    """
+    df = vacancy_schema.read_csv(file_name, 'task3_4_2')
+    df['published_at'] = timestamps.parse_column(df['published_at'])[1].astype(str)
+    return task.get_statistics(df, JOB_NAME)
+
+
+def measure(function):
+    """
+    Функция измеряет время и отдельным запуском под tracemalloc - пиковую память
+
+    Returns:
+        (object, float, float): Результат, время в секундах и пик памяти в мегабайтах
+    """
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер статистики task3.4.2 по частям')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunksize', type=int, default=200_000)
+    args = parser.parse_args()
+
+    task = cli.load_script('task3.4.2.py', 'task3_4_2')
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, 'vacancies_new.csv')
+        write_csv(file_name, args.rows, schema='converted')
+        full, full_seconds, full_peak = measure(lambda: full_statistics(task, file_name))
+        chunks = task.VacancyChunks(file_name, args.chunksize)
+        chunked, chunked_seconds, chunked_peak = measure(
+            lambda: task.get_chunked_statistics(chunks, [JOB_NAME], regex=True)[JOB_NAME])
+    print(f'целиком ({args.rows} строк): {full_seconds:.2f} с, пик памяти {full_peak:.1f} МБ')
+    print(f'по {args.chunksize} строк: {chunked_seconds:.2f} с, пик памяти {chunked_peak:.1f} МБ')
+    print('результаты совпадают' if full == chunked else 'РЕЗУЛЬТАТЫ РАЗЛИЧАЮТСЯ')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Замер формирования xlsx отчета: обычная книга openpyxl (generate_excel)
+против режима write_only (generate_excel_stream) на большом количестве строк.
+
+Запуск: python -m benchmarks.bench_excel --rows 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from report_out_old import Report
+
+
+def synthetic_data_list(rows):
+    """
+    Функция создает статистику с заданным количеством строк на каждой вкладке
+
+    Args:
+        rows (int): Количество строк
+
+    Returns:
+        (list): Список словарей в формате InputConnect.get_statistics
+    """
+    keys = list(range(rows))
+    cities = [f'Город {i}' for i in range(rows)]
+    return [{key: 50000 + key % 1000 for key in keys}, {key: key % 500 for key in keys},
+            {key: 60000 + key % 700 for key in keys}, {key: key % 50 for key in keys},
+            {city: 40000 + i % 900 for i, city in enumerate(cities)},
+            {city: round(1 / (i + 2), 4) for i, city in enumerate(cities)}]
+
+
+def measure(method, memory=True):
+    """
+    Функция измеряет время формирования отчета и отдельным запуском под
+    tracemalloc - пиковую память Python (tracemalloc сильно замедляет код)
+
+    Returns:
+        (float, float or None): Время в секундах и пик памяти в мегабайтах
+    """
+    start = time.perf_counter()
+    method()
+    seconds = time.perf_counter() - start
+    if not memory:
+        return seconds, None
+    tracemalloc.start()
+    method()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер формирования xlsx')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--no-memory', action='store_true', help='Не замерять память')
+    args = parser.parse_args()
+
+    Report.set_data(synthetic_data_list(args.rows), 'Программист')
+    with tempfile.TemporaryDirectory() as directory:
+        current = os.getcwd()
+        os.chdir(directory)
+        try:
+            for name, method in (('generate_excel', Report.generate_excel),
+                                 ('generate_excel_stream', Report.generate_excel_stream)):
+                seconds, peak = measure(method, not args.no_memory)
+                line = f'{name} ({args.rows} строк): {seconds:.2f} с'
+                if peak is not None:
+                    line += f', пик памяти {peak:.1f} МБ'
+                print(line)
+        finally:
+            os.chdir(current)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Регрессионный замер повторного использования масок в report_out и task3.4.2.
+
+Сравниваются прежние реализации (маска по названию считалась дважды, каждый
+год и каждый город отбирались отдельным проходом по таблице) и текущие функции
+на одном и том же синтетическом файле.
+
+Запуск: python -m benchmarks.bench_masks --rows 5000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import report_out
+from benchmarks.synthetic import write_csv
+from cli import load_script
+
+JOB_NAME = 'Программист'
+
+
+def old_year_statistics(df, job_name):
+    """
+    Прежняя реализация new_prepare_data после чтения файла: две проверки
+    str.contains для средней зарплаты и количества
+    """
+    job_salary = df[df['name'].str.contains(job_name)]['salary'].mean()
+    return [int(df['salary'].mean()), len(df), 0 if np.isnan(job_salary) else int(job_salary),
+            len(df[df['name'].str.contains(job_name)])]
+
+
+def new_year_statistics(df, job_name):
+    """
+    Одна маска по названию для средней зарплаты и количества, как в new_prepare_data
+    """
+    job_salary = df.loc[df['name'].str.contains(job_name), 'salary']
+    return [int(df['salary'].mean()), len(df), report_out.mean_to_number(job_salary.mean()), len(job_salary)]
+
+
+def old_report_statistics(df, job_name):
+    """
+    Прежняя реализация task3.4.2.create_report: фильтрация всей таблицы для каждого
+    года и два отбора по каждому из десяти городов
+    """
+    years = df['published_at'].unique()
+    result = []
+    for year in years:
+        year_df = df[df['published_at'] == year]
+        job_salary = year_df[year_df['name'].str.contains(job_name)]['salary'].mean()
+        result.append((year, int(year_df['salary'].mean()), len(year_df),
+                       0 if np.isnan(job_salary) else int(job_salary),
+                       len(year_df[year_df['name'].str.contains(job_name)])))
+    area = df['area_name'].value_counts().to_dict()
+    vacs_sum = len(df)
+    result_city = [city for city in area.keys() if area[city] / vacs_sum > 0.01]
+    for city in result_city[:10]:
+        result.append((city, df[df['area_name'] == city]['salary'].mean(),
+                       round((len(df[df['area_name'] == city]) / vacs_sum), 4)))
+    return result
+
+
+def measure(function, *args):
+    """
+    Функция измеряет время выполнения
+
+    Returns:
+        (float): Время в секундах
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер повторного использования масок')
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    args = parser.parse_args()
+    task = load_script('task3.4.2.py', 'task3_4_2')
+
+    with tempfile.TemporaryDirectory() as directory:
+        raw_file = os.path.join(directory, 'raw.csv')
+        converted_file = os.path.join(directory, 'converted.csv')
+        write_csv(raw_file, args.rows, schema='raw')
+        write_csv(converted_file, args.rows, schema='converted')
+
+        df = pd.read_csv(raw_file)
+        df['salary_from'] = df['salary_currency'].map(report_out.currency_to_rub) * df['salary_from']
+        df['salary_to'] = df['salary_currency'].map(report_out.currency_to_rub) * df['salary_to']
+        df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
+        old = measure(old_year_statistics, df, JOB_NAME)
+        new = measure(new_year_statistics, df, JOB_NAME)
+        print(f'report_out.new_prepare_data ({args.rows} строк): '
+              f'было {old:.2f} с (2 прохода по названиям), стало {new:.2f} с (1 проход)')
+
+        df = pd.read_csv(converted_file)
+        df['published_at'] = df['published_at'].str[:4]
+        years = df['published_at'].nunique()
+        old = measure(old_report_statistics, df, JOB_NAME)
+        new = measure(task.get_statistics, df, JOB_NAME)
+        print(f'task3.4.2.get_statistics ({args.rows} строк, {years} лет): '
+              f'было {old:.2f} с ({years * 3 + 20} проходов), стало {new:.2f} с (группировки по годам и городам)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Замер multiproc_report_out.MultiInputConnect против однопроцессного
+report_out_old на одних данных: синтетический файл делится на файлы годов
+report_out.InputConnect.split_data, затем для нескольких размеров пула
+печатается время, ускорение и совпадение результатов
+
+Запуск: python -m benchmarks.bench_multiproc --rows 1000000 --processes 1 2 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import pandas as pd
+import report_out
+from benchmarks.synthetic import write_csv
+from multiproc_report_out import compare
+
+JOB_NAMES = ['Программист', 'Аналитик']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер пула процессов против report_out_old')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--chunksize', type=int)
+    args = parser.parse_args()
+
+    start_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            write_csv('raw.csv', args.rows, schema='raw')
+            report_out.InputConnect.split_data(pd.read_csv('raw.csv'))
+            for processes in args.processes:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    pool_seconds, single_seconds, same = compare('csv_files', 'raw.csv', JOB_NAMES, processes,
+                                                                 args.chunksize)
+                print(f'{processes} проц.: пул {pool_seconds:.2f} с, report_out_old {single_seconds:.2f} с, '
+                      f'ускорение {single_seconds / pool_seconds:.2f}x, {"совпадает" if same else "НЕ СОВПАДАЕТ"}')
+        finally:
+            os.chdir(start_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Замер расчета статистики по файлам годов report_out.new_prepare_data.
+
+Прежняя реализация читала файл года целиком, дважды переводила зарплаты в
+рубли через map и считала середину вилки построчным mean(axis=1) по
+временной таблице. Текущая читает только нужные колонки с заданными типами и
+считает середину вилки по массивам NumPy. Для каждого года печатается время
+обеих реализаций, ускорение и совпадение результатов
+
+Запуск: python -m benchmarks.bench_partitions --rows 2000000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+import report_out
+from benchmarks.synthetic import write_csv
+
+JOB_NAME = 'Программист'
+
+
+def old_prepare_data(args):
+    """
+    Прежняя реализация new_prepare_data
+    """
+    df = pd.read_csv(args[0])
+    df['salary_from'] = df['salary_currency'].map(report_out.currency_to_rub) * df['salary_from']
+    df['salary_to'] = df['salary_currency'].map(report_out.currency_to_rub) * df['salary_to']
+    df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
+    year = df['published_at'].values[0]
+    job_salary = df[df['name'].str.contains(args[1])]['salary'].mean()
+    return [year, int(df['salary'].mean()), len(df), report_out.mean_to_number(job_salary),
+            len(df[df['name'].str.contains(args[1])])]
+
+
+def measure(function, args, repeat):
+    """
+    Функция возвращает результат и лучшее время из нескольких запусков
+
+    Returns:
+        (list, float): Результат функции и время в секундах
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(args)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер расчета статистики по файлам годов')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    start_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            write_csv('raw.csv', args.rows, schema='raw')
+            report_out.InputConnect.split_data(pd.read_csv('raw.csv'))
+            total_old = total_new = 0
+            print(f'{"Файл":<16}{"строк":>9}{"было, с":>10}{"стало, с":>10}{"ускорение":>11}  совпадает')
+            for file in sorted(os.listdir('csv_files')):
+                partition = (os.path.join('csv_files', file), JOB_NAME)
+                old, old_seconds = measure(old_prepare_data, partition, args.repeat)
+                new, new_seconds = measure(report_out.new_prepare_data, partition, args.repeat)
+                total_old += old_seconds
+                total_new += new_seconds
+                print(f'{file:<16}{new[2]:>9}{old_seconds:>10.3f}{new_seconds:>10.3f}'
+                      f'{old_seconds / new_seconds:>10.2f}x  {"да" if old == new else "НЕТ"}')
+            print(f'{"Всего":<25}{total_old:>10.3f}{total_new:>10.3f}{total_old / total_new:>10.2f}x')
+        finally:
+            os.chdir(start_dir)
+            shutil.rmtree(os.path.join(directory, 'csv_files'), ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Замер времени импорта для каждого режима main.py с помощью python -X importtime.
+Для режимов из FORBIDDEN проверяется, что тяжелые библиотеки не загружаются при
+импорте: если хотя бы одна попала в sys.modules, замер завершается с ошибкой.
+
+Запуск: python -m benchmarks.import_time
+"""
+
+import subprocess
+import sys
+
+# Режим main.py -> модули, которые он загружает
+MODES = {
+    'Вакансии': ['table_out'],
+    'Статистика': ['report_out_old'],
+    'Статистика + отчеты': ['report_out_old', 'matplotlib.pyplot', 'numpy', 'openpyxl', 'jinja2', 'pdfkit'],
+}
+
+# Режим -> библиотеки, которые не должны загружаться при импорте его модулей
+FORBIDDEN = {
+    'Вакансии': ['numpy', 'pandas', 'matplotlib', 'openpyxl'],
+    'Статистика': ['pandas', 'matplotlib', 'openpyxl'],
+}
+
+
+def loaded_modules(modules, libraries):
+    """
+    Функция импортирует модули в отдельном интерпретаторе и возвращает библиотеки,
+    которые оказались загружены
+
+    Args:
+        modules (list): Список импортируемых модулей
+        libraries (list): Проверяемые библиотеки
+
+    Returns:
+        (list): Загруженные библиотеки из libraries
+    """
+    code = '; '.join([f'import {module}' for module in modules] +
+                     ['import sys', f'print(" ".join(name for name in {libraries!r} if name in sys.modules))'])
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def import_time(modules):
+    """
+    Функция запускает отдельный интерпретатор и суммирует время импорта модулей
+
+    Args:
+        modules (list): Список импортируемых модулей
+
+    Returns:
+        (int, list): Суммарное время в микросекундах и модули верхнего уровня по убыванию времени
+    """
+    code = '; '.join(f'import {module}' for module in modules) or 'pass'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total = 0
+    top_level = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        name = name.rstrip()
+        # Модули верхнего уровня записываются с одним пробелом после "|"
+        if not name.startswith('  '):
+            total += int(cumulative)
+            top_level.append((int(cumulative), name.strip()))
+    top_level.sort(reverse=True)
+    return total, top_level
+
+
+def main():
+    """
+    Функция печатает время импорта режимов
+
+    Returns:
+        (int): Код возврата: 1, если режим загружает запрещенные библиотеки
+    """
+    failed = 0
+    # Время запуска самого интерпретатора вычитается из каждого режима
+    baseline, startup = import_time([])
+    startup = {name for _, name in startup}
+    for mode, modules in MODES.items():
+        try:
+            total, top = import_time(modules)
+        except RuntimeError as error:
+            print(f'{mode}: не удалось импортировать ({error})')
+            continue
+        print(f'{mode}: {(total - baseline) / 1000:.1f} мс')
+        top = [(cumulative, name) for cumulative, name in top if name not in startup]
+        for cumulative, name in top[:5]:
+            print(f'    {name}: {cumulative / 1000:.1f} мс')
+        loaded = loaded_modules(modules, FORBIDDEN.get(mode, []))
+        if loaded:
+            print(f'    ОШИБКА: при импорте загружены {", ".join(loaded)}')
+            failed = 1
+    return failed
+
+
+if __name__ == '__main__':
+    sys.exit(main())
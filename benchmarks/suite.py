@@ -0,0 +1,264 @@
+"""
+Набор замеров всех конвейеров проекта на синтетических вакансиях.
+
+Для каждого размера (10k, 1m, 10m или число строк) генерируется файл нужной
+схемы, после чего по этапам замеряются:
+    table_out      - чтение DataSet и печать таблицы с фильтром и сортировкой
+    report_out_old - чтение DataSet и статистика по профессии
+    report_out     - чтение pandas и разбиение по годам с расчетом в процессах
+    task3_3_2      - перевод зарплат в рубли по курсам Currency_data.csv
+    sqlite         - загрузка таблицы salary в SQLite и запросы task3.5.3
+
+Результаты сохраняются в JSON. Если передан прошлый результат (--baseline),
+этапы, замедлившиеся больше допустимого, выводятся и программа завершается с кодом 1
+
+Запуск: python -m benchmarks.suite --sizes 10k 1m --output results.json
+        python -m benchmarks.suite --sizes 10k --baseline results.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import parse_rows, write_csv
+from cli import load_script
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOB_NAME = 'Программист'
+TABLE_PARAMS = ('Опыт работы: От 1 года до 3 лет', 'Оклад', 'Да')
+SCHEMAS = {'table_out': 'table', 'report_out_old': 'raw', 'report_out': 'raw', 'task3_3_2': 'raw',
+           'sqlite': 'converted'}
+PIPELINES = tuple(SCHEMAS)
+
+
+class Stopwatch:
+    """
+    Класс запоминает время этапов одного прогона
+
+    Attributes:
+        stages (dict): Название этапа -> время в секундах
+    """
+    def __init__(self):
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Метод замеряет время блока with
+
+        Args:
+            name (str): Название этапа
+        """
+        start = time.perf_counter()
+        yield
+        self.stages[name] = time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def silence():
+    """
+    Функция подавляет печать замеряемых функций: stdout перенаправляется в os.devnull
+    """
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def bench_table_out(file_name, stopwatch):
+    """
+    Замер table_out: чтение DataSet и печать первых 20 строк с фильтром и сортировкой по окладу
+    """
+    import table_out
+    with stopwatch.stage('load'):
+        data_set = table_out.DataSet(file_name)
+    with stopwatch.stage('print'), silence():
+        table_out.InputConnect.print_vacancies(data_set, *TABLE_PARAMS, [1, 21], [''])
+
+
+def bench_report_out_old(file_name, stopwatch):
+    """
+    Замер report_out_old: чтение DataSet и статистика по профессии
+    """
+    import report_out_old
+    with stopwatch.stage('load'):
+        data_set = report_out_old.DataSet(file_name)
+    with stopwatch.stage('statistics'):
+        report_out_old.InputConnect.get_statistics(data_set.vacancies_objects, JOB_NAME)
+
+
+def bench_report_out(file_name, stopwatch):
+    """
+    Замер report_out: чтение pandas, разбиение по годам и расчет по частям в процессах
+    """
+    import report_out
+    with stopwatch.stage('read'):
+        df = pd.read_csv(file_name)
+    # Части по годам пишутся в csv_files текущего каталога, он создается заново для каждого прогона
+    shutil.rmtree('csv_files', ignore_errors=True)
+    with stopwatch.stage('report'), silence():
+        report_out.InputConnect((file_name, JOB_NAME), df)
+
+
+def bench_task3_3_2(file_name, stopwatch):
+    """
+    Замер task3_3_2: перевод зарплат в рубли и запись vacancies_new.csv
+    """
+    import task3_3_2
+    with stopwatch.stage('convert'), silence():
+        task3_3_2.create_vacancies(file_name)
+
+
+def bench_sqlite(file_name, stopwatch):
+    """
+    Замер SQLite: загрузка таблицы salary и запросы статистики task3.5.3
+    """
+    import sqlite3
+    task = load_script('task3.5.3.py', 'task3_5_3')
+    if os.path.exists('bench.db'):
+        os.remove('bench.db')
+    with sqlite3.connect('bench.db') as con:
+        with stopwatch.stage('load'):
+            pd.read_csv(file_name).to_sql('salary', con, index=False)
+        with stopwatch.stage('query'):
+            task.get_statistics(con, f'%{JOB_NAME}%')
+
+
+BENCHMARKS = {'table_out': bench_table_out, 'report_out_old': bench_report_out_old, 'report_out': bench_report_out,
+              'task3_3_2': bench_task3_3_2, 'sqlite': bench_sqlite}
+
+
+def run_pipeline(pipeline, file_name, repeat):
+    """
+    Функция выполняет замер конвейера несколько раз и оставляет лучшее время каждого этапа
+
+    Args:
+        pipeline (str): Название конвейера
+        file_name (str): Файл с вакансиями
+        repeat (int): Количество прогонов
+
+    Returns:
+        (dict): Название этапа -> время в секундах
+    """
+    best = {}
+    for _ in range(repeat):
+        stopwatch = Stopwatch()
+        BENCHMARKS[pipeline](file_name, stopwatch)
+        for name, seconds in stopwatch.stages.items():
+            best[name] = min(seconds, best.get(name, seconds))
+    return best
+
+
+def environment():
+    """
+    Функция описывает окружение, в котором получены результаты
+
+    Returns:
+        (dict): Версии и параметры машины
+    """
+    return {'date': datetime.datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+            'platform': platform.platform(), 'processor': platform.processor(), 'cpu_count': os.cpu_count(),
+            'numpy': np.__version__, 'pandas': pd.__version__}
+
+
+def run_suite(sizes, pipelines, repeat=1, seed=0, data_dir=None):
+    """
+    Функция генерирует данные и выполняет замеры
+
+    Args:
+        sizes (list): Размеры в виде 10k/1m/10m или чисел
+        pipelines (list): Названия конвейеров
+        repeat (int): Количество прогонов каждого конвейера
+        seed (int): Зерно генератора данных
+        data_dir (str or None): Каталог для сгенерированных файлов. Если задан,
+            файлы сохраняются и переиспользуются при следующем запуске
+
+    Returns:
+        (dict): Окружение и список результатов по этапам
+    """
+    results = []
+    start_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_dir = os.path.abspath(data_dir or work_dir)
+        os.makedirs(data_dir, exist_ok=True)
+        shutil.copy(os.path.join(ROOT, 'Currency_data.csv'), work_dir)
+        os.chdir(work_dir)
+        try:
+            for size in sizes:
+                rows = parse_rows(size)
+                for pipeline in pipelines:
+                    schema = SCHEMAS[pipeline]
+                    file_name = os.path.join(data_dir, f'vacancies_{schema}_{rows}_{seed}.csv')
+                    if not os.path.exists(file_name):
+                        write_csv(file_name, rows, seed, schema)
+                    stages = run_pipeline(pipeline, file_name, repeat)
+                    for stage, seconds in stages.items():
+                        results.append({'pipeline': pipeline, 'size': size, 'rows': rows, 'stage': stage,
+                                        'seconds': round(seconds, 4),
+                                        'rows_per_second': round(rows / seconds) if seconds else None})
+                        print(f'{pipeline:<15}{size:>6} {stage:<11}{seconds:10.3f} с '
+                              f'{rows / seconds if seconds else 0:14,.0f} строк/с')
+        finally:
+            os.chdir(start_dir)
+    return {'environment': environment(), 'seed': seed, 'repeat': repeat, 'results': results}
+
+
+def compare(report, baseline, tolerance):
+    """
+    Функция сравнивает результаты с прошлыми по совпадающим конвейерам, размерам и этапам
+
+    Args:
+        report (dict): Текущие результаты
+        baseline (dict): Прошлые результаты
+        tolerance (float): Допустимое отношение нового времени к старому
+
+    Returns:
+        (list): Строки с описанием замедлившихся этапов
+    """
+    previous = {(item['pipeline'], item['rows'], item['stage']): item['seconds'] for item in baseline['results']}
+    regressions = []
+    for item in report['results']:
+        old = previous.get((item['pipeline'], item['rows'], item['stage']))
+        if not old:
+            continue
+        ratio = item['seconds'] / old
+        line = f"{item['pipeline']} {item['size']} {item['stage']}: {old:.3f} с -> {item['seconds']:.3f} с (x{ratio:.2f})"
+        print(line)
+        if ratio > tolerance:
+            regressions.append(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замеры конвейеров на синтетических вакансиях')
+    parser.add_argument('--sizes', nargs='+', default=['10k'], help='10k, 1m, 10m или количество строк')
+    parser.add_argument('--pipelines', nargs='+', choices=PIPELINES, default=list(PIPELINES))
+    parser.add_argument('--repeat', type=int, default=1, help='Количество прогонов, берется лучшее время')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help='Каталог для сохранения и повторного использования данных')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='JSON прошлого запуска для сравнения')
+    parser.add_argument('--tolerance', type=float, default=1.2, help='Допустимое замедление относительно baseline')
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.pipelines, args.repeat, args.seed, args.data_dir)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f'Результаты сохранены в {args.output}')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        if regressions:
+            print('Замедлились этапы:', *regressions, sep='\n')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
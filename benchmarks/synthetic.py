@@ -0,0 +1,174 @@
+"""
+Детерминированный генератор синтетических вакансий для замеров.
+
+Схема raw совпадает с hh_vacs.csv (name, salary_from, salary_to, salary_currency,
+area_name, published_at), схема converted - с vacancies_new.csv после перевода
+валют (name, salary, area_name, published_at). Распределения валют, городов и
+годов скошены так же, как в выгрузках hh.ru: большинство вакансий в рублях,
+Москва и Санкт-Петербург встречаются чаще остальных городов, вакансий с каждым
+годом становится больше. Схема table содержит все колонки, которые читает
+table_out (описание, навыки, опыт, компания, границы оклада без пропусков)
+
+Запуск: python -m benchmarks.synthetic vacancies.csv --rows 1000000
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+
+PROFESSIONS = ['Программист', 'Разработчик', 'Аналитик', 'Системный администратор', 'Токарь', 'Менеджер',
+               'Тестировщик', 'Дизайнер', 'Инженер', 'Бухгалтер', 'Оператор станков с ЧПУ', 'Фрезеровщик']
+PREFIXES = ['', '', '', 'Ведущий ', 'Старший ', 'Младший ', 'Главный ']
+SUFFIXES = ['', '', ' Python', ' Java', ' 1С', ' C++', ' PHP', ' (удаленно)', '-универсал']
+CITIES = ['Москва', 'Санкт-Петербург', 'Новосибирск', 'Казань', 'Екатеринбург', 'Нижний Новгород', 'Краснодар',
+          'Самара', 'Челябинск', 'Ростов-на-Дону', 'Алматы', 'Минск', 'Ташкент', 'Уфа', 'Пермь', 'Воронеж',
+          'Омск', 'Тюмень', 'Владивосток', 'Бишкек']
+CURRENCIES = ['RUR', 'KZT', 'BYR', 'USD', 'UZS', 'EUR', 'KGS', 'UAH', 'AZN', 'GEL']
+CURRENCY_WEIGHTS = [0.90, 0.03, 0.02, 0.02, 0.01, 0.008, 0.004, 0.004, 0.002, 0.002]
+# Порядок величины зарплаты в валюте, чтобы после перевода в рубли значения были правдоподобными
+CURRENCY_SCALE = {'RUR': 1, 'KZT': 6, 'BYR': 0.04, 'USD': 0.016, 'UZS': 150, 'EUR': 0.015, 'KGS': 1.2,
+                  'UAH': 0.5, 'AZN': 0.03, 'GEL': 0.04}
+SKILLS = ['Python', 'SQL', 'Git', 'Linux', 'Java', 'C++', 'Docker', '1С: Предприятие 8', 'Excel', 'Английский язык',
+          'Работа в команде', 'AutoCAD', 'JavaScript', 'PostgreSQL', 'Django']
+EXPERIENCE = ['noExperience', 'between1And3', 'between3And6', 'moreThan6']
+EXPERIENCE_WEIGHTS = [0.25, 0.45, 0.25, 0.05]
+EMPLOYERS = ['Яндекс', 'Сбер', 'Тинькофф', 'СКБ Контур', 'Ozon', 'МТС', 'Ростелеком', 'ИИТ', 'CiPlay', 'Газпром нефть',
+             'Магнит', 'X5 Group', 'Лаборатория Касперского', 'VK', 'Альфа-Банк']
+FIRST_YEAR = 2003
+LAST_YEAR = 2022
+LAST_MONTH = 7
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+
+def zipf_weights(count, power=1.1):
+    """
+    Функция возвращает нормированные веса закона Ципфа
+
+    Args:
+        count (int): Количество значений
+        power (float): Показатель степени
+
+    Returns:
+        (ndarray): Веса, сумма которых равна единице
+    """
+    weights = 1 / np.arange(1, count + 1) ** power
+    return weights / weights.sum()
+
+
+def generate_vacancies(rows, seed=0, schema='raw'):
+    """
+    Функция генерирует таблицу вакансий
+
+    Args:
+        rows (int): Количество строк
+        seed (int): Зерно генератора случайных чисел
+        schema (str): raw, converted или table
+
+    Returns:
+        (DataFrame): Таблица вакансий
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array([prefix + profession + suffix for profession in PROFESSIONS
+                      for prefix in dict.fromkeys(PREFIXES) for suffix in dict.fromkeys(SUFFIXES)])
+    name = names[rng.choice(len(names), rows, p=zipf_weights(len(names), 0.8))]
+    area_name = np.array(CITIES)[rng.choice(len(CITIES), rows, p=zipf_weights(len(CITIES)))]
+
+    years = np.arange(FIRST_YEAR, LAST_YEAR + 1)
+    year_weights = np.linspace(1, 6, len(years))
+    year = rng.choice(years, rows, p=year_weights / year_weights.sum())
+    month = rng.integers(1, 13, rows)
+    # Курсы в Currency_data.csv заканчиваются на LAST_MONTH последнего года
+    month = np.where(year == LAST_YEAR, rng.integers(1, LAST_MONTH + 1, rows), month)
+    day = rng.integers(1, 29, rows)
+    seconds = rng.integers(0, 86400, rows)
+    published_at = pd.Series([f'{y}-{m:02}-{d:02}T{s // 3600:02}:{s // 60 % 60:02}:{s % 60:02}+0300'
+                              for y, m, d, s in zip(year.tolist(), month.tolist(), day.tolist(), seconds.tolist())])
+
+    currency = np.array(CURRENCIES)[rng.choice(len(CURRENCIES), rows, p=CURRENCY_WEIGHTS)]
+    scale = pd.Series(currency).map(CURRENCY_SCALE).to_numpy()
+    salary_from = np.round(rng.lognormal(10.8, 0.5, rows) * scale, -2)
+    salary_to = np.round(salary_from * rng.uniform(1.1, 2.0, rows), -2)
+    # Как в выгрузке hh.ru: у части вакансий нет одной или обеих границ оклада
+    salary_from[rng.random(rows) < 0.3] = np.nan
+    salary_to[rng.random(rows) < 0.45] = np.nan
+    no_salary = np.isnan(salary_from) & np.isnan(salary_to)
+
+    if schema == 'converted':
+        bounds = np.vstack([salary_from, salary_to])
+        count = (~np.isnan(bounds)).sum(axis=0)
+        salary = np.where(count > 0, np.nansum(bounds, axis=0) / np.maximum(count, 1), np.nan) / scale
+        return pd.DataFrame({'name': name, 'salary': np.round(salary), 'area_name': area_name,
+                             'published_at': published_at})
+
+    if schema == 'table':
+        # table_out отбрасывает строки с пустыми полями, поэтому обе границы оклада заполнены
+        salary_from = np.where(np.isnan(salary_from), np.round(salary_to / 1.5, -2), salary_from)
+        salary_from = np.where(np.isnan(salary_from), np.round(rng.lognormal(10.8, 0.5, rows) * scale, -2),
+                               salary_from)
+        salary_to = np.where(np.isnan(salary_to), np.round(salary_from * 1.5, -2), salary_to)
+        skills = np.array(SKILLS)
+        skill_lists = [skills[rng.choice(len(skills), count, replace=False)]
+                       for count in rng.integers(1, 6, rows).tolist()]
+        key_skills = ['\n'.join(skill_list) for skill_list in skill_lists]
+        description = [f'<p><strong>Обязанности:</strong> {title.lower()}</p>'
+                       f'<ul><li>Опыт работы с {skill_list[0]}</li></ul>'
+                       for title, skill_list in zip(name, skill_lists)]
+        return pd.DataFrame({'name': name, 'description': description, 'key_skills': key_skills,
+                             'experience_id': np.array(EXPERIENCE)[rng.choice(len(EXPERIENCE), rows,
+                                                                              p=EXPERIENCE_WEIGHTS)],
+                             'premium': np.where(rng.random(rows) < 0.05, 'True', 'False'),
+                             'employer_name': np.array(EMPLOYERS)[rng.choice(len(EMPLOYERS), rows,
+                                                                             p=zipf_weights(len(EMPLOYERS)))],
+                             'salary_from': salary_from, 'salary_to': salary_to,
+                             'salary_gross': np.where(rng.random(rows) < 0.6, 'True', 'False'),
+                             'salary_currency': currency, 'area_name': area_name, 'published_at': published_at})
+
+    currency = currency.astype(object)
+    currency[no_salary] = np.nan
+    return pd.DataFrame({'name': name, 'salary_from': salary_from, 'salary_to': salary_to,
+                         'salary_currency': currency, 'area_name': area_name, 'published_at': published_at})
+
+
+def write_csv(file_name, rows, seed=0, schema='raw', chunk_rows=1_000_000):
+    """
+    Функция записывает синтетические вакансии в CSV по частям, чтобы большие
+    файлы не требовали держать всю таблицу в памяти
+
+    Args:
+        file_name (str): Имя выходного файла
+        rows (int): Количество строк
+        seed (int): Зерно генератора случайных чисел
+        schema (str): raw, converted или table
+        chunk_rows (int): Количество строк в одной части
+    """
+    written = 0
+    part = 0
+    while written < rows or part == 0:
+        count = min(chunk_rows, rows - written)
+        df = generate_vacancies(count, seed + part, schema)
+        df.to_csv(file_name, mode='w' if part == 0 else 'a', header=part == 0, index=False)
+        written += count
+        part += 1
+
+
+def parse_rows(line):
+    """
+    Функция переводит размер из вида 10k/1m/10m или числа в количество строк
+
+    Args:
+        line (str): Размер
+
+    Returns:
+        (int): Количество строк
+    """
+    return SIZES[line.lower()] if line.lower() in SIZES else int(line)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Генератор синтетических вакансий')
+    parser.add_argument('file')
+    parser.add_argument('--rows', default='10k', help='10k, 1m, 10m или количество строк')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--schema', choices=['raw', 'converted', 'table'], default='raw')
+    args = parser.parse_args()
+    write_csv(args.file, parse_rows(args.rows), args.seed, args.schema)
@@ -0,0 +1,187 @@
+"""
+Модуль кодирует повторяющиеся строковые колонки вакансий (город, валюта,
+опыт работы, премиум-вакансия, компания) целыми кодами.
+
+В таблицах pandas такие колонки читаются с типом category: на строку
+приходится один-два байта кода, а группировки по городу считаются через
+np.bincount по кодам. В наборах объектов Vacancy одинаковые строки заменяются
+одним общим объектом из словаря Dictionary (модуль category_dictionary без
+зависимостей). numpy и pandas импортируются внутри функций, поэтому модуль можно
+импортировать, не загружая их
+"""
+
+from category_dictionary import CATEGORY_COLUMNS, Dictionary
+
+
+def column_dtypes(columns=CATEGORY_COLUMNS):
+    """
+    Функция возвращает типы колонок для pd.read_csv. Колонки, которых нет в файле, pandas пропускает
+
+    Args:
+        columns (iterable): Колонки, которые нужно читать как category
+
+    Returns:
+        (dict): Колонка -> тип
+    """
+    return {column: 'category' for column in columns}
+
+
+def read_csv(file_name, **kwargs):
+    """
+    Функция читает CSV с вакансиями, кодируя повторяющиеся строковые колонки
+
+    Args:
+        file_name (str): Имя файла
+        **kwargs: Дополнительные параметры pd.read_csv
+
+    Returns:
+        (DataFrame): Таблица вакансий
+    """
+    import pandas as pd
+    return pd.read_csv(file_name, dtype=column_dtypes(), **kwargs)
+
+
+def encode(values):
+    """
+    Функция возвращает коды и словарь значений колонки. Пропуски получают код -1
+
+    Args:
+        values (Series): Колонка category или строк
+
+    Returns:
+        (ndarray, list): Коды строк и значения в порядке кодов
+    """
+    import pandas as pd
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), list(values.cat.categories)
+    codes, uniques = pd.factorize(values)
+    return codes, list(uniques)
+
+
+def map_codes(values, mapping):
+    """
+    Функция заменяет значения колонки числами из словаря по кодам категорий, не
+    сравнивая строки в каждой строке таблицы
+
+    Args:
+        values (Series): Колонка category или строк
+        mapping (dict): Значение -> число
+
+    Returns:
+        (ndarray): Числа, NaN для пропусков и значений, которых нет в словаре
+
+    >>> import pandas as pd
+    >>> map_codes(pd.Series(['USD', None, 'RUR', 'XXX'], dtype='category'), {'RUR': 1, 'USD': 60.66})
+    array([60.66,   nan,  1.  ,   nan])
+    """
+    import numpy as np
+    codes, uniques = encode(values)
+    table = np.array([mapping.get(value, np.nan) for value in uniques] + [np.nan], dtype=float)
+    return table[codes]
+
+
+def group_sizes(codes, count):
+    """
+    Функция считает количество строк каждого кода
+
+    Args:
+        codes (ndarray): Коды строк, -1 для пропусков
+        count (int): Количество кодов
+
+    Returns:
+        (ndarray): Количество строк каждого кода
+    """
+    import numpy as np
+    return np.bincount(codes[codes >= 0], minlength=count)
+
+
+def group_means(codes, values, count):
+    """
+    Функция считает среднее значение по каждому коду без учета NaN, как mean в pandas
+
+    Args:
+        codes (ndarray): Коды строк, -1 для пропусков
+        values (ndarray): Значения
+        count (int): Количество кодов
+
+    Returns:
+        (ndarray): Среднее по коду или NaN, если значений нет
+
+    >>> import numpy as np
+    >>> group_means(np.array([0, 1, 0, -1, 1]), np.array([1.0, np.nan, 3.0, 5.0, np.nan]), 3)
+    array([ 2., nan, nan])
+    """
+    import numpy as np
+    valid = (codes >= 0) & ~np.isnan(values)
+    sums = np.bincount(codes[valid], weights=values[valid], minlength=count)
+    sizes = np.bincount(codes[valid], minlength=count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(sizes > 0, sums / sizes, np.nan)
+
+
+def order_by_size(codes, sizes):
+    """
+    Функция упорядочивает коды по убыванию количества строк. При равном количестве
+    раньше идет код, который раньше встречается в таблице, как в value_counts
+
+    Args:
+        codes (ndarray): Коды строк, -1 для пропусков
+        sizes (ndarray): Количество строк каждого кода из group_sizes
+
+    Returns:
+        (ndarray): Коды, встречающиеся в таблице, в порядке убывания количества
+
+    >>> import numpy as np
+    >>> order_by_size(np.array([1, 0, 1, 0, 2]), np.array([2, 2, 1]))
+    array([1, 0, 2])
+    """
+    import numpy as np
+    valid = np.flatnonzero(codes >= 0)
+    first = np.full(len(sizes), len(codes))
+    np.minimum.at(first, codes[valid], valid)
+    return rank_by_size(sizes, first)
+
+
+def rank_by_size(sizes, first):
+    """
+    Функция упорядочивает коды по убыванию количества строк, при равном количестве -
+    по номеру первой строки кода. Используется, когда номера первых строк уже
+    накоплены, например при чтении файла по частям
+
+    Args:
+        sizes (ndarray): Количество строк каждого кода
+        first (ndarray): Номер первой строки каждого кода
+
+    Returns:
+        (ndarray): Коды с ненулевым количеством в порядке убывания количества
+
+    >>> import numpy as np
+    >>> rank_by_size(np.array([2, 0, 2, 1]), np.array([5, 9, 3, 0]))
+    array([2, 0, 3])
+    """
+    import numpy as np
+    present = np.flatnonzero(sizes > 0)
+    return present[np.lexsort((first[present], -sizes[present]))]
+
+
+def city_statistics(areas, salaries, share=0.01, limit=10):
+    """
+    Функция считает уровень зарплат и долю вакансий для крупнейших городов по
+    кодам городов, одной группировкой np.bincount
+
+    Args:
+        areas (Series): Колонка area_name
+        salaries (ndarray): Зарплаты в рублях
+        share (float): Минимальная доля вакансий города
+        limit (int): Количество городов
+
+    Returns:
+        (list, ndarray, ndarray): Города в порядке убывания количества вакансий,
+        средние зарплаты и доли вакансий этих городов
+    """
+    import numpy as np
+    codes, cities = encode(areas)
+    sizes = group_sizes(codes, len(cities))
+    top = [code for code in order_by_size(codes, sizes) if sizes[code] / len(codes) > share][:limit]
+    means = group_means(codes, np.asarray(salaries, dtype=float), len(cities))
+    return [cities[code] for code in top], means[top], sizes[top] / len(codes)
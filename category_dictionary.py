@@ -0,0 +1,55 @@
+"""
+Модуль содержит словарь кодирования повторяющихся строк и список колонок,
+которые кодируются. Модуль не зависит от numpy и pandas, поэтому его импорт не
+замедляет запуск табличного режима и статистики по объектам Vacancy
+"""
+
+CATEGORY_COLUMNS = ('area_name', 'salary_currency', 'experience_id', 'premium', 'employer_name')
+
+
+class Dictionary:
+    """
+    Словарь кодирования строк: каждой новой строке присваивается следующий код
+
+    Attributes:
+        codes (dict): Строка -> код
+        values (list): Строки в порядке кодов (порядке первого появления)
+    """
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        """
+        Метод возвращает код строки, добавляя ее в словарь при первом появлении
+
+        Args:
+            value (str): Строка
+
+        Returns:
+            (int): Код строки
+
+        >>> dictionary = Dictionary()
+        >>> [dictionary.encode(city) for city in ['Москва', 'Казань', 'Москва']]
+        [0, 1, 0]
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def intern(self, value):
+        """
+        Метод возвращает общий для всех строк объект с тем же значением
+
+        Args:
+            value (str): Строка
+
+        Returns:
+            (str): Строка из словаря
+        """
+        return self.values[self.encode(value)]
@@ -0,0 +1,233 @@
+"""
+Модуль строит графики статистики без pyplot: фигура создается через
+объектный API matplotlib с бэкендом Agg, поэтому интерактивный бэкенд не
+загружается, а фигуры не копятся в глобальном состоянии pyplot.
+
+Фигура переиспользуется между отчетами: если количество годов и городов
+не изменилось, у столбцов меняются только высоты и подписи
+"""
+
+import io
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+BAR_WIDTH = 0.4
+
+
+class ChartRenderer:
+    """
+    Класс рисует четыре графика статистики на одной фигуре
+
+    Attributes:
+        figure (Figure or None): Фигура matplotlib
+        layout (tuple or None): Количество годов и городов, под которые построена фигура
+    """
+    def __init__(self):
+        """
+        В конструкторе фигура не создается: она строится при первом отчете
+        """
+        self.figure = None
+        self.layout = None
+        self._artists = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def draw(self, data_list, job_name):
+        """
+        Метод рисует статистику на фигуре, переиспользуя ее при том же наборе годов и городов
+
+        Args:
+            data_list (list): Список словарей статистики
+            job_name (str): Название профессии
+
+        Returns:
+            (Figure): Фигура с графиками
+        """
+        layout = (len(data_list[0]), len(data_list[1]), len(data_list[4]))
+        if self.figure is None or layout != self.layout:
+            self._build(data_list, job_name)
+            self.layout = layout
+        else:
+            self._update(data_list, job_name)
+        self._draw_pie(data_list)
+        self.figure.tight_layout()
+        return self.figure
+
+    def _build(self, data_list, job_name):
+        """
+        Метод создает фигуру и столбцы заново
+
+        Args:
+            data_list (list): Список словарей статистики
+            job_name (str): Название профессии
+        """
+        if self.figure is None:
+            self.figure = Figure()
+            FigureCanvasAgg(self.figure)
+        else:
+            self.figure.clear()
+        fig = self.figure
+
+        x_nums = np.arange(len(data_list[0].keys()))
+        ax = fig.add_subplot(221)
+        ax.set_title('Уровень зарплат по годам')
+        salary = ax.bar(x_nums - BAR_WIDTH / 2, list(data_list[0].values()), BAR_WIDTH, label='средняя з/п')
+        job_salary = ax.bar(x_nums + BAR_WIDTH / 2, list(data_list[2].values()), BAR_WIDTH,
+                            label=f'з/п {job_name}')
+        ax.set_xticks(x_nums, data_list[0].keys(), rotation='vertical')
+        ax.legend(fontsize=8)
+        ax.tick_params(axis='both', labelsize=8)
+        ax.grid(True, axis='y')
+        self._artists['salary'] = (ax, salary, job_salary)
+
+        x_nums = np.arange(len(data_list[1].keys()))
+        ax = fig.add_subplot(222)
+        ax.set_title('Количество вакансий по годам')
+        vacs = ax.bar(x_nums - BAR_WIDTH / 2, list(data_list[1].values()), BAR_WIDTH, label='Количество вакансий')
+        job_vacs = ax.bar(x_nums + BAR_WIDTH / 2, list(data_list[3].values()), BAR_WIDTH,
+                          label=f'Количество вакансий \n{job_name}')
+        ax.set_xticks(x_nums, data_list[1].keys(), rotation='vertical')
+        ax.legend(fontsize=8)
+        ax.tick_params(axis='both', labelsize=8)
+        ax.grid(True, axis='y')
+        self._artists['vacs'] = (ax, vacs, job_vacs)
+
+        y_nums = np.arange(len(data_list[4].keys()))
+        ax = fig.add_subplot(223)
+        ax.set_title('Уровень зарплат по городам')
+        cities = ax.barh(y_nums, list(data_list[4].values()), align='center')
+        ax.set_yticks(y_nums, ChartRenderer.city_labels(data_list[4]))
+        ax.tick_params(axis='y', labelsize=6)
+        ax.tick_params(axis='x', labelsize=8)
+        self._artists['cities'] = (ax, cities)
+
+        self._artists['pie'] = fig.add_subplot(224)
+
+    def _update(self, data_list, job_name):
+        """
+        Метод меняет высоты столбцов и подписи на уже построенной фигуре
+
+        Args:
+            data_list (list): Список словарей статистики
+            job_name (str): Название профессии
+        """
+        for key, values, job_values, label in (('salary', data_list[0], data_list[2], f'з/п {job_name}'),
+                                               ('vacs', data_list[1], data_list[3],
+                                                f'Количество вакансий \n{job_name}')):
+            ax, bars, job_bars = self._artists[key]
+            for rect, value in zip(bars, values.values()):
+                rect.set_height(value)
+            for rect, value in zip(job_bars, job_values.values()):
+                rect.set_height(value)
+            job_bars.set_label(label)
+            ax.get_legend().get_texts()[1].set_text(label)
+            ax.set_xticks(np.arange(len(values)), values.keys(), rotation='vertical')
+            ax.relim()
+            ax.autoscale_view()
+
+        ax, bars = self._artists['cities']
+        for rect, value in zip(bars, data_list[4].values()):
+            rect.set_width(value)
+        ax.set_yticks(np.arange(len(data_list[4])), ChartRenderer.city_labels(data_list[4]))
+        ax.relim()
+        ax.autoscale_view()
+
+    def _draw_pie(self, data_list):
+        """
+        Метод рисует круговую диаграмму долей вакансий. Количество секторов
+        зависит от данных, поэтому диаграмма всегда строится заново
+
+        Args:
+            data_list (list): Список словарей статистики
+        """
+        ax = self._artists['pie']
+        ax.clear()
+        ax.set_title('Доля вакансий по городам')
+        values = list(data_list[5].values())
+        name = list(data_list[5].keys())
+        values.insert(0, 1 - sum(values))
+        name.insert(0, 'Другие')
+        ax.pie(values, labels=name, textprops={'fontsize': 6})
+
+    @staticmethod
+    def city_labels(salary_by_cities):
+        """
+        Метод переносит длинные названия городов на несколько строк
+
+        Args:
+            salary_by_cities (dict): Уровень зарплат по городам
+
+        Returns:
+            (list): Подписи городов
+        """
+        return [line.replace(' ', '\n').replace('-', '-\n') for line in list(salary_by_cities.keys())]
+
+    def save(self, output, image_format=None, dpi=200):
+        """
+        Метод сохраняет фигуру в файл или поток
+
+        Args:
+            output (str or file): Имя файла или поток
+            image_format (str or None): png или svg. По умолчанию берется из расширения
+            dpi (int): Разрешение растрового изображения
+        """
+        self.figure.savefig(output, format=image_format, dpi=dpi)
+
+    def to_svg(self):
+        """
+        Метод возвращает фигуру в виде SVG для встраивания в HTML
+
+        Returns:
+            (str): SVG разметка без XML заголовка
+        """
+        buffer = io.StringIO()
+        self.figure.savefig(buffer, format='svg')
+        svg = buffer.getvalue()
+        return svg[svg.index('<svg'):]
+
+    def close(self):
+        """
+        Метод освобождает фигуру и все ее элементы
+        """
+        if self.figure is not None:
+            self.figure.clear()
+        self.figure = None
+        self.layout = None
+        self._artists = {}
+
+
+_renderer = None
+
+
+def get_renderer():
+    """
+    Функция возвращает общий для процесса объект ChartRenderer для пакетной генерации
+
+    Returns:
+        (ChartRenderer): Объект для построения графиков
+    """
+    global _renderer
+    if _renderer is None:
+        _renderer = ChartRenderer()
+    return _renderer
+
+
+def render_svg(data_list, job_name):
+    """
+    Функция строит графики и возвращает их в виде SVG
+
+    Args:
+        data_list (list): Список словарей статистики
+        job_name (str): Название профессии
+
+    Returns:
+        (str): SVG разметка
+    """
+    renderer = get_renderer()
+    renderer.draw(data_list, job_name)
+    return renderer.to_svg()
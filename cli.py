@@ -0,0 +1,413 @@
+"""
+Модуль запускает отчеты проекта без интерактивного ввода.
+
+Примеры:
+    python cli.py table vacancies.csv --filter "Опыт работы: Нет опыта" --sort Оклад --range 1 20
+    python cli.py table vacancies.csv --store --filter "Навыки: Git" --sort Оклад
+    python cli.py table vacancies.csv --store --sort Оклад --page-size 50 --pages 2 --format csv
+    python cli.py stats vacancies.csv Программист Аналитик Тестировщик
+    python cli.py report vacancies_dif_currencies.csv Аналитик --pdf analyst.pdf
+    python cli.py report vacancies_dif_currencies.csv Аналитик --chunksize 500000
+    python cli.py report vacancies_dif_currencies.csv Аналитик --cache-file vacancies_new.csv
+    python cli.py session vacancies.csv
+    python cli.py batch jobs.json
+    python cli.py --profile stages.jsonl stats vacancies.csv Программист
+    python cli.py stats vacancies.csv Программист --sample 2000
+    python cli.py partitions vacancies.csv Программист --years 2015 2020 --regions Москва Казань
+
+Файл заданий для пакетного режима - JSON список объектов с ключами mode, file, profession,
+filter, sort, reverse, range, fields, store, page_size, pages, cursor, format (для table), output (файл для печати), index (для stats и report),
+outputs (виды отчетов для stats), chart (для stats и report), pdf, combined, chunksize и cache_file
+(только для mode=report), sample (приближенная статистика по выборке для stats, partitions и sql),
+years ([первый, последний] год, null - открытая граница) и regions (список регионов) для partitions,
+regex (искать профессии report как регулярные выражения; по умолчанию - если профессия одна).
+В profession можно передать список профессий: режимы stats и report считают их за один
+проход по данным и выводят отчет для каждой профессии.
+Каждый входной файл загружается один раз для всех заданий одного режима
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import sys
+
+MODES = ('table', 'stats', 'partitions', 'report', 'sql')
+
+
+def load_script(file_name, module_name):
+    """
+    Функция импортирует модуль по имени файла. Нужна для скриптов, в имени которых есть точки
+
+    Args:
+        file_name (str): Имя файла модуля
+        module_name (str): Имя, под которым модуль будет зарегистрирован
+
+    Returns:
+        (module): Загруженный модуль
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_data(mode, file_name, store=False, chunksize=None, cache_file=None, sample=None, years=None, regions=None):
+    """
+    Функция загружает входной файл в форме, которую использует режим
+
+    Args:
+        mode (str): Режим отчета
+        file_name (str): Имя входного файла
+        store (bool): Открыть набор table_out через хранилище вакансий
+        chunksize (int or None): Читать файл report по частям из указанного количества строк
+        cache_file (str or None): Файл переведенных вакансий для report
+        sample (int or None): Загрузить для stats только выборку из sample строк каждого года
+        years (tuple or None): Загрузить для partitions только вакансии из диапазона годов
+        regions (tuple or None): Загрузить для partitions только вакансии регионов
+
+    Returns:
+        Набор данных режима
+    """
+    if mode == 'table':
+        import table_out
+        return table_out.DataSet(file_name, store)
+    if mode == 'stats':
+        import report_out_old
+        return report_out_old.DataSet(file_name, sample)
+    if mode == 'partitions':
+        import report_out
+        return report_out.read_vacancies(file_name, years, regions)
+    if mode == 'report':
+        return load_script('task3.4.2.py', 'task3_4_2').load_vacancies(file_name, chunksize, cache_file)
+    if mode == 'sql':
+        import sqlite3
+        return sqlite3.connect(file_name)
+    raise ValueError(f'Неизвестный режим: {mode}')
+
+
+def run_job(job, data):
+    """
+    Функция выполняет одно задание на уже загруженных данных
+
+    Args:
+        job (dict): Параметры задания
+        data: Набор данных из load_data
+    """
+    mode = job['mode']
+    professions = job.get('profession', '')
+    if isinstance(professions, str):
+        professions = [professions]
+    if mode == 'table':
+        import table_out
+        table_out.InputConnect.check_params(job.get('filter', ''), job.get('sort', ''), job.get('reverse', ''))
+        if job.get('page_size'):
+            table_out.InputConnect.print_pages(data, job.get('filter', ''), job.get('sort', ''), job.get('reverse', ''),
+                                               job['page_size'], list(job.get('fields', [''])),
+                                               job.get('format', 'table'), job.get('cursor'), job.get('pages'))
+        else:
+            params = (job['file'], job.get('filter', ''), job.get('sort', ''), job.get('reverse', ''),
+                      list(job.get('range', [])), list(job.get('fields', [''])))
+            table_out.InputConnect(params, data)
+    elif mode == 'stats':
+        import report_out_old
+        if job.get('sample'):
+            import approximate
+            result = report_out_old.InputConnect.get_approximate_statistics(data.vacancies_objects, data.population,
+                                                                            professions)
+            for profession in result['jobs']:
+                print_profession(profession, len(result['jobs']))
+                approximate.print_statistics(result, profession)
+            return
+        name_index = data.name_index() if job.get('index') else None
+        statistics = report_out_old.InputConnect.get_multi_statistics(data.vacancies_objects, professions,
+                                                                      name_index, bool(job.get('outputs')))
+        for profession, data_list in statistics.items():
+            print_profession(profession, len(statistics))
+            report_out_old.InputConnect.print_statistics(data_list)
+            if job.get('outputs'):
+                report_out_old.Report(data_list, profession, tuple(job['outputs']),
+                                      embed_chart=job.get('chart', False))
+    elif mode == 'partitions':
+        import report_out
+        for profession in professions:
+            print_profession(profession, len(professions))
+            report_out.InputConnect((job['file'], profession), data.copy(), job.get('sample'), *query_key(job))
+    elif mode == 'report':
+        task = load_script('task3.4.2.py', 'task3_4_2')
+        # Одна профессия по умолчанию ищется как регулярное выражение, как в create_report
+        regex = job.get('regex')
+        if regex is None:
+            regex = len(professions) == 1
+        if job.get('chunksize'):
+            statistics = task.get_chunked_statistics(data, professions, regex, distribution=True)
+        else:
+            name_index = task.load_name_index(job['file'], data) if job.get('index') else None
+            statistics = task.get_multi_statistics(data, professions, name_index, distribution=True, regex=regex)
+        pdf = job.get('pdf', 'report_new.pdf')
+        for profession, data_list in statistics.items():
+            print_profession(profession, len(statistics))
+            task.print_statistics(data_list)
+            if job.get('combined'):
+                continue
+            if len(statistics) > 1:
+                stem, extension = os.path.splitext(pdf)
+                task.report_pdf(data_list, profession, f'{stem}_{profession}{extension}', job.get('chart', False))
+            else:
+                task.report_pdf(data_list, profession, pdf, job.get('chart', False))
+        if job.get('combined'):
+            import report_render
+            report_render.save_reports([(data_list, profession) for profession, data_list in statistics.items()],
+                                       pdf, job.get('chart', False))
+    elif mode == 'sql':
+        task = load_script('task3.5.3.py', 'task3_5_3')
+        for profession in professions:
+            print_profession(profession, len(professions))
+            if job.get('sample'):
+                import approximate
+                approximate.print_statistics(task.get_approximate_statistics(data, profession, job['sample']),
+                                             profession)
+            else:
+                task.print_statistics(task.get_statistics(data, profession))
+
+
+def print_profession(profession, count):
+    """
+    Функция печатает заголовок профессии, если в задании их несколько
+
+    Args:
+        profession (str): Название профессии
+        count (int): Количество профессий в задании
+    """
+    if count > 1:
+        print(f'--- Профессия: {profession}')
+
+
+def run_batch(jobs):
+    """
+    Функция выполняет задания, загружая каждый входной файл один раз. Задания
+    группируются по режиму и файлу в порядке первого появления, после группы
+    данные освобождаются
+
+    Args:
+        jobs (list): Список заданий
+
+    Returns:
+        (int): Количество заданий, завершившихся с ошибкой
+    """
+    first_seen = {}
+    for job in jobs:
+        first_seen.setdefault(load_key(job), len(first_seen))
+    order = sorted(range(len(jobs)), key=lambda i: first_seen[load_key(jobs[i])])
+
+    failed = 0
+    loaded_key = None
+    data = None
+    for i in order:
+        job = jobs[i]
+        key = load_key(job)
+        if key != loaded_key:
+            release_data(loaded_key, data)
+            data = load_data(*key)
+            loaded_key = key
+
+        output = job.get('output')
+        with contextlib.ExitStack() as stack:
+            if output:
+                stream = stack.enter_context(open(output, 'w', encoding='utf-8'))
+                stack.enter_context(contextlib.redirect_stdout(stream))
+            elif len(jobs) > 1:
+                print(f'=== Задание {i + 1}: {job["mode"]} {job["file"]} {job.get("profession", "")}')
+            try:
+                run_job(job, data)
+            except SystemExit:
+                # Модули завершают программу через exit() при пустом результате
+                failed += 1
+    release_data(loaded_key, data)
+    return failed
+
+
+def load_key(job):
+    """
+    Функция возвращает параметры load_data задания: задания с одинаковым ключом
+    используют одни загруженные данные
+
+    Args:
+        job (dict): Параметры задания
+
+    Returns:
+        (tuple): Режим, имя файла, признак хранилища, размер части, файл переведенных
+        вакансий, размер выборки stats, диапазон годов и регионы partitions
+    """
+    return (job['mode'], job['file'], bool(job.get('store')), job.get('chunksize'), job.get('cache_file'),
+            job.get('sample') if job['mode'] == 'stats' else None) + \
+        (query_key(job) if job['mode'] == 'partitions' else (None, None))
+
+
+def query_key(job):
+    """
+    Функция возвращает запрос partitions в неизменяемом виде для сравнения ключей
+
+    Args:
+        job (dict): Параметры задания
+
+    Returns:
+        (tuple): Диапазон годов (или None) и регионы (или None)
+
+    >>> query_key({'years': [2015, None], 'regions': ['Москва']})
+    ((2015, None), ('Москва',))
+    >>> query_key({})
+    (None, None)
+    """
+    years = tuple(job['years']) if job.get('years') else None
+    regions = tuple(job['regions']) if job.get('regions') else None
+    return years, regions
+
+
+def release_data(key, data):
+    """
+    Функция освобождает данные, загруженные load_data
+
+    Args:
+        key (tuple or None): Ключ load_key
+        data: Набор данных
+    """
+    if key is not None and key[0] == 'sql':
+        data.close()
+
+
+def read_jobs(file_name):
+    """
+    Функция читает файл заданий
+
+    Args:
+        file_name (str): Имя JSON файла со списком заданий
+
+    Returns:
+        (list): Список заданий
+    """
+    with open(file_name, encoding='utf-8') as file:
+        jobs = json.load(file)
+    for job in jobs:
+        if job.get('mode') not in MODES:
+            raise ValueError(f'Неизвестный режим задания: {job.get("mode")}')
+        if 'file' not in job:
+            raise ValueError('В задании не указан файл')
+    return jobs
+
+
+def create_parser():
+    """
+    Функция создает парсер аргументов командной строки
+
+    Returns:
+        (ArgumentParser): Парсер аргументов
+    """
+    parser = argparse.ArgumentParser(description='Отчеты по вакансиям')
+    parser.add_argument('--profile', nargs='?', const='profile.jsonl', metavar='LOG',
+                        help='Записывать время, строки и память этапов в JSONL журнал (по умолчанию profile.jsonl)')
+    parser.add_argument('--cprofile', action='store_true', help='Сохранять cProfile каждого этапа (вместе с --profile)')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='Записывать пик памяти по tracemalloc (вместе с --profile)')
+    commands = parser.add_subparsers(dest='mode', required=True)
+
+    table = commands.add_parser('table', help='Табличная печать вакансий (table_out)')
+    table.add_argument('file')
+    table.add_argument('--filter', default='', help='Параметр фильтрации, например "Оклад: 50000"')
+    table.add_argument('--sort', default='', help='Параметр сортировки')
+    table.add_argument('--reverse', default='', choices=['', 'Да', 'Нет'])
+    table.add_argument('--range', nargs='*', default=[], help='Диапазон вывода')
+    table.add_argument('--fields', default='', help='Требуемые столбцы через ", "')
+    table.add_argument('--store', action='store_true',
+                       help='Открывать вакансии из хранилища рядом с файлом (строится при первом запуске)')
+    table.add_argument('--page-size', type=int, help='Постраничный вывод по указанному количеству строк')
+    table.add_argument('--pages', type=int, help='Количество выводимых страниц (по умолчанию все)')
+    table.add_argument('--cursor', help='Продолжить вывод с курсора, напечатанного предыдущим запуском')
+    table.add_argument('--format', default='table', choices=['table', 'csv', 'jsonl'],
+                       help='Формат постраничного вывода')
+
+    for mode, help_line in (('stats', 'Статистика по вакансиям (report_out_old)'),
+                            ('partitions', 'Статистика по файлам годов (report_out)'),
+                            ('report', 'Статистика с переводом валют и PDF отчетом (task3.4.2)'),
+                            ('sql', 'Статистика из базы данных (task3.5.3)')):
+        command = commands.add_parser(mode, help=help_line)
+        command.add_argument('file')
+        command.add_argument('profession', nargs='+', help='Одна или несколько профессий')
+        if mode in ('stats', 'report'):
+            command.add_argument('--index', action='store_true',
+                                 help='Искать профессии по индексу названий, сохраненному рядом с файлом')
+        if mode in ('stats', 'report'):
+            command.add_argument('--chart', action='store_true', help='Встроить графики в pdf и html отчеты (SVG)')
+        if mode == 'stats':
+            command.add_argument('--outputs', nargs='+', choices=['xlsx', 'xlsx_stream', 'png', 'svg', 'pdf', 'html'],
+                                 help='Сформировать отчеты report_out_old.Report одновременно')
+        if mode in ('stats', 'partitions', 'sql'):
+            command.add_argument('--sample', type=int, metavar='N',
+                                 help='Приближенная статистика с 95%% интервалами, медианой и перцентилями по '
+                                      'случайной выборке: N строк каждого года (для sql - N строк таблицы); '
+                                      'отчеты не формируются')
+        if mode == 'partitions':
+            command.add_argument('--years', nargs=2, type=int, metavar=('FROM', 'TO'),
+                                 help='Считать только годы из диапазона: файлы остальных годов не открываются')
+            command.add_argument('--regions', nargs='+', metavar='REGION',
+                                 help='Считать только вакансии регионов: остальные строки отбрасываются при чтении')
+        if mode == 'report':
+            command.add_argument('--pdf', default='report_new.pdf',
+                                 help='Имя отчета: PDF или HTML, если имя заканчивается на .html')
+            command.add_argument('--combined', action='store_true',
+                                 help='Собрать отчеты всех профессий в один файл одним запуском wkhtmltopdf')
+            command.add_argument('--chunksize', type=int,
+                                 help='Читать файл частями из указанного количества строк, не загружая его '
+                                      'в память целиком (без --index)')
+            command.add_argument('--regex', action=argparse.BooleanOptionalAction,
+                                 help='Искать профессии как регулярные выражения (по умолчанию, если профессия '
+                                      'одна) или как подстроки (по умолчанию для нескольких профессий); '
+                                      'с --index - всегда как подстроки')
+            command.add_argument('--cache-file',
+                                 help='Сохранять переведенные вакансии в файл и читать их из него, пока '
+                                      'исходный файл и курсы не изменятся')
+
+    session = commands.add_parser('session', help='Сеанс запросов table_out на загруженных данных')
+    session.add_argument('file')
+    session.add_argument('--cache', type=int, default=32, help='Количество запросов в LRU кэше')
+    session.add_argument('--no-store', action='store_true', help='Загрузить вакансии без хранилища')
+
+    batch = commands.add_parser('batch', help='Пакетный режим')
+    batch.add_argument('jobs', help='JSON файл со списком заданий')
+    return parser
+
+
+def main(argv=None):
+    """
+    Функция разбирает аргументы и запускает задания
+
+    Args:
+        argv (list or None): Аргументы командной строки
+
+    Returns:
+        (int): Код возврата: 1, если хотя бы одно задание завершилось с ошибкой
+    """
+    args = create_parser().parse_args(argv)
+    if args.profile:
+        import profiling
+        profiling.configure(args.profile, args.cprofile, args.tracemalloc)
+    if args.mode == 'batch':
+        return 1 if run_batch(read_jobs(args.jobs)) else 0
+    if args.mode == 'session':
+        import table_session
+        table_session.Session(args.file, not args.no_store, args.cache).loop()
+        return 0
+
+    job = vars(args)
+    if args.mode == 'table':
+        job['fields'] = args.fields.split(', ')
+    return 1 if run_batch([job]) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,16 +1,18 @@
 """
 Этот модуль нужен для объединения работы модуля по формированию отчетов
-и модуль по табличной печати вакансий
-"""
+и модуль по табличной печати вакансий.
 
-import report_out_old
-import table_out
+Модули импортируются только после выбора режима, чтобы табличная печать
+не загружала библиотеки для построения графиков и отчетов
+"""
 
 
 type_out = input('Введите данные для печати: ')
 if type_out == 'Вакансии':
+    import table_out
     table_out.InputConnect()
 elif type_out == 'Статистика':
+    import report_out_old
     report_out_old.InputConnect()
 else:
-    print('Некорректный ввод!')
\ No newline at end of file
+    print('Некорректный ввод!')
@@ -1,17 +1,278 @@
-import multiprocessing
-from report_out_old import formatter_date
+"""
+Многопроцессорный расчет статистики report_out_old по каталогу файлов годов.
+
+Файлы каталога (например, csv_files после report_out.InputConnect.split_data)
+распределяются между процессами пула через imap_unordered. Каждый процесс
+возвращает частичный результат: суммы зарплат в рублях и количество вакансий по
+годам, профессиям и городам. Зарплаты report_out_old - целые числа, поэтому
+частичные суммы складываются без ошибок округления и итог совпадает с
+report_out_old.InputConnect.get_multi_statistics. При равных значениях города
+упорядочиваются по первому появлению в файлах каталога, взятых по имени
+
+Запуск: python multiproc_report_out.py csv_files Программист --processes 4 --compare vacancies.csv
+"""
+
+import argparse
+import os
+import time
+from multiprocessing import Pool
+import numpy as np
 import pandas as pd
+import categories
+import report_out_old
+import timestamps
+import vacancy_schema
+from profession_matcher import ProfessionMatcher
 
 
 class MultiInputConnect:
-    def __init__(self, file_name):
+    """
+    Класс считает статистику по каталогу файлов годов пулом процессов
+
+    Attributes:
+        directory (str): Каталог с CSV файлами
+        processes (int or None): Количество процессов, None - по количеству ядер
+        chunksize (int or None): Количество файлов в одном задании imap_unordered,
+            None - около четырех заданий на процесс
+    """
+    def __init__(self, directory, processes=None, chunksize=None):
+        """
+        Конструктор сохраняет параметры пула
+
+        Args:
+            directory (str): Каталог с CSV файлами
+            processes (int or None): Количество процессов
+            chunksize (int or None): Количество файлов в одном задании
+        """
         pd.set_option('expand_frame_repr', False)
+        self.directory = directory
+        self.processes = processes
+        self.chunksize = chunksize
+
+    def partition_files(self):
+        """
+        Метод возвращает CSV файлы каталога в порядке имен
+
+        Returns:
+            (list): Пути к файлам
+        """
+        return [os.path.join(self.directory, file) for file in sorted(os.listdir(self.directory))
+                if file.endswith('.csv')]
+
+    @staticmethod
+    def salaries(df):
+        """
+        Метод переводит вилки оклада в рубли так же, как report_out_old.Salary:
+        границы отбрасывают дробную часть, середина вилки округляется к нулю
+
+        Args:
+            df (DataFrame): Вакансии с границами оклада и валютой
+
+        Returns:
+            (ndarray): Зарплаты в рублях (int64)
+
+        >>> df = pd.DataFrame({'salary_from': [10000.0, 1500.0], 'salary_to': [50000.0, 6000.0],
+        ...                    'salary_currency': ['RUR', 'GEL']})
+        >>> MultiInputConnect.salaries(df).tolist() == [report_out_old.Salary(10000, 50000, 'RUR').salary_ru,
+        ...                                              report_out_old.Salary(1500, 6000, 'GEL').salary_ru]
+        True
+        """
+        rates = categories.map_codes(df['salary_currency'], report_out_old.currency_to_rub)
+        salary_from = np.trunc(df['salary_from'].to_numpy(dtype=float)) * rates
+        salary_to = np.trunc(df['salary_to'].to_numpy(dtype=float)) * rates
+        return ((salary_from + salary_to) / 2).astype(np.int64)
+
+    @staticmethod
+    def group_totals(codes, keys, salary):
+        """
+        Метод считает сумму зарплат и количество строк по кодам
+
+        Args:
+            codes (ndarray): Коды строк
+            keys (list): Значения кодов
+            salary (ndarray): Зарплаты строк (int64)
+
+        Returns:
+            (dict): Значение -> [сумма зарплат, количество строк]
+        """
+        sums = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(sums, codes, salary)
+        sizes = np.bincount(codes, minlength=len(keys))
+        return {key: [int(sums[i]), int(sizes[i])] for i, key in enumerate(keys) if sizes[i]}
 
     @staticmethod
-    def data_preparation(file_name):
-        df = pd.read_csv(file_name)
-        df['published_at'] = df['published_at'].apply(formatter_date)
-        df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-        year = df['published_at'].values(0)
+    def data_preparation(args):
+        """
+        Метод считает частичный результат по одному файлу. Как и в report_out_old,
+        строки с пустыми полями пропускаются
+
+        Args:
+            args (tuple): Номер файла в каталоге, путь к файлу и названия профессий
+
+        Returns:
+            (dict): Суммы и количества по годам (years), профессиям (jobs) и городам
+            (cities); для городов также номер файла и строки первого появления
+        """
+        number, file_name, job_names = args
+        df = vacancy_schema.read_csv(file_name, 'multiproc_report_out', keep_default_na=False, na_values=[''])
+        df = df.dropna().reset_index(drop=True)
+        salary = MultiInputConnect.salaries(df)
+        if pd.api.types.is_numeric_dtype(df['published_at']):
+            years = df['published_at'].to_numpy(dtype=np.int64)
+        else:
+            years = timestamps.parse_column(df['published_at'])[1]
+        year_codes, year_keys = pd.factorize(years)
+        year_keys = [int(year) for year in year_keys]
+
+        name_codes, names = pd.factorize(df['name'])
+        name_indexes, job_indexes = ProfessionMatcher(job_names).match_pairs(list(names))
+        matches = np.zeros((len(job_names), len(names) + 1), dtype=bool)
+        matches[job_indexes, name_indexes] = True
+        jobs = []
+        for i in range(len(job_names)):
+            rows = matches[i][name_codes]
+            jobs.append(MultiInputConnect.group_totals(year_codes[rows], year_keys, salary[rows]))
+
+        area_codes, areas = categories.encode(df['area_name'])
+        cities = MultiInputConnect.group_totals(area_codes, list(areas), salary)
+        for code, row in zip(*np.unique(area_codes, return_index=True)):
+            cities[areas[code]].append((number, int(row)))
+        return {'years': MultiInputConnect.group_totals(year_codes, year_keys, salary), 'jobs': jobs, 'cities': cities}
+
+    def iter_partials(self, job_names):
+        """
+        Метод распределяет файлы каталога по процессам и отдает частичные
+        результаты по мере готовности
+
+        Args:
+            job_names (list): Названия профессий
+
+        Returns:
+            (iterator): Частичные результаты data_preparation
+        """
+        files = self.partition_files()
+        processes = self.processes or os.cpu_count()
+        chunksize = self.chunksize or max(1, len(files) // (processes * 4))
+        with Pool(processes) as pool:
+            yield from pool.imap_unordered(MultiInputConnect.data_preparation,
+                                           [(number, file, job_names) for number, file in enumerate(files)],
+                                           chunksize)
+
+    @staticmethod
+    def merge(total, partial):
+        """
+        Метод добавляет частичные суммы к общим
+
+        Args:
+            total (dict): Значение -> [сумма, количество, ...]
+            partial (dict): Значение -> [сумма, количество, ...] одного файла
+        """
+        for key, value in partial.items():
+            if key not in total:
+                total[key] = list(value)
+                continue
+            total[key][0] += value[0]
+            total[key][1] += value[1]
+            if len(value) > 2:
+                total[key][2] = min(total[key][2], value[2])
+
+    def get_multi_statistics(self, job_names):
+        """
+        Метод считает статистику для нескольких профессий в формате
+        report_out_old.InputConnect.get_multi_statistics
+
+        Args:
+            job_names (list): Названия профессий
+
+        Returns:
+            (dict): Профессия -> список словарей статистики
+        """
+        job_names = list(dict.fromkeys(job_names))
+        years_total, cities_total = {}, {}
+        jobs_total = [{} for _ in job_names]
+        for partial in self.iter_partials(job_names):
+            MultiInputConnect.merge(years_total, partial['years'])
+            MultiInputConnect.merge(cities_total, partial['cities'])
+            for total, job_partial in zip(jobs_total, partial['jobs']):
+                MultiInputConnect.merge(total, job_partial)
+        if not years_total:
+            report_out_old.exit_with_print('Нет данных')
+
+        years = list(range(min(years_total), max(years_total) + 1))
+
+        def year_means(totals):
+            return {year: int(totals[year][0] / totals[year][1]) if year in totals else 0 for year in years}
+
+        def year_counts(totals):
+            return {year: totals[year][1] if year in totals else 0 for year in years}
+
+        count = sum(size for _, size in years_total.values())
+        cities = sorted(cities_total.items(), key=lambda item: item[1][2])
+        area_list = [(city, total, size) for city, (total, size, _) in cities if size / count > 0.01]
+        area_list = sorted(area_list, key=lambda x: x[1] / x[2], reverse=True)
+        salary_by_cities = {x[0]: int(x[1] / x[2]) for x in area_list[:10]}
+        vacs_count = {city: round(size / count, 4) for city, (_, size, _) in cities}
+        vacs_count = {key: value for key, value in vacs_count.items() if value >= 0.01}
+        vacs_by_cities = dict(sorted(vacs_count.items(), key=lambda x: x[1], reverse=True)[:10])
+
+        return {job_name: [year_means(years_total), year_counts(years_total), year_means(jobs_total[i]),
+                           year_counts(jobs_total[i]), salary_by_cities, vacs_by_cities]
+                for i, job_name in enumerate(job_names)}
+
+
+def compare(directory, file_name, job_names, processes=None, chunksize=None):
+    """
+    Функция считает статистику пулом процессов по каталогу и одним процессом
+    report_out_old по исходному файлу и печатает время и ускорение
+
+    Args:
+        directory (str): Каталог с файлами годов
+        file_name (str): Исходный файл, из которого получен каталог
+        job_names (list): Названия профессий
+        processes (int or None): Количество процессов
+        chunksize (int or None): Количество файлов в одном задании
+
+    Returns:
+        (float, float, bool): Время пула, время report_out_old в секундах и
+        совпадение результатов
+    """
+    start = time.perf_counter()
+    statistics = MultiInputConnect(directory, processes, chunksize).get_multi_statistics(job_names)
+    pool_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vacancies = report_out_old.DataSet(file_name).vacancies_objects
+    expected = report_out_old.InputConnect.get_multi_statistics(vacancies, job_names)
+    single_seconds = time.perf_counter() - start
+
+    same = statistics == expected
+    print(f'Пул процессов: {pool_seconds:.2f} с, report_out_old: {single_seconds:.2f} с, '
+          f'ускорение {single_seconds / pool_seconds:.2f}x, результаты {"совпадают" if same else "РАЗЛИЧАЮТСЯ"}')
+    return pool_seconds, single_seconds, same
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Статистика report_out_old по каталогу файлов годов пулом процессов')
+    parser.add_argument('directory', help='Каталог с файлами годов, например csv_files')
+    parser.add_argument('profession', nargs='+', help='Одна или несколько профессий')
+    parser.add_argument('--processes', type=int, help='Количество процессов (по умолчанию по количеству ядер)')
+    parser.add_argument('--chunksize', type=int, help='Количество файлов в одном задании пула')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='Сравнить время и результат с report_out_old по исходному файлу')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.directory, args.compare, args.profession, args.processes, args.chunksize)
+        return
+    start = time.perf_counter()
+    statistics = MultiInputConnect(args.directory, args.processes, args.chunksize).get_multi_statistics(
+        args.profession)
+    for profession, data_list in statistics.items():
+        if len(statistics) > 1:
+            print(f'--- {profession}')
+        report_out_old.InputConnect.print_statistics(data_list)
+    print(f'Время: {time.perf_counter() - start:.2f} секунд')
 
 
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Модуль строит инвертированный индекс по названиям вакансий и хранит его рядом
+с файлом данных. По индексу статистика для профессии считается только по
+подходящим строкам, без повторного просмотра всех названий
+"""
+
+import os
+import pickle
+import re
+from array import array
+
+INDEX_VERSION = 1
+NGRAM = 3
+
+
+def normalize(line):
+    """
+    Функция приводит название к нижнему регистру и схлопывает пробелы
+
+    Args:
+        line (str): Исходная строка
+
+    Returns:
+        (str): Нормализованная строка
+
+    >>> normalize('  Python   Разработчик ')
+    'python разработчик'
+    """
+    return ' '.join(line.lower().split())
+
+
+def ngrams(line):
+    """
+    Функция возвращает множество символьных n-грамм строки
+
+    Args:
+        line (str): Нормализованная строка
+
+    Returns:
+        (set): Множество n-грамм
+
+    >>> sorted(ngrams('java'))
+    ['ava', 'jav']
+    """
+    return {line[i:i + NGRAM] for i in range(len(line) - NGRAM + 1)}
+
+
+class NameIndex:
+    """
+    Индекс по названиям вакансий: слова и символьные триграммы указывают на
+    уникальные названия, а каждое уникальное название - на номера строк набора данных
+
+    Attributes:
+        names (list): Уникальные названия
+        name_rows (list): Для каждого уникального названия массив номеров строк
+        tokens (dict): Нормализованное слово -> массив номеров уникальных названий
+        grams (dict): Триграмма -> массив номеров уникальных названий
+        row_count (int): Количество строк в наборе данных
+    """
+    def __init__(self, names):
+        """
+        В конструкторе строится индекс по названиям в порядке строк набора данных
+
+        Args:
+            names (list): Названия вакансий. Пропуски (NaN из pandas) считаются пустыми названиями
+        """
+        name_codes = {}
+        self.names = []
+        self.name_rows = []
+        self.row_count = 0
+        for row, name in enumerate(names):
+            if not isinstance(name, str):
+                name = ''
+            code = name_codes.get(name)
+            if code is None:
+                code = name_codes[name] = len(self.names)
+                self.names.append(name)
+                self.name_rows.append(array('i'))
+            self.name_rows[code].append(row)
+            self.row_count += 1
+
+        self.tokens = {}
+        self.grams = {}
+        for code, name in enumerate(self.names):
+            line = normalize(name)
+            for token in set(re.findall(r'\w+', line)):
+                self.tokens.setdefault(token, array('i')).append(code)
+            for gram in ngrams(line):
+                self.grams.setdefault(gram, array('i')).append(code)
+
+    def candidates(self, substring):
+        """
+        Метод находит уникальные названия, которые могут содержать подстроку
+
+        Args:
+            substring (str): Искомая подстрока
+
+        Returns:
+            (iterable): Номера уникальных названий
+        """
+        grams = ngrams(normalize(substring))
+        if not grams:
+            # Для коротких строк триграмм нет, проверяются все названия
+            return range(len(self.names))
+        postings = []
+        for gram in grams:
+            if gram not in self.grams:
+                return []
+            postings.append(self.grams[gram])
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return sorted(result)
+
+    def search(self, substring):
+        """
+        Метод возвращает номера строк, в названии которых есть подстрока. Проверка
+        чувствительна к регистру, как и job_name in vacancy.name
+
+        Args:
+            substring (str): Искомая подстрока
+
+        Returns:
+            (list): Отсортированные номера строк
+        """
+        rows = []
+        for code in self.candidates(substring):
+            if substring in self.names[code]:
+                rows.extend(self.name_rows[code])
+        rows.sort()
+        return rows
+
+    def search_token(self, token):
+        """
+        Метод возвращает номера строк, в названии которых есть слово (без учета регистра)
+
+        Args:
+            token (str): Искомое слово
+
+        Returns:
+            (list): Отсортированные номера строк
+        """
+        rows = []
+        for code in self.tokens.get(normalize(token), []):
+            rows.extend(self.name_rows[code])
+        rows.sort()
+        return rows
+
+    @staticmethod
+    def index_path(file_name):
+        """
+        Метод возвращает путь к файлу индекса для файла данных
+
+        Args:
+            file_name (str): Имя файла данных
+
+        Returns:
+            (str): Имя файла индекса
+        """
+        return file_name + '.names.idx'
+
+    @staticmethod
+    def source_key(file_name):
+        """
+        Метод возвращает ключ, по которому проверяется актуальность индекса
+
+        Args:
+            file_name (str): Имя файла данных
+
+        Returns:
+            (tuple): Версия индекса, размер и время изменения файла
+        """
+        stat = os.stat(file_name)
+        return INDEX_VERSION, stat.st_size, stat.st_mtime_ns
+
+    def save(self, file_name):
+        """
+        Метод сохраняет индекс рядом с файлом данных
+
+        Args:
+            file_name (str): Имя файла данных
+        """
+        with open(NameIndex.index_path(file_name), 'wb') as file:
+            pickle.dump((NameIndex.source_key(file_name), self), file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(file_name, row_count=None):
+        """
+        Метод загружает индекс, если он существует и соответствует файлу данных
+
+        Args:
+            file_name (str): Имя файла данных
+            row_count (int or None): Ожидаемое количество строк
+
+        Returns:
+            (NameIndex or None): Индекс или None, если его нужно построить заново
+        """
+        path = NameIndex.index_path(file_name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as file:
+            key, index = pickle.load(file)
+        if key != NameIndex.source_key(file_name):
+            return None
+        if row_count is not None and index.row_count != row_count:
+            return None
+        return index
+
+    @staticmethod
+    def for_file(file_name, names):
+        """
+        Метод загружает сохраненный индекс или строит и сохраняет новый
+
+        Args:
+            file_name (str): Имя файла данных
+            names (list): Названия вакансий в порядке строк набора данных
+
+        Returns:
+            (NameIndex): Индекс
+        """
+        names = list(names)
+        index = NameIndex.load(file_name, len(names))
+        if index is None:
+            index = NameIndex(names)
+            index.save(file_name)
+        return index
@@ -0,0 +1,119 @@
+"""
+Модуль ищет вхождения сразу нескольких названий профессий в название вакансии
+за один проход по строке с помощью автомата Ахо-Корасик
+"""
+
+import functools
+from collections import deque
+
+CACHE_SIZE = 65536
+
+
+class ProfessionMatcher:
+    """
+    Автомат Ахо-Корасик по списку профессий. Поиск чувствителен к регистру,
+    как и проверка job_name in vacancy.name в остальных модулях
+
+    Attributes:
+        professions (list): Список профессий в исходном порядке
+    """
+    def __init__(self, professions, cache_size=CACHE_SIZE):
+        """
+        В конструкторе строится бор по профессиям и суффиксные ссылки
+
+        Args:
+            professions (list): Список названий профессий
+            cache_size (int): Сколько последних названий хранит кэш find
+
+        >>> ProfessionMatcher(['программист', 'Python']).find('Python программист')
+        [0, 1]
+        >>> ProfessionMatcher(['аналитик', 'системный аналитик']).find('Системный аналитик')
+        [0]
+        >>> ProfessionMatcher(['', 'Java']).find('Дизайнер')
+        [0]
+        """
+        self.professions = list(professions)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._empty = []
+        self._cache = functools.lru_cache(maxsize=cache_size)(self._search)
+
+        for index, profession in enumerate(self.professions):
+            if profession == '':
+                # Пустая строка входит в любое название
+                self._empty.append(index)
+                continue
+            state = 0
+            for char in profession:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """
+        Метод находит профессии, которые входят в строку. Результаты кэшируются,
+        так как названия вакансий часто повторяются; кэш ограничен cache_size
+        названиями и вытесняет давно не встречавшиеся
+
+        Args:
+            text (str): Название вакансии
+
+        Returns:
+            (list): Отсортированный список индексов профессий
+        """
+        return self._cache(text)
+
+    def _search(self, text):
+        """
+        Метод проходит строку автоматом без кэша
+
+        Args:
+            text (str): Название вакансии
+
+        Returns:
+            (list): Отсортированный список индексов профессий
+        """
+        found = set(self._empty)
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found.update(self._output[state])
+        return sorted(found)
+
+    def match_pairs(self, names):
+        """
+        Метод сопоставляет список названий с профессиями
+
+        Args:
+            names (list): Список названий вакансий (обычно уникальных)
+
+        Returns:
+            (list, list): Индексы названий и индексы профессий для каждой найденной пары
+        """
+        name_indexes = []
+        profession_indexes = []
+        for i, name in enumerate(names):
+            for profession in self.find(name):
+                name_indexes.append(i)
+                profession_indexes.append(profession)
+        return name_indexes, profession_indexes
@@ -0,0 +1,222 @@
+"""
+Модуль замеряет этапы конвейеров отчетов: чтение, разбор, очистку, перевод
+валют, агрегацию статистики и формирование отчетов.
+
+Замеры включаются переменной окружения VACANCY_PROFILE (или флагом --profile
+в cli.py). Значение 1 пишет журнал в profile.jsonl, любое другое значение
+считается именем файла журнала. Каждая строка журнала - JSON с названием
+конвейера и этапа, временем, количеством строк, строками в секунду и пиковым
+RSS процесса. Дополнительно:
+    VACANCY_PROFILE_CPROFILE=1    - сохранять cProfile каждого этапа в .prof файл рядом с журналом
+    VACANCY_PROFILE_TRACEMALLOC=1 - записывать пик памяти Python по tracemalloc
+
+Переменные окружения наследуются процессами ProcessPoolExecutor, поэтому
+этапы, выполненные в дочерних процессах, попадают в тот же журнал.
+Без VACANCY_PROFILE этапы ничего не замеряют
+
+Сводка по журналу: python profiling.py profile.jsonl
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+
+ENV_LOG = 'VACANCY_PROFILE'
+ENV_CPROFILE = 'VACANCY_PROFILE_CPROFILE'
+ENV_TRACEMALLOC = 'VACANCY_PROFILE_TRACEMALLOC'
+DEFAULT_LOG = 'profile.jsonl'
+
+_active_profile = False
+_stage_number = 0
+
+
+class StageRecord:
+    """
+    Класс хранит результат этапа. Количество строк можно задать внутри блока with,
+    когда оно становится известно
+
+    Attributes:
+        pipeline (str): Название конвейера
+        name (str): Название этапа
+        rows (int or None): Количество обработанных строк
+    """
+    def __init__(self, pipeline, name, rows=None):
+        self.pipeline = pipeline
+        self.name = name
+        self.rows = rows
+
+
+def log_file():
+    """
+    Функция возвращает файл журнала или None, если замеры выключены
+
+    Returns:
+        (str or None): Имя файла журнала
+    """
+    value = os.environ.get(ENV_LOG, '')
+    if value in ('', '0'):
+        return None
+    return DEFAULT_LOG if value == '1' else value
+
+
+def enabled():
+    """
+    Функция проверяет, включены ли замеры
+
+    Returns:
+        (bool): Включены ли замеры
+    """
+    return log_file() is not None
+
+
+def configure(log=DEFAULT_LOG, cprofile=False, trace_memory=False):
+    """
+    Функция включает замеры для текущего и дочерних процессов
+
+    Args:
+        log (str): Имя файла журнала
+        cprofile (bool): Сохранять cProfile каждого этапа
+        trace_memory (bool): Записывать пик памяти по tracemalloc
+    """
+    os.environ[ENV_LOG] = os.path.abspath(log)
+    os.environ[ENV_CPROFILE] = '1' if cprofile else '0'
+    os.environ[ENV_TRACEMALLOC] = '1' if trace_memory else '0'
+
+
+def peak_rss_mb():
+    """
+    Функция возвращает пиковый размер резидентной памяти процесса
+
+    Returns:
+        (float or None): Пиковый RSS в мегабайтах или None, если модуль resource недоступен
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux возвращает килобайты, macOS - байты
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def write_record(file_name, record):
+    """
+    Функция дописывает строку в журнал
+
+    Args:
+        file_name (str): Имя файла журнала
+        record (dict): Запись этапа
+    """
+    with open(file_name, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+@contextlib.contextmanager
+def stage(pipeline, name, rows=None):
+    """
+    Функция замеряет этап конвейера. Вложенные этапы замеряются, но cProfile
+    сохраняется только для внешнего
+
+    Args:
+        pipeline (str): Название конвейера
+        name (str): Название этапа
+        rows (int or None): Количество строк, если известно заранее
+
+    Returns:
+        (contextmanager): Блок with, возвращающий StageRecord
+    """
+    global _active_profile, _stage_number
+    record = StageRecord(pipeline, name, rows)
+    file_name = log_file()
+    if file_name is None:
+        yield record
+        return
+
+    profile = None
+    if os.environ.get(ENV_CPROFILE) == '1' and not _active_profile:
+        import cProfile
+        profile = cProfile.Profile()
+        _active_profile = True
+    trace = os.environ.get(ENV_TRACEMALLOC) == '1'
+    if trace:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    try:
+        yield record
+    finally:
+        if profile is not None:
+            profile.disable()
+            _active_profile = False
+        seconds = time.perf_counter() - start
+        result = {'pipeline': pipeline, 'stage': name, 'seconds': round(seconds, 6), 'rows': record.rows,
+                  'rows_per_second': round(record.rows / seconds) if record.rows and seconds else None,
+                  'peak_rss_mb': peak_rss_mb(), 'pid': os.getpid(), 'time': round(time.time(), 3)}
+        if trace:
+            result['tracemalloc_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        if profile is not None:
+            _stage_number += 1
+            stem = os.path.splitext(file_name)[0]
+            result['cprofile'] = f'{stem}.{pipeline}.{name}.{os.getpid()}.{_stage_number}.prof'
+            profile.dump_stats(result['cprofile'])
+        write_record(file_name, result)
+
+
+def profiled(pipeline, name, rows_arg=None):
+    """
+    Функция создает декоратор, который замеряет каждый вызов функции как этап
+
+    Args:
+        pipeline (str): Название конвейера
+        name (str): Название этапа
+        rows_arg (int or None): Номер позиционного аргумента, длина которого - количество строк
+
+    Returns:
+        (function): Декоратор
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            rows = len(args[rows_arg]) if rows_arg is not None and enabled() else None
+            with stage(pipeline, name, rows):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summarize(file_name):
+    """
+    Функция суммирует журнал по конвейерам и этапам
+
+    Args:
+        file_name (str): Имя файла журнала
+
+    Returns:
+        (dict): (конвейер, этап) -> [количество, секунды, строки, пиковый RSS]
+    """
+    summary = {}
+    with open(file_name, encoding='utf-8') as file:
+        for line in file:
+            record = json.loads(line)
+            item = summary.setdefault((record['pipeline'], record['stage']), [0, 0.0, 0, 0.0])
+            item[0] += 1
+            item[1] += record['seconds']
+            item[2] += record['rows'] or 0
+            item[3] = max(item[3], record['peak_rss_mb'] or 0)
+    return summary
+
+
+if __name__ == '__main__':
+    for (pipeline, name), (count, seconds, rows, rss) in summarize(sys.argv[1] if len(sys.argv) > 1
+                                                                   else DEFAULT_LOG).items():
+        speed = f'{rows / seconds:,.0f} строк/с' if rows and seconds else ''
+        print(f'{pipeline:<15}{name:<20}{count:>4} раз {seconds:10.3f} с {rows:>10} строк {speed:>20}'
+              f' {rss:8.1f} МБ')
@@ -7,6 +7,10 @@ import concurrent.futures as cf
 import numpy as np
 import pandas as pd
 from multiprocessing import Pool
+import categories
+import profiling
+import timestamps
+import vacancy_schema
 
 
 def formatter_date(input_date):
@@ -17,13 +21,13 @@ def formatter_date(input_date):
         input_date (str): Исходная данные
 
     Returns:
-        (str): Дата в нужном формате
+        (int): Год публикации
     """
-    return int(input_date[:4])
+    return timestamps.year(input_date)
 
 
 def mean_to_number(numb):
-    if numb == np.NAN:
+    if np.isnan(numb):
         return 0
     else:
         return int(numb)
@@ -54,18 +58,141 @@ currency_to_rub = {
 #                       mean_to_number(df[df['name'].str.contains(job_name)]['salary'].mean()),
 #                       len(df[df['name'].str.contains(job_name)])])
 
+def salary_midpoints(salary_from, salary_to, rates):
+    """
+    Функция переводит вилку оклада в рубли и считает ее середину по массивам без
+    промежуточной таблицы. Пропуски обрабатываются как в mean(axis=1) pandas: если
+    одна граница не указана, берется другая, если обе - NaN
+
+    Args:
+        salary_from (ndarray): Нижние границы оклада
+        salary_to (ndarray): Верхние границы оклада
+        rates (ndarray): Курсы валют строк, NaN для неизвестной валюты
+
+    Returns:
+        (ndarray): Середины вилок в рублях
+
+    >>> salary_midpoints(np.array([100.0, np.nan, 10.0, np.nan]), np.array([200.0, 50.0, np.nan, np.nan]),
+    ...                  np.array([1.0, 2.0, 3.0, 1.0]))
+    array([150., 100.,  30.,  nan])
+    """
+    salary_from = np.asarray(salary_from, dtype=np.float64) * rates
+    salary_to = np.asarray(salary_to, dtype=np.float64) * rates
+    from_missing = np.isnan(salary_from)
+    to_missing = np.isnan(salary_to)
+    total = np.where(from_missing, 0.0, salary_from) + np.where(to_missing, 0.0, salary_to)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / (2 - from_missing.astype(np.int8) - to_missing)
+
+
+def nan_mean(values):
+    """
+    Функция считает среднее без учета NaN теми же операциями, что и Series.mean
+
+    Args:
+        values (ndarray): Значения
+
+    Returns:
+        (float): Среднее или NaN, если значений нет
+    """
+    valid = ~np.isnan(values)
+    count = np.count_nonzero(valid)
+    return np.where(valid, values, 0.0).sum() / count if count else np.nan
+
+
 def new_prepare_data(args):
+    """
+    Функция считает статистику по файлу одного года. Из файла читаются только
+    нужные колонки с заданными типами, зарплаты считаются по массивам NumPy
+
+    Args:
+        args (tuple): Имя файла года и название профессии
+
+    Returns:
+        (list): Год, средняя зарплата, количество вакансий, средняя зарплата и
+        количество вакансий для профессии
+    """
     file_name = args[0]
     job_name = args[1]
-    df = pd.read_csv(file_name)
-    df['salary_from'] = df['salary_currency'].map(currency_to_rub) * df['salary_from']
-    df['salary_to'] = df['salary_currency'].map(currency_to_rub) * df['salary_to']
-    df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-    year = df['published_at'].values[0]
+    with profiling.stage('report_out', 'read_partition') as stage:
+        df = vacancy_schema.read_csv(file_name, 'partition')
+        stage.rows = len(df)
+    with profiling.stage('report_out', 'aggregate_partition', len(df)):
+        salary = salary_midpoints(df['salary_from'].to_numpy(), df['salary_to'].to_numpy(),
+                                  categories.map_codes(df['salary_currency'], currency_to_rub))
+        year = df['published_at'].values[0]
+        job_salary = salary[df['name'].str.contains(job_name).to_numpy()]
+        return [year, int(nan_mean(salary)), len(df), mean_to_number(nan_mean(job_salary)), len(job_salary)]
+
+
+def select_rows(df, years=None, regions=None):
+    """
+    Функция оставляет вакансии из диапазона годов и списка регионов. Год берется
+    по первым четырем символам даты, регионы сравниваются по категориям area_name
+
+    Args:
+        df (DataFrame): Вакансии с колонками published_at и area_name
+        years (tuple or None): Первый и последний год диапазона включительно, None
+            для открытой границы
+        regions (list or None): Названия регионов
 
-    return [year, int(df['salary'].mean()), len(df),
-            mean_to_number(df[df['name'].str.contains(job_name)]['salary'].mean()),
-            len(df[df['name'].str.contains(job_name)])]
+    Returns:
+        (DataFrame): Подходящие вакансии; df без изменений, если запрос пуст
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if years is not None:
+        published = timestamps.year_column(df['published_at'])
+        first, last = years
+        if first is not None:
+            mask &= published >= first
+        if last is not None:
+            mask &= published <= last
+    if regions:
+        mask &= df['area_name'].isin(regions).to_numpy()
+    return df if mask.all() else df[mask]
+
+
+def read_vacancies(file_name, years=None, regions=None, chunksize=200000):
+    """
+    Функция читает вакансии, отбрасывая строки вне запроса сразу после чтения
+    каждой части файла, поэтому в памяти собираются только подходящие строки
+
+    Args:
+        file_name (str): Имя файла
+        years (tuple or None): Диапазон годов select_rows
+        regions (list or None): Регионы select_rows
+        chunksize (int): Количество строк в части
+
+    Returns:
+        (DataFrame): Вакансии из запроса
+    """
+    if years is None and not regions:
+        return vacancy_schema.read_csv(file_name, 'report_out')
+    chunks = [select_rows(chunk, years, regions)
+              for chunk in vacancy_schema.read_csv(file_name, 'report_out', chunksize=chunksize)]
+    # Категории частей различаются, поэтому после склейки типы колонок восстанавливаются
+    df = pd.concat(chunks, ignore_index=True)
+    return df.astype(vacancy_schema.dtypes('report_out'))
+
+
+def partition_files(directory, years):
+    """
+    Функция выбирает файлы годов по именам part_{year}.csv, не открывая файлы
+
+    Args:
+        directory (str): Каталог файлов годов
+        years (iterable): Нужные годы
+
+    Returns:
+        (list): Пути файлов нужных годов в порядке возрастания года
+    """
+    years = set(int(year) for year in years)
+    selected = []
+    for file in os.listdir(directory):
+        stem, extension = os.path.splitext(file)
+        if extension == '.csv' and stem.startswith('part_') and stem[5:].isdigit() and int(stem[5:]) in years:
+            selected.append((int(stem[5:]), os.path.join(directory, file)))
+    return [path for _, path in sorted(selected)]
 
 
 def cocncurrent_prepare(args):
@@ -76,20 +203,43 @@ class InputConnect:
     job_name = None
     file_name = None
 
-    def __init__(self):
+    def __init__(self, params=None, df=None, sample=None, years=None, regions=None):
+        """
+        Конструктор получает входные данные, загружает файл и печатает статистику
+
+        Args:
+            params (tuple or None): Имя файла и название профессии. Если не заданы,
+                они запрашиваются у пользователя
+            df (DataFrame or None): Уже загруженный файл из params. Метод print_data
+                изменяет таблицу, поэтому для повторного использования передается копия
+            sample (int or None): Если задано, печатается приближенная статистика по
+                выборке из sample строк каждого года без файлов годов (print_approximate)
+            years (tuple or None): Первый и последний год статистики, None для открытой границы
+            regions (list or None): Регионы статистики. Строки вне годов и регионов
+                отбрасываются при чтении файла, файлы остальных годов не открываются
+        """
         self.start_time = None
         self.salary_by_years = None
         self.vacs_by_years = None
         self.job_salary_by_years = None
         self.job_count_by_years = None
 
-        params = InputConnect.get_params()
+        if params is None:
+            params = InputConnect.get_params()
 
         InputConnect.file_name, InputConnect.job_name = params
         pd.set_option('expand_frame_repr', False)
         self.start_time = time.time()
-        df = pd.read_csv(self.file_name)
-        self.print_data(df, self.start_time)
+        if df is None:
+            with profiling.stage('report_out', 'read') as stage:
+                df = read_vacancies(self.file_name, years, regions)
+                stage.rows = len(df)
+        else:
+            df = select_rows(df, years, regions)
+        if sample:
+            self.print_approximate(df, sample, self.start_time)
+        else:
+            self.print_data(df, self.start_time)
 
     @staticmethod
     def get_params():
@@ -104,24 +254,71 @@ class InputConnect:
         return file_name, vac_name
 
     @staticmethod
+    @profiling.profiled('report_out', 'parse', rows_arg=0)
     def split_data(df):
-        df['published_at'] = df['published_at'].apply(formatter_date)
+        df['published_at'] = timestamps.parse_column(df['published_at'])[1]
         years = df['published_at'].unique()
+        os.makedirs('csv_files', exist_ok=True)
         for year in years:
             data = df[df['published_at'] == year]
-            data.to_csv(rf'csv_files\part_{year}.csv', index=False)
+            data.to_csv(os.path.join('csv_files', f'part_{year}.csv'), index=False)
 
     @staticmethod
-    def prepare_data_from_year(file_name):
-        df = pd.read_csv(file_name)
-        df['salary_from'] = df['salary_currency'].map(currency_to_rub) * df['salary_from']
-        df['salary_to'] = df['salary_currency'].map(currency_to_rub) * df['salary_to']
-        df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-        year = df['published_at'].values[0]
+    def get_approximate_statistics(df, sample, job_names, seed=0):
+        """
+        Метод оценивает статистику за один проход по таблице без файлов годов:
+        средние и количества - по выборке из sample строк каждого года, медиану и
+        перцентили зарплат по годам и крупнейшим городам - по скетчам KllSketch
+        всех строк
+
+        Args:
+            df (DataFrame): Вакансии
+            sample (int): Количество строк выборки в каждом году
+            job_names (list): Названия профессий
+            seed (int): Зерно генератора случайных чисел
+
+        Returns:
+            (dict): Оценки в формате approximate.stratified_statistics
+        """
+        import approximate
+        with profiling.stage('report_out', 'sample', len(df)):
+            years = timestamps.year_column(df['published_at'])
+            salary = salary_midpoints(df['salary_from'].to_numpy(), df['salary_to'].to_numpy(),
+                                      categories.map_codes(df['salary_currency'], currency_to_rub))
+            reservoir = approximate.StratifiedReservoir(sample, seed)
+            reservoir.add(years, row=np.arange(len(df)))
+        with profiling.stage('report_out', 'sketch', len(df)):
+            year_codes, year_keys = approximate.factorize(years)
+            area_codes, areas = categories.encode(df['area_name'])
+            # Скетчи нужны только городам, которые могут попасть в статистику по городам
+            tracked = categories.group_sizes(area_codes, len(areas)) / len(df) > 0.01
+            area_codes = np.where((area_codes >= 0) & tracked[area_codes], area_codes, -1)
+            year_seed, city_seed = np.random.SeedSequence(seed).spawn(2)
+            sketches = {'years': approximate.group_sketches(year_codes, year_keys.tolist(), salary, seed=year_seed),
+                        'cities': approximate.group_sketches(area_codes, areas, salary, seed=city_seed)}
+
+        strata, codes, population, columns = reservoir.sample()
+        rows = columns['row']
+        names = df['name'].iloc[rows].astype(str)
+        job_masks = {job_name: names.str.contains(job_name).to_numpy() for job_name in job_names}
+        cities = df['area_name'].iloc[rows].astype(object).to_numpy()
+        return approximate.stratified_statistics(codes, population, codes, strata, salary[rows], cities, job_masks,
+                                                 sketches=sketches)
+
+    def print_approximate(self, df, sample, startime):
+        """
+        Метод печатает приближенную статистику get_approximate_statistics
 
-        return [year, int(df['salary'].mean()), len(df),
-                mean_to_number(df[df['name'].str.contains(InputConnect.job_name)]['salary'].mean()),
-                len(df[df['name'].str.contains(InputConnect.job_name)])]
+        Args:
+            df (DataFrame): Вакансии
+            sample (int): Количество строк выборки в каждом году
+            startime (float): Время запуска
+        """
+        import approximate
+        result = InputConnect.get_approximate_statistics(df, sample, [InputConnect.job_name])
+        finish_time = time.time()
+        approximate.print_statistics(result, InputConnect.job_name)
+        print('Суммарное время равно: ' + str((finish_time - startime)) + ' секунд')
 
     def print_data(self, df, startime):
         InputConnect.split_data(df)
@@ -133,11 +330,10 @@ class InputConnect:
         job_count_by_years = {year: 0 for year in years}
 
         args = []
-        files = os.listdir('csv_files')
-        for file in files:
-            args.append((os.path.join('csv_files', file), InputConnect.job_name))
-        with cf.ProcessPoolExecutor() as executor:
-            result_list = executor.map(new_prepare_data, args)
+        for file in partition_files('csv_files', years):
+            args.append((file, InputConnect.job_name))
+        with profiling.stage('report_out', 'aggregate_years', len(df)), cf.ProcessPoolExecutor() as executor:
+            result_list = list(executor.map(new_prepare_data, args))
 
         # params = []
         # files = os.listdir('csv_files')
@@ -168,23 +364,14 @@ class InputConnect:
 
         finish_time = time.time()
 
-        df['salary_from'] = df['salary_currency'].map(currency_to_rub) * df['salary_from']
-        df['salary_to'] = df['salary_currency'].map(currency_to_rub) * df['salary_to']
-        df['salary'] = df[['salary_from', 'salary_to']].mean(axis=1)
-
-        area = df['area_name'].value_counts().to_dict()
-        area = dict(sorted(area.items(), key=lambda x: x[1], reverse=True))
-        vacs_sum = len(df)
-        result_city = [city for city in area.keys() if area[city] / vacs_sum > 0.01]
-        salary_by_cities = {}
-        vacs_by_cities = {}
-
-        i = 0
-        while i < 10:
-            city = result_city[i]
-            salary_by_cities[city] = mean_to_number(df[df['area_name'] == city]['salary'].mean())
-            vacs_by_cities[city] = round((len(df[df['area_name'] == city]) / vacs_sum), 4)
-            i += 1
+        with profiling.stage('report_out', 'convert', len(df)):
+            df['salary'] = salary_midpoints(df['salary_from'].to_numpy(), df['salary_to'].to_numpy(),
+                                            categories.map_codes(df['salary_currency'], currency_to_rub))
+
+        with profiling.stage('report_out', 'aggregate_cities', len(df)):
+            top_cities, city_salary, city_share = categories.city_statistics(df['area_name'], df['salary'].to_numpy())
+            salary_by_cities = {city: mean_to_number(salary) for city, salary in zip(top_cities, city_salary)}
+            vacs_by_cities = {city: round(float(share), 4) for city, share in zip(top_cities, city_share)}
 
         # for p in process:
         #     p.join()
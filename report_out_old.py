@@ -1,13 +1,13 @@
 import csv
 import math
-import matplotlib.pyplot as plt
-import numpy as np
-import pdfkit
-from jinja2 import Environment, FileSystemLoader
-from openpyxl import Workbook
-from openpyxl.styles import Font, Side, Border
-from openpyxl.styles.numbers import FORMAT_PERCENTAGE_00
-
+import time
+import categories
+import category_dictionary
+import profiling
+import report_render
+import timestamps
+from name_index import NameIndex
+from profession_matcher import ProfessionMatcher
 
 
 def formatter_date(input_date):
@@ -21,9 +21,7 @@ def formatter_date(input_date):
         (str): Дата в нужном формате
     """
     # return datetime.strptime(input_date, '%Y-%m-%dT%H:%M:%S%z').strftime('%Y')
-    return input_date[:4]
-    # input_date = input_date.split('-')
-    # return input_date[0]
+    return str(timestamps.year(input_date))
 
 def exit_with_print(line):
     """
@@ -136,6 +134,9 @@ class Vacancy:
         salary (Salary): Объект Salary
         area_name (str): Название региона
         published_at (str): Дата публикации
+        published_epoch (int): Дата публикации в секундах от начала эпохи
+        year (int): Год публикации
+        month_index (int): Номер месяца публикации (year * 12 + month - 1)
     """
     def __init__(self, dictionary):
         """
@@ -164,6 +165,7 @@ class Vacancy:
         self.salary = Salary(dictionary['salary_from'], dictionary['salary_to'], dictionary['salary_currency'])
         self.area_name = dictionary['area_name']
         self.published_at = dictionary['published_at']
+        self.published_epoch, self.year, self.month_index = timestamps.parse(self.published_at)
 
 
 class DataSet:
@@ -173,16 +175,40 @@ class DataSet:
     Attributes:
         file_name (str): Имя файла
         vacancies_objects (list): Список из объектов Vacancy
+        population (dict or None): Для выборки - количество строк файла каждого года
     """
-    def __init__(self, file_name):
+    def __init__(self, file_name, sample=None, seed=0):
         """
         В конструкторе устанавливаются основные поля для набора данных
 
         Args:
             file_name (str): Имя входного файла
+            sample (int or None): Если задано, в набор попадает только случайная
+                выборка из sample строк каждого года (approximate.sample_csv)
+            seed (int): Зерно генератора случайных чисел выборки
         """
         self.file_name = file_name
-        self.vacancies_objects = DataSet.prepare_data(file_name)
+        self.population = None
+        if sample is None:
+            self.vacancies_objects = DataSet.prepare_data(file_name)
+            return
+        import approximate
+        with profiling.stage('report_out_old', 'sample') as stage:
+            columns, vacancies, self.population = approximate.sample_csv(file_name, sample, seed)
+            stage.rows = sum(self.population.values())
+        if not self.population:
+            exit_with_print("Нет данных")
+        self.vacancies_objects = DataSet.create_vacancies(columns, vacancies)
+
+    def name_index(self):
+        """
+        Метод загружает индекс по названиям вакансий, сохраненный рядом с файлом,
+        или строит его
+
+        Returns:
+            (NameIndex): Индекс по названиям в порядке vacancies_objects
+        """
+        return NameIndex.for_file(self.file_name, (vacancy.name for vacancy in self.vacancies_objects))
 
     @staticmethod
     def read_csv(file_name):
@@ -217,13 +243,33 @@ class DataSet:
         Returns:
             (list): Список с объектами Vacancy
         """
-        columns, vacancies = DataSet.read_csv(file_name)
+        with profiling.stage('report_out_old', 'read') as stage:
+            columns, vacancies = DataSet.read_csv(file_name)
+            stage.rows = len(vacancies)
+        return DataSet.create_vacancies(columns, vacancies)
+
+    @staticmethod
+    def create_vacancies(columns, vacancies):
+        """
+        Метод преобразует строки CSV файла в список вакансий
+
+        Args:
+            columns (list): Названия колонок
+            vacancies (list): Строки с данными о вакансиях
+
+        Returns:
+            (list): Список с объектами Vacancy
+        """
         list_vacancies = []
-        for row in vacancies:
-            vacancy_dict = {}
-            for i in range(len(row)):
-                vacancy_dict[columns[i]] = row[i]
-            list_vacancies.append(Vacancy(vacancy_dict))
+        # Повторяющиеся строки (город, валюта) хранятся в одном экземпляре на набор данных
+        dictionaries = [category_dictionary.Dictionary() if column in category_dictionary.CATEGORY_COLUMNS else None
+                        for column in columns]
+        with profiling.stage('report_out_old', 'parse', len(vacancies)):
+            for row in vacancies:
+                vacancy_dict = {}
+                for i in range(len(row)):
+                    vacancy_dict[columns[i]] = row[i] if dictionaries[i] is None else dictionaries[i].intern(row[i])
+                list_vacancies.append(Vacancy(vacancy_dict))
         return list_vacancies
 
 
@@ -231,14 +277,21 @@ class InputConnect:
     """
     Класс отвечает за работу с входными параметрами и за печать набора данных
     """
-    def __init__(self):
+    def __init__(self, params=None, data_set=None):
         """
         Конструктор запускает метод, получающий входные данные, создает
         набор данных и запускает метод по печати этого набора
+
+        Args:
+            params (tuple or None): Имя файла и название профессии. Если не заданы,
+                они запрашиваются у пользователя
+            data_set (DataSet or None): Уже загруженный набор данных для файла из params
         """
-        params = InputConnect.get_params()
-        data_set = DataSet(params[0])
-        InputConnect.print_data(data_set.vacancies_objects, params[1])
+        if params is None:
+            params = InputConnect.get_params()
+        if data_set is None:
+            data_set = DataSet(params[0])
+        InputConnect.print_data(data_set.vacancies_objects, params[1], data_set.population)
 
     @staticmethod
     def get_params():
@@ -253,7 +306,7 @@ class InputConnect:
         return file_name, job_name
 
     @staticmethod
-    def print_data(list_vacancies, job_name):
+    def print_data(list_vacancies, job_name, population=None):
         """
         Метод обрабатывает набор данных и печатает их. Так же
         метод запускает формирование графиков и отчетов
@@ -261,76 +314,190 @@ class InputConnect:
         Args:
             list_vacancies (list): Список с данными о вакансиях
             job_name (str): Вакансия, по которой будет вестись статистика
+            population (dict or None): Если набор данных - выборка DataSet, количество
+                строк каждого года; печатается приближенная статистика без отчетов
+        """
+        if population is not None:
+            import approximate
+            result = InputConnect.get_approximate_statistics(list_vacancies, population, [job_name])
+            approximate.print_statistics(result, job_name)
+            return
+        data_list = InputConnect.get_statistics(list_vacancies, job_name)
+        InputConnect.print_statistics(data_list)
+
+        exit()
+        Report(data_list, job_name)
+
+    @staticmethod
+    def print_statistics(data_list):
+        """
+        Метод печатает статистику
+
+        Args:
+            data_list (list): Список словарей статистики в порядке get_statistics
+        """
+        salary_by_years, vacs_by_years, job_salary_by_years, job_count_by_years, salary_by_cities, \
+            vacs_by_cities = data_list[:6]
+        print('Динамика уровня зарплат по годам:', salary_by_years)
+        print('Динамика количества вакансий по годам:', vacs_by_years)
+        print('Динамика уровня зарплат по годам для выбранной профессии:', job_salary_by_years)
+        print('Динамика количества вакансий по годам для выбранной профессии:', job_count_by_years)
+        print('Уровень зарплат по городам (в порядке убывания):', salary_by_cities)
+        print('Доля вакансий по городам (в порядке убывания):', vacs_by_cities)
+
+    @staticmethod
+    def get_statistics(list_vacancies, job_name, name_index=None, distribution=False):
+        """
+        Метод считает статистику по набору данных
+
+        Args:
+            list_vacancies (list): Список с данными о вакансиях
+            job_name (str): Вакансия, по которой будет вестись статистика
+            name_index (NameIndex or None): Индекс по названиям из DataSet.name_index
+            distribution (bool): Добавить распределение зарплат (get_multi_statistics)
+
+        Returns:
+            (list): Список словарей: зарплаты и количество вакансий по годам, те же
+            значения для выбранной профессии, зарплаты и доли вакансий по городам
+        """
+        return InputConnect.get_multi_statistics(list_vacancies, [job_name], name_index, distribution)[job_name]
+
+    @staticmethod
+    @profiling.profiled('report_out_old', 'aggregate', rows_arg=0)
+    def get_approximate_statistics(list_vacancies, population, job_names):
+        """
+        Метод оценивает статистику по выборке вакансий, стратифицированной по годам
+
+        Args:
+            list_vacancies (list): Выборка вакансий из DataSet(file_name, sample)
+            population (dict): Год -> количество строк файла этого года
+            job_names (list): Профессии, по которым будет вестись статистика
+
+        Returns:
+            (dict): Оценки с половинами 95% интервалов в формате
+            approximate.stratified_statistics
+        """
+        import numpy as np
+        import approximate
+        years = list(range(min(population), max(population) + 1))
+        year_codes = np.array([vacancy.year - years[0] for vacancy in list_vacancies], dtype=np.int64)
+        salary = np.array([vacancy.salary.salary_ru for vacancy in list_vacancies], dtype=float)
+        cities = [vacancy.area_name for vacancy in list_vacancies]
+        job_names = list(dict.fromkeys(job_names))
+        job_masks = {job_name: np.zeros(len(list_vacancies), dtype=bool) for job_name in job_names}
+        matcher = ProfessionMatcher(job_names)
+        for row, vacancy in enumerate(list_vacancies):
+            for job in matcher.find(vacancy.name):
+                job_masks[job_names[job]][row] = True
+        return approximate.stratified_statistics(year_codes, [population.get(year, 0) for year in years],
+                                                 year_codes, years, salary, cities, job_masks)
+
+    @staticmethod
+    @profiling.profiled('report_out_old', 'aggregate', rows_arg=0)
+    def get_multi_statistics(list_vacancies, job_names, name_index=None, distribution=False):
+        """
+        Метод считает статистику сразу для нескольких профессий за один проход
+        по набору данных. Профессии в названии вакансии ищутся автоматом Ахо-Корасик,
+        а если передан индекс по названиям - берутся из его списков строк
+
+        Args:
+            list_vacancies (list): Список с данными о вакансиях
+            job_names (list): Профессии, по которым будет вестись статистика
+            name_index (NameIndex or None): Индекс по названиям из DataSet.name_index
+            distribution (bool): Добавить седьмым элементом распределение зарплат по
+                годам и городам (salary_distribution.compute) для отчетов
+
+        Returns:
+            (dict): Профессия -> список словарей в формате get_statistics
         """
+        import numpy as np
+        job_names = list(dict.fromkeys(job_names))
+        matcher = ProfessionMatcher(job_names if name_index is None else [])
+
         years = set()
         for vacancy in list_vacancies:
-            years.add(int(formatter_date(vacancy.published_at)))
+            years.add(vacancy.year)
         years = sorted(list(years))
         years = list(range(min(years), max(years) + 1))
 
         salary_by_years = {year: [] for year in years}
         vacs_by_years = {year: 0 for year in years}
-        job_salary_by_years = {year: [] for year in years}
-        job_count_by_years = {year: 0 for year in years}
-        area_dict = {}
-        vacs_dict = {}
-
-        for vacancy in list_vacancies:
-            year = int(formatter_date(vacancy.published_at))
+        job_salary_by_years = [{year: [] for year in years} for _ in job_names]
+        job_count_by_years = [{year: 0 for year in years} for _ in job_names]
+        areas = category_dictionary.Dictionary()
+        area_codes = np.empty(len(list_vacancies), dtype=np.int32)
+        salaries = np.empty(len(list_vacancies))
+        year_codes = np.empty(len(list_vacancies), dtype=np.int64)
+
+        for row, vacancy in enumerate(list_vacancies):
+            year = vacancy.year
             salary_by_years[year].append(vacancy.salary.salary_ru)
             vacs_by_years[year] += 1
-            if job_name in vacancy.name:
-                job_salary_by_years[year].append(vacancy.salary.salary_ru)
-                job_count_by_years[year] += 1
-            if vacancy.area_name in area_dict:
-                area_dict[vacancy.area_name].append(vacancy.salary.salary_ru)
-            else:
-                area_dict[vacancy.area_name] = [vacancy.salary.salary_ru]
-            if vacancy.area_name in vacs_dict:
-                vacs_dict[vacancy.area_name] += 1
-            else:
-                vacs_dict[vacancy.area_name] = 1
+            for job in matcher.find(vacancy.name):
+                job_salary_by_years[job][year].append(vacancy.salary.salary_ru)
+                job_count_by_years[job][year] += 1
+            area_codes[row] = areas.encode(vacancy.area_name)
+            salaries[row] = vacancy.salary.salary_ru
+            year_codes[row] = year - years[0]
+
+        if name_index is not None:
+            for job, job_name in enumerate(job_names):
+                for row in name_index.search(job_name):
+                    vacancy = list_vacancies[row]
+                    year = vacancy.year
+                    job_salary_by_years[job][year].append(vacancy.salary.salary_ru)
+                    job_count_by_years[job][year] += 1
 
         salary_by_years = {key: int(sum(value) / len(value)) if len(value) != 0 else 0 for key, value in
                            salary_by_years.items()}
-        job_salary_by_years = {key: int(sum(value) / len(value)) if len(value) != 0 else 0 for key, value in
-                               job_salary_by_years.items()}
-
-        area_list = area_dict.items()
-        area_list = [x for x in area_list if len(x[1]) / len(list_vacancies) > 0.01]
-        area_list = sorted(area_list, key=lambda x: sum(x[1]) / len(x[1]), reverse=True)
-        salary_by_cities = {x[0]: int(sum(x[1]) / len(x[1])) for x in area_list[0: min(len(area_list), 10)]}
-
-        vacs_count = {x: round(y / len(list_vacancies), 4) for x, y in vacs_dict.items()}
+        job_salary_by_years = [{key: int(sum(value) / len(value)) if len(value) != 0 else 0 for key, value in
+                                job_salary.items()} for job_salary in job_salary_by_years]
+
+        # Города закодированы в порядке первого появления, поэтому сортировки ниже
+        # сохраняют прежний порядок городов с равными значениями
+        area_sizes = categories.group_sizes(area_codes, len(areas))
+        area_sums = np.bincount(area_codes, weights=salaries, minlength=len(areas))
+        area_list = [(areas.values[code], float(area_sums[code]), int(area_sizes[code])) for code in range(len(areas))
+                     if area_sizes[code] / len(list_vacancies) > 0.01]
+        area_list = sorted(area_list, key=lambda x: x[1] / x[2], reverse=True)
+        salary_by_cities = {x[0]: int(x[1] / x[2]) for x in area_list[0: min(len(area_list), 10)]}
+
+        vacs_count = {areas.values[code]: round(int(size) / len(list_vacancies), 4)
+                      for code, size in enumerate(area_sizes)}
         vacs_count = {key: value for key, value in vacs_count.items() if value >= 0.01}
         vacs_by_cities = dict(sorted(vacs_count.items(), key=lambda x: x[1], reverse=True))
         vacs_by_cities = dict(list(vacs_by_cities.items())[:10])
 
-        print('Динамика уровня зарплат по годам:', salary_by_years)
-        print('Динамика количества вакансий по годам:', vacs_by_years)
-        print('Динамика уровня зарплат по годам для выбранной профессии:', job_salary_by_years)
-        print('Динамика количества вакансий по годам для выбранной профессии:', job_count_by_years)
-        print('Уровень зарплат по городам (в порядке убывания):', salary_by_cities)
-        print('Доля вакансий по городам (в порядке убывания):', vacs_by_cities)
-
-        exit()
-        data_list = [salary_by_years, vacs_by_years, job_salary_by_years, job_count_by_years, salary_by_cities,
-                     vacs_by_cities]
-
-        Report(data_list, job_name)
+        statistics = {job_name: [salary_by_years, vacs_by_years, job_salary_by_years[i], job_count_by_years[i],
+                                 salary_by_cities, vacs_by_cities] for i, job_name in enumerate(job_names)}
+        if distribution:
+            import salary_distribution
+            distributions = salary_distribution.compute(year_codes, years, area_codes, areas.values,
+                                                         salaries, list(vacs_by_cities))
+            for data_list in statistics.values():
+                data_list.append(distributions)
+        return statistics
 
 
 class Report:
     """
-    Класс отвечает за формирование графика и отчетов в виде xlsx, pdf
+    Класс отвечает за формирование графика и отчетов в виде xlsx, pdf.
+    Библиотеки для построения отчетов импортируются внутри методов, чтобы
+    не замедлять запуск режимов, которым они не нужны
     """
     # Поля необходимые для метода generate_pdf
     heads1 = []
     heads2 = []
     job_name = ''
     data_list = []
+    # Встраивать графики в pdf и html отчеты в виде SVG
+    embed_chart = False
 
-    def __init__(self, data_list, job_name):
+    # Вид отчета -> метод, который его формирует
+    artifacts = {'xlsx': 'generate_excel', 'xlsx_stream': 'generate_excel_stream', 'png': 'generate_image',
+                 'svg': 'generate_svg', 'pdf': 'generate_pdf', 'html': 'generate_html'}
+
+    def __init__(self, data_list, job_name, outputs=('xlsx', 'png', 'pdf'), parallel=True, embed_chart=False):
         """
         В конструкторе устанавливаются поля, необходимые для
         метода generate_pdf, а так же происходит запуск остальных
@@ -339,12 +506,73 @@ class Report:
         Args:
             data_list (list): Список списков значений статистики
             job_name (str): Вакансия, по которой будет вестись статистика
+            outputs (tuple): Виды отчетов из Report.artifacts, которые нужно сформировать
+            parallel (bool): Формировать отчеты одновременно в отдельных процессах
+            embed_chart (bool): Встраивать графики в pdf и html отчеты
+        """
+        Report.set_data(data_list, job_name, embed_chart)
+        start = time.perf_counter()
+        with profiling.stage('report_out_old', 'render'):
+            self.timings = Report.render(data_list, job_name, outputs, parallel, embed_chart)
+        for name, seconds in self.timings.items():
+            print(f'Время формирования {name}: {seconds:.2f} секунд')
+        print(f'Суммарное время формирования отчетов: {time.perf_counter() - start:.2f} секунд')
+
+    @staticmethod
+    def set_data(data_list, job_name, embed_chart=False):
+        """
+        Метод устанавливает поля класса, которые используют методы генерации
+
+        Args:
+            data_list (list): Список списков значений статистики
+            job_name (str): Вакансия, по которой будет вестись статистика
+            embed_chart (bool): Встраивать графики в pdf и html отчеты
         """
         Report.job_name = job_name
         Report.data_list = data_list
-        Report.generate_excel()
-        Report.generate_image()
-        Report.generate_pdf()
+        Report.embed_chart = embed_chart
+        Report.heads1, Report.heads2 = Report.get_heads(job_name)
+
+    @staticmethod
+    def get_heads(job_name):
+        """
+        Метод возвращает заголовки таблиц отчета
+
+        Args:
+            job_name (str): Вакансия, по которой будет вестись статистика
+
+        Returns:
+            (list, list): Заголовки статистики по годам и по городам
+        """
+        return report_render.get_heads(job_name)
+
+    @staticmethod
+    def render(data_list, job_name, outputs=('xlsx', 'png', 'pdf'), parallel=True, embed_chart=False):
+        """
+        Метод формирует отчеты. Отчеты не зависят друг от друга, поэтому при parallel
+        каждый строится в своем процессе: состояние matplotlib и openpyxl не разделяется
+
+        Args:
+            data_list (list): Список списков значений статистики
+            job_name (str): Вакансия, по которой будет вестись статистика
+            outputs (tuple): Виды отчетов из Report.artifacts
+            parallel (bool): Формировать отчеты одновременно
+            embed_chart (bool): Встраивать графики в pdf и html отчеты
+
+        Returns:
+            (dict): Вид отчета -> время формирования в секундах
+        """
+        for name in outputs:
+            if name not in Report.artifacts:
+                raise ValueError(f'Неизвестный вид отчета: {name}')
+        if not parallel or len(outputs) < 2:
+            return {name: render_artifact(name, data_list, job_name, embed_chart) for name in outputs}
+
+        import concurrent.futures as cf
+        with cf.ProcessPoolExecutor(max_workers=len(outputs)) as executor:
+            futures = {name: executor.submit(render_artifact, name, data_list, job_name, embed_chart)
+                       for name in outputs}
+            return {name: future.result() for name, future in futures.items()}
 
     @staticmethod
     def as_text(line):
@@ -370,7 +598,10 @@ class Report:
             sheet2: Объект вкладки WorkSheet
             data_list (list): Список списков значений статистики
         """
-        heads2 = ['Город', 'Уровень зарплат', 'Город', 'Доля вакансий']
+        from openpyxl.styles import Font
+        from openpyxl.styles.numbers import FORMAT_PERCENTAGE_00
+
+        heads2 = Report.get_heads(Report.job_name)[1]
         Report.heads2 = heads2
 
         for i in range(len(heads2)):
@@ -390,13 +621,15 @@ class Report:
         Метод, который формирует отчет в виде xlsx
 
         """
+        from openpyxl import Workbook
+        from openpyxl.styles import Font, Side, Border
+
         data_list = Report.data_list
         job_name = Report.job_name
         wb = Workbook()
         sheet1 = wb.active
         sheet1.title = 'Статистика по годам'
-        heads1 = ['Год', 'Средняя зарплата', f'Средняя зарплата - {job_name}', 'Количество вакансий',
-                  f'Количество вакансий - {job_name}']
+        heads1 = Report.get_heads(job_name)[0]
         Report.heads1 = heads1
 
         for i in range(len(heads1)):
@@ -421,88 +654,219 @@ class Report:
             for cell in column:
                 cell.border = Border(left=thin, top=thin, right=thin, bottom=thin)
 
+        for title, heads, rows in Report.distribution_tables(data_list):
+            sheet = wb.create_sheet(title)
+            for i in range(len(heads)):
+                sheet.cell(row=1, column=(i + 1), value=heads[i]).font = Font(bold=True)
+            for row in rows:
+                sheet.append(row)
+            for column in sheet.columns:
+                length = max(len(Report.as_text(cell.value)) for cell in column)
+                sheet.column_dimensions[column[0].column_letter].width = length + 2
+                for cell in column:
+                    cell.border = Border(left=thin, top=thin, right=thin, bottom=thin)
+
         wb.save('report.xlsx')
 
     @staticmethod
-    def generate_image():
+    def generate_excel_stream(file_name='report_stream.xlsx'):
         """
-        Метод создает графики по статистике
+        Метод формирует тот же отчет xlsx в режиме write_only: строки пишутся
+        в файл сразу, ширина колонок считается по данным, а оформление задается
+        общими именованными стилями, а не отдельным объектом на каждую ячейку
 
+        Args:
+            file_name (str): Имя файла отчета. Отличается от report.xlsx generate_excel,
+                потому что отчеты формируются одновременно в разных процессах
         """
+        from openpyxl import Workbook
+
         data_list = Report.data_list
-        job_name = Report.job_name
-        fig = plt.figure()
-        width = 0.4
-        x_nums = np.arange(len(data_list[0].keys()))
-        x_list1 = x_nums - width / 2
-        x_list2 = x_nums + width / 2
-
-        ax = fig.add_subplot(221)
-        ax.set_title('Уровень зарплат по годам')
-        ax.bar(x_list1, data_list[0].values(), width, label='средняя з/п')
-        ax.bar(x_list2, data_list[2].values(), width, label=f'з/п {job_name}')
-        ax.set_xticks(x_nums, data_list[0].keys(), rotation='vertical')
-        ax.legend(fontsize=8)
-        ax.tick_params(axis='both', labelsize=8)
-        ax.grid(True, axis='y')
-
-        x_nums = np.arange(len(data_list[1].keys()))
-        x_list1 = x_nums - width / 2
-        x_list2 = x_nums + width / 2
-        ax = fig.add_subplot(222)
-        ax.set_title('Количество вакансий по годам')
-        ax.bar(x_list1, data_list[1].values(), width, label='Количество вакансий')
-        ax.bar(x_list2, data_list[3].values(), width, label=f'Количество вакансий \n{job_name}')
-        ax.set_xticks(x_nums, data_list[1].keys(), rotation='vertical')
-        ax.legend(fontsize=8)
-        ax.tick_params(axis='both', labelsize=8)
-        ax.grid(True, axis='y')
-
-        y_nums = np.arange((len(data_list[4].keys())))
-        ax = fig.add_subplot(223)
-        ax.set_title('Уровень зарплат по городам')
-        data = [line.replace(' ', '\n').replace('-', '-\n') for line in list(data_list[4].keys())]
-        ax.barh(y_nums, data_list[4].values(), align='center')
-        ax.set_yticks(y_nums, data)
-        ax.tick_params(axis='y', labelsize=6)
-        ax.tick_params(axis='x', labelsize=8)
-
-        ax = fig.add_subplot(224)
-        ax.set_title('Доля вакансий по городам')
-        values = list(data_list[5].values())
-        name = list(data_list[5].keys())
-        values.insert(0, 1 - sum(values))
-        name.insert(0, 'Другие')
-        ax.pie(values, labels=name, textprops={'fontsize': 6})
-
-        plt.tight_layout()
-        plt.savefig('graph.png', dpi=200)
+        heads1, heads2 = Report.get_heads(Report.job_name)
+        Report.heads1, Report.heads2 = heads1, heads2
+        wb = Workbook(write_only=True)
+        Report.add_named_styles(wb)
+
+        rows1 = ([key, value, data_list[2][key], data_list[1][key], data_list[3][key]]
+                 for key, value in data_list[0].items())
+        Report.write_sheet_stream(wb, 'Статистика по годам', heads1, rows1,
+                                  Report.column_widths(heads1, Report.year_columns(data_list)))
+
+        # Пустая третья колонка разделяет таблицы, как insert_cols в create_sheet2
+        heads2 = heads2[:2] + [None] + heads2[2:]
+        salary_key = list(data_list[4])
+        vacs_key = list(data_list[5])
+        rows2 = ([salary_key[i], data_list[4][salary_key[i]], None, vacs_key[i], data_list[5][vacs_key[i]]]
+                 for i in range(len(salary_key)))
+        columns2 = [salary_key, list(data_list[4].values()), [], vacs_key, list(data_list[5].values())]
+        Report.write_sheet_stream(wb, 'Статистика по городам', heads2, rows2,
+                                  Report.column_widths(heads2, columns2), {4: 'report_percent'})
+        for title, heads, rows in Report.distribution_tables(data_list):
+            columns = [[row[i] for row in rows] for i in range(len(heads))]
+            Report.write_sheet_stream(wb, title, heads, rows, Report.column_widths(heads, columns))
+        wb.save(file_name)
+
+    @staticmethod
+    def distribution_tables(data_list):
+        """
+        Метод возвращает таблицы распределения зарплат, если оно есть в статистике
+
+        Args:
+            data_list (list): Список значений статистики, седьмой элемент - распределение
+                из get_multi_statistics(..., distribution=True)
+
+        Returns:
+            (list): Тройки (название вкладки, заголовки, строки) по годам и городам
+        """
+        if len(data_list) <= 6:
+            return []
+        import salary_distribution
+        return salary_distribution.tables(data_list[6])
+
+    @staticmethod
+    def year_columns(data_list):
+        """
+        Метод возвращает колонки первой вкладки в виде списков значений
+
+        Args:
+            data_list (list): Список списков значений статистики
+
+        Returns:
+            (list): Значения колонок в порядке заголовков heads1
+        """
+        keys = list(data_list[0])
+        return [keys, list(data_list[0].values()), [data_list[2][key] for key in keys],
+                [data_list[1][key] for key in keys], [data_list[3][key] for key in keys]]
+
+    @staticmethod
+    def column_widths(heads, columns):
+        """
+        Метод считает ширину колонок по данным так же, как generate_excel по ячейкам
+
+        Args:
+            heads (list): Заголовки колонок
+            columns (list): Значения каждой колонки
+
+        Returns:
+            (list): Ширина каждой колонки
+        """
+        return [max([len(Report.as_text(head))] + [len(Report.as_text(value)) for value in column]) + 2
+                for head, column in zip(heads, columns)]
+
+    @staticmethod
+    def add_named_styles(wb):
+        """
+        Метод регистрирует в книге стили заголовка, ячейки и процентов
+
+        Args:
+            wb (Workbook): Книга openpyxl
+        """
+        from openpyxl.styles import Border, Font, NamedStyle, Side
+        from openpyxl.styles.numbers import FORMAT_PERCENTAGE_00
+
+        thin = Side(border_style='thin', color='000000')
+        border = Border(left=thin, top=thin, right=thin, bottom=thin)
+        wb.add_named_style(NamedStyle(name='report_head', font=Font(bold=True), border=border))
+        wb.add_named_style(NamedStyle(name='report_cell', border=border))
+        wb.add_named_style(NamedStyle(name='report_percent', border=border, number_format=FORMAT_PERCENTAGE_00))
+
+    @staticmethod
+    def write_sheet_stream(wb, title, heads, rows, widths, column_styles=None):
+        """
+        Метод пишет вкладку книги write_only
+
+        Args:
+            wb (Workbook): Книга openpyxl в режиме write_only
+            title (str): Название вкладки
+            heads (list): Заголовки колонок
+            rows (iterable): Строки значений, могут быть генератором
+            widths (list): Ширина каждой колонки
+            column_styles (dict or None): Номер колонки -> имя стиля вместо report_cell
+        """
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
+
+        column_styles = column_styles or {}
+        sheet = wb.create_sheet(title)
+        for i, width in enumerate(widths):
+            sheet.column_dimensions[get_column_letter(i + 1)].width = width
+
+        def styled_row(values, default_style):
+            row = []
+            for i, value in enumerate(values):
+                cell = WriteOnlyCell(sheet, value=value)
+                if default_style == 'report_head' and value is not None:
+                    cell.style = default_style
+                else:
+                    cell.style = column_styles.get(i, 'report_cell')
+                row.append(cell)
+            return row
+
+        sheet.append(styled_row(heads, 'report_head'))
+        for values in rows:
+            sheet.append(styled_row(values, 'report_cell'))
+
+    @staticmethod
+    def generate_image(output='graph.png'):
+        """
+        Метод создает графики по статистике
+
+        Args:
+            output (str): Имя файла изображения, формат берется из расширения
+        """
+        import chart_render
+
+        renderer = chart_render.get_renderer()
+        renderer.draw(Report.data_list, Report.job_name)
+        renderer.save(output, dpi=200)
+
+    @staticmethod
+    def generate_svg(output='graph.svg'):
+        """
+        Метод сохраняет графики в векторном формате SVG
+
+        Args:
+            output (str): Имя файла изображения
+        """
+        Report.generate_image(output)
 
     @staticmethod
-    def generate_pdf():
+    def generate_pdf(output='report.pdf'):
         """
         Метод формирует отчет в виде pdf
 
+        Args:
+            output (str): Имя файла отчета
         """
-        salary_key = list(Report.data_list[4])
-        vacs_key = list(Report.data_list[5])
-        vacs_by_cities = [str('{0:.2%}'.format(float(x))).replace('.', ',') for x in list(Report.data_list[5].values())]
-        env = Environment(loader=FileSystemLoader('.'))
-        template = env.get_template("pdf_template.html")
-        pdf_template = template.render({'heads1': Report.heads1, 'job': Report.job_name,
-                                        'salary_by_years': Report.data_list[0],
-                                        'job_salary_by_years': Report.data_list[2],
-                                        'vacs_by_years': Report.data_list[1],
-                                        'job_count_by_years': Report.data_list[3],
-                                        'heads2': Report.heads2, 'salary_key': salary_key, 'vacs_key': vacs_key,
-                                        'salary_by_cities': Report.data_list[4],
-                                        'vacs_by_cities': vacs_by_cities})
+        report_render.save_report(Report.data_list, Report.job_name, output, Report.embed_chart)
 
-        # with open("my_new_file.html", "w", encoding='utf-8') as fh:
-        #     fh.write(pdf_template)
-        # exit()
+    @staticmethod
+    def generate_html(output='report.html'):
+        """
+        Метод формирует отчет в виде html без запуска wkhtmltopdf
 
-        config = pdfkit.configuration(wkhtmltopdf=r'C:\source\wkhtmltox\bin\wkhtmltopdf.exe')
-        pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options={'enable-local-file-access': None})
+        Args:
+            output (str): Имя файла отчета
+        """
+        report_render.save_report(Report.data_list, Report.job_name, output, Report.embed_chart)
 
 
+def render_artifact(name, data_list, job_name, embed_chart=False):
+    """
+    Функция формирует один вид отчета. Вызывается в отдельном процессе, поэтому
+    сама устанавливает поля класса Report
+
+    Args:
+        name (str): Вид отчета из Report.artifacts
+        data_list (list): Список списков значений статистики
+        job_name (str): Вакансия, по которой будет вестись статистика
+        embed_chart (bool): Встраивать графики в pdf и html отчеты
+
+    Returns:
+        (float): Время формирования в секундах
+    """
+    start = time.perf_counter()
+    Report.set_data(data_list, job_name, embed_chart)
+    with profiling.stage('report_out_old', f'render_{name}'):
+        getattr(Report, Report.artifacts[name])()
+    return time.perf_counter() - start
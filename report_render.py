@@ -0,0 +1,189 @@
+"""
+Модуль формирует HTML и PDF отчеты по шаблону pdf_template.html.
+
+Окружение Jinja создается один раз на процесс, скомпилированные шаблоны
+кэшируются на диске, поэтому пакетная генерация сотен отчетов не загружает
+и не компилирует шаблон заново. Несколько отчетов можно собрать в один PDF
+одним запуском wkhtmltopdf.
+
+Путь к wkhtmltopdf берется из переменной окружения WKHTMLTOPDF, иначе
+программа ищется в PATH
+"""
+
+import os
+import shutil
+import tempfile
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_NAME = 'pdf_template.html'
+PDF_OPTIONS = {'enable-local-file-access': None, 'encoding': 'UTF-8'}
+
+_environment = None
+
+
+def get_environment():
+    """
+    Функция возвращает общее для процесса окружение Jinja с кэшем байткода шаблонов.
+    Каталог кэша выбирает Jinja: он создается для текущего пользователя с правами
+    0o700, и владелец проверяется, поэтому чужие файлы кэша не загружаются
+
+    Returns:
+        (Environment): Окружение Jinja
+    """
+    global _environment
+    if _environment is None:
+        from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+        _environment = Environment(loader=FileSystemLoader(TEMPLATE_DIR),
+                                   bytecode_cache=FileSystemBytecodeCache(), auto_reload=False)
+    return _environment
+
+
+def get_heads(job_name):
+    """
+    Функция возвращает заголовки таблиц отчета
+
+    Args:
+        job_name (str): Название профессии
+
+    Returns:
+        (list, list): Заголовки статистики по годам и по городам
+    """
+    heads1 = ['Год', 'Средняя зарплата', f'Средняя зарплата - {job_name}', 'Количество вакансий',
+              f'Количество вакансий - {job_name}']
+    heads2 = ['Город', 'Уровень зарплат', 'Город', 'Доля вакансий']
+    return heads1, heads2
+
+
+def template_context(data_list, job_name, **extra):
+    """
+    Функция готовит переменные шаблона
+
+    Args:
+        data_list (list): Список словарей статистики, седьмым элементом может быть
+            распределение зарплат (salary_distribution.compute)
+        job_name (str): Название профессии
+        **extra: Дополнительные переменные шаблона
+
+    Returns:
+        (dict): Переменные шаблона
+    """
+    heads1, heads2 = get_heads(job_name)
+    distribution_tables = []
+    if len(data_list) > 6:
+        import salary_distribution
+        distribution_tables = salary_distribution.tables(data_list[6])
+    vacs_by_cities = [str('{0:.2%}'.format(float(x))).replace('.', ',') for x in list(data_list[5].values())]
+    context = {'heads1': heads1, 'job': job_name,
+               'salary_by_years': data_list[0],
+               'job_salary_by_years': data_list[2],
+               'vacs_by_years': data_list[1],
+               'job_count_by_years': data_list[3],
+               'heads2': heads2, 'salary_key': list(data_list[4]), 'vacs_key': list(data_list[5]),
+               'salary_by_cities': data_list[4],
+               'vacs_by_cities': vacs_by_cities,
+               'distribution_tables': distribution_tables}
+    context.update(extra)
+    return context
+
+
+def render_html(data_list, job_name, embed_chart=False, **extra):
+    """
+    Функция формирует HTML отчет
+
+    Args:
+        data_list (list): Список словарей статистики
+        job_name (str): Название профессии
+        embed_chart (bool): Встроить графики в отчет в виде SVG
+        **extra: Дополнительные переменные шаблона
+
+    Returns:
+        (str): HTML отчет
+    """
+    return render_document([(data_list, job_name)], embed_chart, **extra)
+
+
+def render_document(reports, embed_chart=False, **extra):
+    """
+    Функция формирует один HTML документ с отчетами нескольких профессий, каждый
+    отчет начинается с новой страницы
+
+    Args:
+        reports (list): Список пар (data_list, job_name)
+        embed_chart (bool): Встроить графики в отчеты в виде SVG
+        **extra: Дополнительные переменные шаблона каждого отчета
+
+    Returns:
+        (str): HTML документ
+    """
+    contexts = []
+    for data_list, job_name in reports:
+        context_extra = dict(extra)
+        if embed_chart:
+            import chart_render
+            context_extra['graph_svg'] = chart_render.render_svg(data_list, job_name)
+        contexts.append(template_context(data_list, job_name, **context_extra))
+    template = get_environment().get_template(TEMPLATE_NAME)
+    return template.render(reports=contexts)
+
+
+def pdf_configuration():
+    """
+    Функция находит wkhtmltopdf
+
+    Returns:
+        (Configuration): Настройки pdfkit
+    """
+    import pdfkit
+    path = os.environ.get('WKHTMLTOPDF') or shutil.which('wkhtmltopdf')
+    if path is None:
+        raise OSError('Не найден wkhtmltopdf: укажите путь в переменной окружения WKHTMLTOPDF '
+                      'или сохраните отчет в HTML')
+    return pdfkit.configuration(wkhtmltopdf=path)
+
+
+def save_report(data_list, job_name, output, embed_chart=False, **extra):
+    """
+    Функция сохраняет отчет. Формат выбирается по расширению: .html без
+    внешних программ, иначе PDF через wkhtmltopdf
+
+    Args:
+        data_list (list): Список словарей статистики
+        job_name (str): Название профессии
+        output (str): Имя файла отчета
+        embed_chart (bool): Встроить графики в отчет в виде SVG
+        **extra: Дополнительные переменные шаблона
+    """
+    html = render_html(data_list, job_name, embed_chart, **extra)
+    if output.lower().endswith(('.html', '.htm')):
+        with open(output, 'w', encoding='utf-8') as file:
+            file.write(html)
+        return
+    import pdfkit
+    pdfkit.from_string(html, output, configuration=pdf_configuration(), options=PDF_OPTIONS)
+
+
+def save_reports(reports, output, embed_chart=False):
+    """
+    Функция собирает несколько отчетов в один файл: HTML - один документ
+    render_document, PDF - все страницы одним запуском wkhtmltopdf
+
+    Args:
+        reports (list): Список пар (data_list, job_name)
+        output (str): Имя файла отчета
+        embed_chart (bool): Встроить графики в отчеты в виде SVG
+    """
+    if output.lower().endswith(('.html', '.htm')):
+        with open(output, 'w', encoding='utf-8') as file:
+            file.write(render_document(reports, embed_chart))
+        return
+
+    import pdfkit
+    pages = [render_html(data_list, job_name, embed_chart) for data_list, job_name in reports]
+    with tempfile.TemporaryDirectory() as directory:
+        files = []
+        for i, page in enumerate(pages):
+            file_name = os.path.join(directory, f'report_{i}.html')
+            with open(file_name, 'w', encoding='utf-8') as file:
+                file.write(page)
+            files.append(file_name)
+        pdfkit.from_file(files, output, configuration=pdf_configuration(), options=PDF_OPTIONS)
@@ -0,0 +1,255 @@
+"""
+Модуль считает распределение зарплат по группам (годам, городам): p10, медиану,
+p90 и гистограмму по фиксированным корзинам.
+
+Средняя зарплата чувствительна к выбросам (например, к переводу UZS и KGS),
+поэтому отчеты дополняются квантилями. Для таблицы в памяти квантили всех групп
+считаются одной сортировкой строк по группе и зарплате, для чтения по частям - по
+объединяемым скетчам approximate.KllSketch. Квантиль - наименьшее значение, доля
+не больших которого не меньше уровня (для четного количества медиана - нижняя из
+двух средних), как в approximate.weighted_quantiles, поэтому для небольших групп
+скетч дает те же значения. Корзины гистограммы фиксированы, и гистограммы частей
+складываются без потерь. Квантили скетча, сжимавшего значения, в таблицах
+отчетов помечены знаком ≈, рядом печатается граница ошибки ранга
+"""
+
+import numpy as np
+import approximate
+
+SALARY_EDGES = (0, 20000, 40000, 60000, 80000, 100000, 150000, 200000, 300000)
+QUANTILE_HEADS = ['p10', 'Медиана', 'p90']
+RANK_ERROR_HEAD = f'Ошибка ранга ({approximate.QUANTILE_CONFIDENCE:.0%})'
+
+
+def bucket_labels(edges=SALARY_EDGES):
+    """
+    Функция возвращает подписи корзин гистограммы
+
+    Args:
+        edges (tuple): Левые границы корзин
+
+    Returns:
+        (list): Подписи корзин
+
+    >>> bucket_labels((0, 20000, 40000))
+    ['до 20000', '20000-40000', 'от 40000']
+    """
+    labels = [f'{low}-{high}' for low, high in zip(edges[1:-1], edges[2:])]
+    return [f'до {edges[1]}'] + labels + [f'от {edges[-1]}']
+
+
+def histograms(codes, salary, count, edges=SALARY_EDGES):
+    """
+    Функция считает гистограммы зарплат по кодам групп. Зарплаты меньше первой
+    границы попадают в первую корзину
+
+    Args:
+        codes (ndarray): Коды групп строк, -1 - строка вне групп
+        salary (ndarray): Зарплаты, NaN не учитываются
+        count (int): Количество групп
+        edges (tuple): Левые границы корзин
+
+    Returns:
+        (ndarray): Количество зарплат группы в каждой корзине, форма (корзины, группы)
+
+    >>> histograms(np.array([0, 0, 1, -1]), np.array([100.0, 50000.0, 25000.0, 1.0]), 2, (0, 20000, 40000)).tolist()
+    [[1, 0], [0, 1], [1, 0]]
+    """
+    salary = np.asarray(salary, dtype=float)
+    rows = (codes >= 0) & ~np.isnan(salary)
+    buckets = np.maximum(np.searchsorted(edges, salary[rows], side='right') - 1, 0)
+    return np.bincount(buckets * count + codes[rows], minlength=len(edges) * count).reshape(len(edges), count)
+
+
+def group_quantiles(codes, salary, count, probabilities=approximate.QUANTILES, order=None):
+    """
+    Функция считает квантили зарплат всех групп одной сортировкой
+
+    Args:
+        codes (ndarray): Коды групп строк, -1 - строка вне групп
+        salary (ndarray): Зарплаты, NaN не учитываются
+        count (int): Количество групп
+        probabilities (iterable): Уровни квантилей
+        order (ndarray or None): Номера строк по возрастанию зарплаты, если уже
+            посчитаны для другой группировки
+
+    Returns:
+        (ndarray): Квантили, форма (группы, уровни); NaN для групп без зарплат
+
+    >>> group_quantiles(np.array([0, 0, 0, 0, 1]), np.array([4.0, 1.0, 3.0, 2.0, 7.0]), 3, (0.1, 0.5, 0.9)).tolist()
+    [[1.0, 2.0, 4.0], [7.0, 7.0, 7.0], [nan, nan, nan]]
+    """
+    salary = np.asarray(salary, dtype=float)
+    if order is None:
+        order = np.argsort(salary, kind='stable')
+    # Устойчивая сортировка по группе сохраняет порядок зарплат внутри группы
+    order = order[(codes[order] >= 0) & ~np.isnan(salary[order])]
+    order = order[np.argsort(codes[order], kind='stable')]
+    bounds = np.searchsorted(codes[order], np.arange(count + 1))
+    sizes = np.diff(bounds)
+    values = salary[order]
+    result = np.full((count, len(probabilities)), np.nan)
+    present = sizes > 0
+    for i, probability in enumerate(probabilities):
+        positions = bounds[:-1] + np.maximum(np.ceil(probability * sizes * (1 - 1e-12)).astype(np.int64) - 1, 0)
+        result[present, i] = values[positions[present]]
+    return result
+
+
+def group_rows(keys, quantiles, counts):
+    """
+    Функция собирает распределение групп в словарь
+
+    Args:
+        keys (list): Значения групп в порядке кодов
+        quantiles (ndarray): Квантили групп, форма (группы, уровни)
+        counts (ndarray): Гистограммы, форма (корзины, группы)
+
+    Returns:
+        (dict): Группа -> {'quantiles': [p10, медиана, p90], 'histogram': [количество по корзинам]};
+        0 для квантилей группы без зарплат
+    """
+    return {key: {'quantiles': [0 if np.isnan(value) else int(value) for value in quantiles[code]],
+                  'histogram': [int(value) for value in counts[:, code]]}
+            for code, key in enumerate(keys)}
+
+
+def compute(year_codes, years, city_codes, cities, salary, top_cities):
+    """
+    Функция считает распределение зарплат по годам и крупнейшим городам за один
+    проход по массивам статистики
+
+    Args:
+        year_codes (ndarray): Код года каждой строки
+        years (list): Годы в порядке кодов
+        city_codes (ndarray): Код города каждой строки, -1 для пропусков
+        cities (list): Города в порядке кодов
+        salary (ndarray): Зарплаты строк
+        top_cities (list): Города, для которых нужно распределение
+
+    Returns:
+        (dict): Подписи корзин ('buckets') и распределения по годам ('years') и
+        городам ('cities') в формате group_rows
+    """
+    positions = {city: code for code, city in enumerate(top_cities)}
+    table = np.array([positions.get(city, -1) for city in cities] + [-1], dtype=np.int64)
+    top_codes = table[city_codes]
+    order = np.argsort(salary, kind='stable')
+    return {'buckets': bucket_labels(),
+            'years': group_rows(years, group_quantiles(year_codes, salary, len(years), order=order),
+                                histograms(year_codes, salary, len(years))),
+            'cities': group_rows(top_cities, group_quantiles(top_codes, salary, len(top_cities), order=order),
+                                 histograms(top_codes, salary, len(top_cities)))}
+
+
+def update_sketches(sketches, codes, salary, seeds):
+    """
+    Функция добавляет зарплаты части таблицы в скетчи групп. Скетч новой группы
+    получает свое зерно, порожденное seeds, и сохраняет генератор между частями
+
+    Args:
+        sketches (dict): Код группы -> KllSketch, дополняется новыми группами
+        codes (ndarray): Коды групп строк, -1 - строка вне групп
+        salary (ndarray): Зарплаты, NaN не учитываются
+        seeds (SeedSequence): Источник зерен скетчей новых групп
+    """
+    salary = np.asarray(salary, dtype=float)
+    rows = np.flatnonzero((codes >= 0) & ~np.isnan(salary))
+    order = rows[np.argsort(codes[rows], kind='stable')]
+    present, starts = np.unique(codes[order], return_index=True)
+    for code, start, end in zip(present.tolist(), starts, np.append(starts[1:], len(order))):
+        if code not in sketches:
+            sketches[code] = approximate.KllSketch(seed=seeds.spawn(1)[0])
+        sketches[code].update(salary[order[start:end]])
+
+
+def sketch_rows(keys, codes, sketches, counts):
+    """
+    Функция собирает распределение групп по скетчам в формате group_rows
+
+    Args:
+        keys (list): Значения групп
+        codes (list): Коды групп в скетчах и гистограммах
+        sketches (dict): Код группы -> KllSketch
+        counts (ndarray): Гистограммы всех групп, форма (корзины, группы)
+
+    Returns:
+        (dict): Распределение групп; у каждой группы есть 'rank_error' - граница
+        ошибки нормированного ранга квантилей (KllSketch.rank_error), 0 для точных
+    """
+    quantiles = np.array([sketches[code].quantiles(approximate.QUANTILES) if code in sketches
+                          else np.full(len(approximate.QUANTILES), np.nan) for code in codes]).reshape(len(codes), -1)
+    result = group_rows(keys, quantiles, counts[:, codes].reshape(len(SALARY_EDGES), len(codes)))
+    for key, code in zip(keys, codes):
+        result[key]['rank_error'] = sketches[code].rank_error() if code in sketches else 0.0
+    return result
+
+
+def is_approximate(groups):
+    """
+    Функция проверяет, есть ли среди групп приближенные квантили скетча
+
+    Args:
+        groups (dict): Распределение групп в формате group_rows или sketch_rows
+
+    Returns:
+        (bool): True, если хотя бы у одной группы ненулевая ошибка ранга
+    """
+    return any(row.get('rank_error', 0) > 0 for row in groups.values())
+
+
+def heads(first, rank_error=False):
+    """
+    Функция возвращает заголовки таблицы распределения
+
+    Args:
+        first (str): Заголовок первой колонки
+        rank_error (bool): Добавить колонку ошибки ранга
+
+    Returns:
+        (list): Заголовки колонок
+    """
+    return [first] + QUANTILE_HEADS + bucket_labels() + ([RANK_ERROR_HEAD] if rank_error else [])
+
+
+def table_rows(groups):
+    """
+    Функция переводит распределение групп в строки таблицы. Приближенные
+    квантили печатаются со знаком ≈, а если такие есть, последней колонкой
+    добавляется ошибка ранга
+
+    Args:
+        groups (dict): Распределение групп в формате group_rows или sketch_rows
+
+    Returns:
+        (list): Строки: группа, квантили, количество по корзинам и, для
+        приближенных квантилей, ошибка ранга
+
+    >>> table_rows({2022: {'quantiles': [1, 2, 3], 'histogram': [4], 'rank_error': 0.0125},
+    ...             2023: {'quantiles': [5, 6, 7], 'histogram': [8], 'rank_error': 0.0}})
+    [[2022, '≈1', '≈2', '≈3', 4, '±1.25%'], [2023, 5, 6, 7, 8, '']]
+    """
+    rank_error = is_approximate(groups)
+    rows = []
+    for key, row in groups.items():
+        error = row.get('rank_error', 0)
+        quantiles = [f'≈{value}' for value in row['quantiles']] if error > 0 else row['quantiles']
+        error_column = [f'±{error:.2%}' if error > 0 else ''] if rank_error else []
+        rows.append([key] + quantiles + row['histogram'] + error_column)
+    return rows
+
+
+def tables(distributions):
+    """
+    Функция возвращает таблицы распределения для отчетов
+
+    Args:
+        distributions (dict): Результат compute
+
+    Returns:
+        (list): Тройки (название, заголовки, строки) по годам и городам
+    """
+    return [('Распределение по годам', heads('Год', is_approximate(distributions['years'])),
+             table_rows(distributions['years'])),
+            ('Распределение по городам', heads('Город', is_approximate(distributions['cities'])),
+             table_rows(distributions['cities']))]
@@ -3,13 +3,14 @@
 """
 
 import pandas as pd
+import vacancy_schema
 from report_out_old import formatter_date
 
 
 class SplitData:
     def __init__(self, file_name):
         pd.set_option('expand_frame_repr', False)
-        df = pd.read_csv(file_name)
+        df = vacancy_schema.read_csv(file_name, 'split_data')
         df['years'] = df['published_at'].apply(formatter_date)
         years = df['years'].unique()
 
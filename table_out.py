@@ -1,9 +1,14 @@
 import csv
-from datetime import datetime
+import hashlib
+import json
 import math
 import re
+import sys
 import prettytable
 from prettytable import PrettyTable
+import category_dictionary
+import profiling
+import timestamps
 
 
 class CommonTools:
@@ -27,7 +32,8 @@ class CommonTools:
             line (str): входная строка
         """
         print(line)
-        exit()
+        # sys.exit, в отличие от встроенной exit, не закрывает stdin, и сеанс table_session продолжает работу
+        sys.exit()
 
     @staticmethod
     def edit_line(line):
@@ -141,23 +147,114 @@ class DataSet:
 
     Attributes:
         file_name (str): Имя файла
-        vacancies_objects (list): Список из объектов Vacancy
+        store (VacancyStore or None): Хранилище вакансий, если набор открыт через него
+        vacancies_objects (list): Список из объектов Vacancy. Для набора из хранилища
+            объекты создаются при первом обращении
     """
-    def __init__(self, file_name):
+    def __init__(self, file_name, use_store=False):
         """
         В конструкторе устанавливаются основные поля для набора данных
 
         Args:
             file_name (str): Имя входного файла
+            use_store (bool): Открыть набор через хранилище рядом с файлом, построив
+                его при первом запуске или после изменения файла
         """
         self.file_name = file_name
-        data_tuple = DataSet.read_csv(file_name)
-        resume_dict = DataSet.csv_filter(data_tuple[0], data_tuple[1])
+        self.store = None
+        self._vacancies_objects = None
+        if use_store:
+            from vacancy_store import VacancyStore
+            with profiling.stage('table_out', 'open') as stage:
+                self.store = VacancyStore.load(file_name) or DataSet.build_store(file_name)
+                stage.rows = self.store.row_count
+            return
+        resume_dict = DataSet.load_rows(file_name)[0]
         vacancies_objects = []
-        for dictionary in resume_dict:
-            vacancies_objects.append(Vacancy(dictionary))
+        with profiling.stage('table_out', 'parse', len(resume_dict)):
+            for dictionary in resume_dict:
+                vacancies_objects.append(Vacancy(dictionary))
         self.vacancies_objects = vacancies_objects
 
+    @property
+    def vacancies_objects(self):
+        if self._vacancies_objects is None and self.store is not None:
+            with profiling.stage('table_out', 'parse', self.store.row_count):
+                self._vacancies_objects = [Vacancy(self.store.row(i)) for i in range(self.store.row_count)]
+        return self._vacancies_objects
+
+    @vacancies_objects.setter
+    def vacancies_objects(self, value):
+        self._vacancies_objects = value
+
+    @staticmethod
+    def load_rows(file_name):
+        """
+        Метод читает CSV файл и очищает строки вакансий
+
+        Args:
+            file_name (str): Имя входного файла
+
+        Returns:
+            (list, list): Список словарей вакансий и названия колонок
+        """
+        with profiling.stage('table_out', 'read') as stage:
+            data_tuple = DataSet.read_csv(file_name)
+            stage.rows = len(data_tuple[0])
+        with profiling.stage('table_out', 'clean', len(data_tuple[0])):
+            return DataSet.csv_filter(data_tuple[0], data_tuple[1]), data_tuple[1]
+
+    @staticmethod
+    def build_store(file_name):
+        """
+        Метод строит хранилище вакансий: кроме очищенных строк в него записываются
+        числовые колонки, по которым InputConnect фильтрует и сортирует без создания
+        объектов Vacancy, списки навыков и индексы фильтров: по дню публикации и
+        дерево интервалов вилки оклада
+
+        Args:
+            file_name (str): Имя входного файла
+
+        Returns:
+            (VacancyStore): Открытое хранилище
+        """
+        import numpy as np
+        from vacancy_store import VacancyStore
+        rows, columns = DataSet.load_rows(file_name)
+        with profiling.stage('table_out', 'store', len(rows)):
+            salary_from = [int(math.trunc(float(row['salary_from']))) for row in rows]
+            salary_to = [int(math.trunc(float(row['salary_to']))) for row in rows]
+            rates = [Salary.currency_to_rub[InputConnect.currency_rus[row['salary_currency']]] for row in rows]
+            # Середина оклада считается теми же операциями, что и в do_sort
+            salary_mid = [(low * rate + high * rate) / 2 for low, high, rate in zip(salary_from, salary_to, rates)]
+            skills = [row['key_skills'].split('\n') for row in rows]
+            published = [row['published_at'] for row in rows]
+            numeric = {'salary_from_int': np.array(salary_from, dtype=np.int64),
+                       'salary_to_int': np.array(salary_to, dtype=np.int64),
+                       'salary_mid': np.array(salary_mid, dtype=np.float64),
+                       'skills_count': np.array([len(row_skills) for row_skills in skills], dtype=np.int64),
+                       'published_epoch': timestamps.parse_column(np.array(published, dtype=object))[0],
+                       'published_day': np.array([DataSet.day_number(line) for line in published], dtype=np.int64)}
+            return VacancyStore.build(file_name, columns, rows, numeric, {'key_skills': skills}, ['published_day'],
+                                      {'salary': ('salary_from_int', 'salary_to_int')})
+
+    @staticmethod
+    def day_number(line):
+        """
+        Метод переводит день публикации в число вида 20071203
+
+        Args:
+            line (str): Дата публикации
+
+        Returns:
+            (int): Число или -1, если дата не в формате 2007-12-03
+
+        >>> DataSet.day_number('2007-12-03T17:34:36+0300')
+        20071203
+        """
+        day = line[:4] + line[5:7] + line[8:10]
+        return int(day) if len(day) == 8 and day.isdigit() else -1
+
     @staticmethod
     def read_csv(file_name):
         """
@@ -196,9 +293,19 @@ class DataSet:
         """
         resumes = []
         sentences = {}
+        # Для повторяющихся колонок очищенное значение вычисляется один раз и
+        # хранится в одном экземпляре для всех вакансий
+        cleaned = [{} if name in category_dictionary.CATEGORY_COLUMNS else None for name in list_naming]
         for resume in reader:
             for i in range(len(resume)):
-                resume[i] = CommonTools.edit_line(resume[i])
+                cache = cleaned[i]
+                if cache is None:
+                    resume[i] = CommonTools.edit_line(resume[i])
+                else:
+                    value = cache.get(resume[i])
+                    if value is None:
+                        value = cache[resume[i]] = CommonTools.edit_line(resume[i])
+                    resume[i] = value
                 sentences[list_naming[i]] = resume[i]
             resumes.append(sentences.copy())
         return resumes
@@ -208,13 +315,20 @@ class InputConnect:
     """
     Класс отвечает за работу с входными параметрами, обработку данных
     """
-    def __init__(self):
+    def __init__(self, params=None, data_set=None):
         """
         Конструктор запускает метод, получающий входные данные, создает
         набор данных и запускает метод по печати этого набора
-        """
-        params = InputConnect.get_params()
-        data_set = DataSet(params[0])
+
+        Args:
+            params (tuple or None): Входные параметры в формате get_params. Если не заданы,
+                они запрашиваются у пользователя
+            data_set (DataSet or None): Уже загруженный набор данных для файла из params
+        """
+        if params is None:
+            params = InputConnect.get_params()
+        if data_set is None:
+            data_set = DataSet(params[0])
         InputConnect.print_vacancies(data_set, params[1], params[2], params[3], params[4], params[5])
 
     @staticmethod
@@ -231,7 +345,19 @@ class InputConnect:
         reverse_sort = input('Обратный порядок сортировки (Да / Нет): ')
         start_end_index = input('Введите диапазон вывода: ').split()
         fields_name = input('Введите требуемые столбцы: ').split(', ')
+        InputConnect.check_params(parameter, sort_parametr, reverse_sort)
+        return file_name, parameter, sort_parametr, reverse_sort, start_end_index, fields_name
+
+    @staticmethod
+    def check_params(parameter, sort_parametr, reverse_sort):
+        """
+        Метод проверяет параметры фильтрации и сортировки и завершает программу при ошибке
 
+        Args:
+            parameter (str): Параметр фильтрации
+            sort_parametr (str): Параметр сортировки
+            reverse_sort (str): Обратный порядок сортировки
+        """
         if parameter != '' and ': ' not in parameter:
             CommonTools.exit_with_print('Формат ввода некорректен')
         if parameter != '' and parameter.split(': ')[0] not in CommonTools.rus_names:
@@ -241,8 +367,6 @@ class InputConnect:
         if reverse_sort != '' and reverse_sort not in CommonTools.rus_true_false.values():
             CommonTools.exit_with_print('Порядок сортировки задан некорректно')
 
-        return file_name, parameter, sort_parametr, reverse_sort, start_end_index, fields_name
-
     currency_rus = {'AZN': 'Манаты', 'BYR': 'Белорусские рубли', 'EUR': 'Евро', 'GEL': 'Грузинский лари',
                     'KGS': 'Киргизский сом', 'KZT': 'Тенге', 'RUR': 'Рубли', 'UAH': 'Гривны', 'USD': 'Доллары',
                     'UZS': 'Узбекский сум'}
@@ -336,8 +460,7 @@ class InputConnect:
                         k = k + 1
                 return k == len(parameters)
             if parameter[0] == 'Дата публикации вакансии':
-                return datetime.strptime(row['published_at'], '%Y-%m-%dT%H:%M:%S%z').strftime('%d.%m.%Y') == parameter[
-                    1]
+                return timestamps.display_date(row['published_at'][:10]) == parameter[1]
             return row[CommonTools.rus_names[parameter[0]]] == parameter[1]
 
         filtered_list = list(filter(for_filter, data))
@@ -345,6 +468,8 @@ class InputConnect:
             CommonTools.exit_with_print('Ничего не найдено')
         return filtered_list
 
+    experience_sort = {'Нет опыта': 0, 'От 1 года до 3 лет': 1, 'От 3 до 6 лет': 2, 'Более 6 лет': 3}
+
     @staticmethod
     def do_sort(data, sort, reverse):
         """
@@ -363,8 +488,6 @@ class InputConnect:
         if reverse == 'Да':
             is_reverse = True
 
-        experience_sort = {'Нет опыта': 0, 'От 1 года до 3 лет': 1, 'От 3 до 6 лет': 2, 'Более 6 лет': 3}
-
         def for_sort(row):
             """
             Функция, используемая для функции sorted
@@ -373,7 +496,7 @@ class InputConnect:
                 row (dict): Словарь с данными
 
             Returns:
-                (int or str or datetime): Значение для сортировки
+                (int or str or float): Значение для сортировки
             """
             if sort == 'Оклад':
                 salary = row['salary_from'].split()
@@ -384,9 +507,9 @@ class InputConnect:
                 skills = row['key_skills'].split('\n')
                 return len(skills)
             if sort == 'Дата публикации вакансии':
-                return datetime.strptime(row['published_at'], '%Y-%m-%dT%H:%M:%S%z')
+                return timestamps.parse(row['published_at'])[0]
             if sort == 'Опыт работы':
-                return experience_sort[row['experience_id']]
+                return InputConnect.experience_sort[row['experience_id']]
             return row[CommonTools.rus_names[sort]]
 
         if sort != '':
@@ -409,31 +532,188 @@ class InputConnect:
             (list): Готовый список с данными
         """
         result_list = []
-        for i in range(len(data.vacancies_objects)):
-            dictionary = InputConnect.formatter(data.vacancies_objects[i])
-            result_list.append(dictionary)
+        with profiling.stage('table_out', 'convert', len(data.vacancies_objects)):
+            for i in range(len(data.vacancies_objects)):
+                dictionary = InputConnect.formatter(data.vacancies_objects[i])
+                result_list.append(dictionary)
 
-        filtered_list = InputConnect.do_filter(result_list, filter_list)
-        sorted_list = InputConnect.do_sort(filtered_list, sort, reverse)
+        with profiling.stage('table_out', 'filter', len(result_list)):
+            filtered_list = InputConnect.do_filter(result_list, filter_list)
+        with profiling.stage('table_out', 'sort', len(filtered_list)):
+            sorted_list = InputConnect.do_sort(filtered_list, sort, reverse)
 
         for i in range(len(sorted_list)):
-            salary = sorted_list[i]['salary_from'].split()
-            salary_from = '{0:,}'.format(int(salary[0])).replace(',', ' ')
-            salary_to = '{0:,}'.format(int(salary[2])).replace(',', ' ')
-            salary[0] = str(salary_from)
-            salary[2] = str(salary_to)
-            sorted_list[i]['salary_from'] = ' '.join(salary)
-            sorted_list[i]['published_at'] = datetime.strptime(sorted_list[i]['published_at'],
-                                                               '%Y-%m-%dT%H:%M:%S%z').strftime('%d.%m.%Y')
-
-            new_list = list(sorted_list[i].values())
-            for j in range(len(new_list)):
-                if len(new_list[j]) > 100:
-                    new_list[j] = new_list[j][:100] + '...'
-            sorted_list[i] = new_list
-            sorted_list[i].insert(0, str(i + 1))
+            sorted_list[i] = InputConnect.format_row(sorted_list[i], i + 1)
         return sorted_list
 
+    @staticmethod
+    def format_row(dictionary, number):
+        """
+        Метод переводит словарь из formatter в строку таблицы: разделяет разряды
+        оклада, переводит дату в формат для печати и обрезает длинные значения
+
+        Args:
+            dictionary (dict): Словарь из formatter
+            number (int): Номер строки
+
+        Returns:
+            (list): Значения строки таблицы
+        """
+        salary = dictionary['salary_from'].split()
+        salary_from = '{0:,}'.format(int(salary[0])).replace(',', ' ')
+        salary_to = '{0:,}'.format(int(salary[2])).replace(',', ' ')
+        salary[0] = str(salary_from)
+        salary[2] = str(salary_to)
+        dictionary['salary_from'] = ' '.join(salary)
+        dictionary['published_at'] = timestamps.display_date(dictionary['published_at'][:10])
+
+        new_list = list(dictionary.values())
+        for j in range(len(new_list)):
+            if len(new_list[j]) > 100:
+                new_list[j] = new_list[j][:100] + '...'
+        new_list.insert(0, str(number))
+        return new_list
+
+    # Колонки, значения которых в formatter совпадают со значениями в хранилище
+    store_text_columns = ('name', 'description', 'key_skills', 'premium', 'employer_name', 'area_name')
+    store_sort_arrays = {'Оклад': 'salary_mid', 'Навыки': 'skills_count', 'Дата публикации вакансии': 'published_epoch'}
+
+    @staticmethod
+    def store_filter(store, filter_list):
+        """
+        Метод производит фильтрацию по индексам и массивам хранилища так же, как do_filter
+
+        Args:
+            store (VacancyStore): Хранилище вакансий
+            filter_list (str): Параметры по которым производится фильтрация
+
+        Returns:
+            (ndarray or None): Номера подходящих строк по возрастанию или None, если фильтр
+            не поддерживается хранилищем
+        """
+        import numpy as np
+        if filter_list == '' or store.row_count == 0:
+            return np.arange(store.row_count)
+        parameter = filter_list.split(': ')
+        column = CommonTools.rus_names[parameter[0]]
+        if parameter[0] == 'Оклад':
+            return store.interval_rows('salary', int(parameter[1]))
+        if parameter[0] == 'Идентификатор валюты оклада':
+            return store.code_rows(column, [code for code in store.dictionaries[column]
+                                            if InputConnect.currency_rus[code].split()[0] == parameter[1]])
+        if parameter[0] == 'Навыки':
+            return store.list_rows(column, parameter[1].split(', '))
+        if parameter[0] == 'Дата публикации вакансии':
+            if not re.fullmatch(r'\d\d\.\d\d\.\d{4}', parameter[1]):
+                return None
+            return store.postings('published_day', int(parameter[1][6:] + parameter[1][3:5] + parameter[1][:2]))
+        if parameter[0] == 'Опыт работы':
+            return store.code_rows(column, [code for code in store.dictionaries[column]
+                                            if Vacancy.experience_rus[code] == parameter[1]])
+        if column in InputConnect.store_text_columns:
+            return store.equal_rows(column, parameter[1])
+        return None
+
+    @staticmethod
+    def store_sort_key(store, rows, sort, reverse):
+        """
+        Метод возвращает ключи сортировки строк. Порядок do_sort совпадает с
+        порядком по паре (ключ, номер строки): при обратном порядке ключ берется со
+        знаком минус, а равные значения сохраняют исходный порядок
+
+        Args:
+            store (VacancyStore): Хранилище вакансий
+            rows (ndarray): Номера строк
+            sort (str): Параметр сортировки
+            reverse (str): Переварачивать список?
+
+        Returns:
+            (ndarray or None): Ключи строк или None, если сортировка не поддерживается хранилищем
+        """
+        import numpy as np
+        if sort == '':
+            return np.zeros(len(rows), dtype=np.int64)
+        column = CommonTools.rus_names[sort]
+        if sort in InputConnect.store_sort_arrays:
+            key = store.array(InputConnect.store_sort_arrays[sort])[rows]
+        elif sort == 'Опыт работы':
+            order = [InputConnect.experience_sort[Vacancy.experience_rus[code]]
+                     for code in store.dictionaries[column]]
+            key = np.array(order, dtype=np.int64)[store.codes[column][rows]]
+        elif column in InputConnect.store_text_columns:
+            key = store.rank(column)[rows]
+        else:
+            return None
+        key = np.asarray(key)
+        return -key if reverse == 'Да' else key
+
+    @staticmethod
+    def store_sort(store, rows, sort, reverse):
+        """
+        Метод сортирует строки по массивам хранилища так же, как do_sort
+
+        Args:
+            store (VacancyStore): Хранилище вакансий
+            rows (ndarray): Номера строк по возрастанию
+            sort (str): Параметр сортировки
+            reverse (str): Переварачивать список?
+
+        Returns:
+            (ndarray or None): Номера строк в порядке сортировки или None, если сортировка
+            не поддерживается хранилищем
+        """
+        import numpy as np
+        if sort == '':
+            return rows
+        key = InputConnect.store_sort_key(store, rows, sort, reverse)
+        if key is None:
+            return None
+        return rows[np.argsort(key, kind='stable')]
+
+    @staticmethod
+    def store_query(store, filter_list, sort, reverse):
+        """
+        Метод выбирает и упорядочивает строки хранилища, не создавая объекты Vacancy
+
+        Args:
+            store (VacancyStore): Хранилище вакансий
+            filter_list (str): Параметры по которым производится фильтрация
+            sort (str): Параметр сортировки
+            reverse (str): Переворачивать список?
+
+        Returns:
+            (ndarray or None): Номера строк для печати или None, если запрос нужно
+            выполнить по объектам Vacancy
+        """
+        with profiling.stage('table_out', 'filter', store.row_count):
+            rows = InputConnect.store_filter(store, filter_list)
+        if rows is None:
+            return None
+        if len(rows) == 0:
+            CommonTools.exit_with_print('Ничего не найдено')
+        with profiling.stage('table_out', 'sort', len(rows)):
+            return InputConnect.store_sort(store, rows, sort, reverse)
+
+    @staticmethod
+    def select(data_set, filter_list, sort, reverse):
+        """
+        Метод выполняет фильтрацию и сортировку набора данных
+
+        Args:
+            data_set (DataSet): Набор данных
+            filter_list (str): Список с данными для фильтрации
+            sort (str): Параметр сортировки
+            reverse (str): Переворачивать список?
+
+        Returns:
+            (ndarray or list): Номера строк хранилища или готовый список строк из create_data
+        """
+        if data_set.store is not None:
+            rows = InputConnect.store_query(data_set.store, filter_list, sort, reverse)
+            if rows is not None:
+                return rows
+        return InputConnect.create_data(data_set, filter_list, sort, reverse)
+
     @staticmethod
     def print_vacancies(data_set, filter_list, sort, reverse, indexes, fields_list):
         """
@@ -447,31 +727,262 @@ class InputConnect:
             indexes (list): Диапазон вывода строк
             fields_list (list): Список колонок, которые нужно вывести
         """
+        selection = InputConnect.select(data_set, filter_list, sort, reverse)
+        InputConnect.print_selection(data_set, selection, indexes, fields_list)
+
+    @staticmethod
+    def create_table():
+        """
+        Метод создает пустую таблицу с колонками и оформлением для печати вакансий
+
+        Returns:
+            (PrettyTable): Таблица
+        """
         table = PrettyTable()
         rus_list = list(CommonTools.rus_names.keys())
         table.field_names = ['№'] + rus_list[:7] + rus_list[10:]
         table.align = 'l'
         table.hrules = prettytable.ALL
         table.max_width = 20
+        return table
+
+    @staticmethod
+    def print_selection(data_set, selection, indexes, fields_list):
+        """
+        Метод печатает результат select в виде таблицы. Для номеров строк хранилища
+        в таблицу добавляются только строки выбранного диапазона
+
+        Args:
+            data_set (DataSet): Набор данных
+            selection (ndarray or list): Результат select
+            indexes (list): Диапазон вывода строк
+            fields_list (list): Список колонок, которые нужно вывести
+        """
+        table = InputConnect.create_table()
+        rows = None if isinstance(selection, list) else selection
+        data = selection
+        count = data_set.store.row_count if data_set.store is not None else len(data_set.vacancies_objects)
+        with profiling.stage('table_out', 'render', len(data)):
+            try:
+                indexes[0] = int(indexes[0]) - 1
+                indexes[1] = int(indexes[1]) - 1
+            except IndexError:
+                if len(indexes) == 0:
+                    indexes.append(0)
+                    indexes.append(count)
+                if len(indexes) == 1:
+                    indexes.append(count)
+
+            start, end = indexes[0], indexes[1]
+            if rows is not None and min(start, end) < 0:
+                # Отрицательные границы отклоняет get_string, строки для них не нужны
+                data = []
+            elif rows is not None:
+                numbers = range(1, len(rows) + 1)[start:end]
+                data = [InputConnect.format_row(InputConnect.formatter(Vacancy(data_set.store.row(row))), number)
+                        for row, number in zip(rows[start:end], numbers)]
+                start, end = 0, len(data)
+            table.add_rows(data)
+
+            if fields_list == ['']:
+                print(table.get_string(start=start, end=end))
+            elif len(fields_list) == 1:
+                fields_list.insert(0, '№')
+                print(table.get_string(start=start, end=end, fields=fields_list))
+            else:
+                fields_list.insert(0, '№')
+                print(table.get_string(start=start, end=end, fields=fields_list))
+
+    @staticmethod
+    def store_pages(store, filter_list, sort, reverse, cursor=None, limit=None):
+        """
+        Метод выбирает строки хранилища после курсора в порядке сортировки. Если нужно
+        не больше limit строк, полная сортировка заменяется выбором limit наименьших
+        ключей через np.partition
+
+        Args:
+            store (VacancyStore): Хранилище вакансий
+            filter_list (str): Параметры по которым производится фильтрация
+            sort (str): Параметр сортировки
+            reverse (str): Переворачивать список?
+            cursor (tuple or None): Ключ и номер последней выведенной строки
+            limit (int or None): Наибольшее количество строк
 
-        data = InputConnect.create_data(data_set, filter_list, sort, reverse)
-        table.add_rows(data)
+        Returns:
+            (ndarray, ndarray, int, int) or None: Номера строк, их ключи, количество строк до
+            курсора и количество строк после курсора; None, если запрос не поддерживается хранилищем
+        """
+        import numpy as np
+        with profiling.stage('table_out', 'filter', store.row_count):
+            rows = InputConnect.store_filter(store, filter_list)
+        if rows is None:
+            return None
+        if len(rows) == 0:
+            CommonTools.exit_with_print('Ничего не найдено')
+        with profiling.stage('table_out', 'sort', len(rows)):
+            keys = InputConnect.store_sort_key(store, rows, sort, reverse)
+            if keys is None:
+                return None
+            rows = np.asarray(rows)
+            skipped = 0
+            if cursor is not None:
+                after = (keys > cursor[0]) | ((keys == cursor[0]) & (rows > cursor[1]))
+                skipped = len(rows) - int(np.count_nonzero(after))
+                rows, keys = rows[after], keys[after]
+            remaining = len(rows)
+            if limit is not None and limit < len(rows):
+                threshold = np.partition(keys, limit - 1)[limit - 1]
+                chosen = keys <= threshold
+                rows, keys = rows[chosen], keys[chosen]
+            order = np.lexsort((rows, keys))[:limit]
+            return rows[order], keys[order], skipped, remaining
 
+    @staticmethod
+    def query_hash(filter_list, sort, reverse):
+        """
+        Метод возвращает короткий хэш запроса, который записывается в курсор
+
+        Args:
+            filter_list (str): Параметры фильтрации
+            sort (str): Параметр сортировки
+            reverse (str): Переворачивать список?
+
+        Returns:
+            (str): Восемь шестнадцатеричных цифр
+
+        >>> InputConnect.query_hash('', 'Оклад', 'Да') == InputConnect.query_hash('', 'Оклад', '')
+        False
+        """
+        query = json.dumps([filter_list, sort, reverse], ensure_ascii=False)
+        return hashlib.sha1(query.encode('utf-8')).hexdigest()[:8]
+
+    @staticmethod
+    def cursor_position(token, filter_list, sort, reverse):
+        """
+        Метод проверяет, что курсор вида "хэш запроса:позиция" выдан для того же
+        запроса, и возвращает позицию
+
+        Args:
+            token (str): Курсор
+            filter_list (str): Параметры фильтрации
+            sort (str): Параметр сортировки
+            reverse (str): Переворачивать список?
+
+        Returns:
+            (str): Позиция: "ключ:номер строки" для хранилища или количество выведенных строк
+        """
+        digest, _, position = token.partition(':')
+        if not position:
+            CommonTools.exit_with_print('Некорректный курсор')
+        if digest != InputConnect.query_hash(filter_list, sort, reverse):
+            CommonTools.exit_with_print('Курсор получен для другого запроса')
+        return position
+
+    @staticmethod
+    def parse_cursor(position):
+        """
+        Метод разбирает позицию курсора хранилища вида "ключ:номер строки"
+
+        Args:
+            position (str): Позиция курсора
+
+        Returns:
+            (float, int): Ключ и номер строки
+
+        >>> InputConnect.parse_cursor('-45000.5:12')
+        (-45000.5, 12)
+        """
         try:
-            indexes[0] = int(indexes[0]) - 1
-            indexes[1] = int(indexes[1]) - 1
-        except IndexError:
-            if len(indexes) == 0:
-                indexes.append(0)
-                indexes.append(len(data_set.vacancies_objects))
-            if len(indexes) == 1:
-                indexes.append(len(data_set.vacancies_objects))
-
-        if fields_list == ['']:
-            print(table.get_string(start=indexes[0], end=indexes[1]))
-        elif len(fields_list) == 1:
-            fields_list.insert(0, '№')
-            print(table.get_string(start=indexes[0], end=indexes[1], fields=fields_list))
+            key, row = position.rsplit(':', 1)
+            return float(key), int(row)
+        except ValueError:
+            CommonTools.exit_with_print('Некорректный курсор')
+
+    @staticmethod
+    def parse_offset(position):
+        """
+        Метод разбирает позицию курсора без хранилища - количество выведенных строк
+
+        Args:
+            position (str): Позиция курсора
+
+        Returns:
+            (int): Количество выведенных строк
+
+        >>> InputConnect.parse_offset('40')
+        40
+        """
+        if not position.isdigit():
+            CommonTools.exit_with_print('Некорректный курсор')
+        return int(position)
+
+    @staticmethod
+    def print_pages(data_set, filter_list, sort, reverse, page_size, fields_list, output='table', cursor=None,
+                    pages=None):
+        """
+        Метод выводит результат постранично: каждая страница форматируется и
+        печатается отдельно, поэтому вся таблица в памяти не строится. Сортировка
+        выполняется один раз на все выводимые страницы. Если после них остаются строки,
+        в stderr печатается курсор, с которого продолжается вывод следующим запуском
+        с теми же фильтром и сортировкой. Курсор содержит хэш запроса, поэтому курсор
+        другого запроса или испорченный курсор не принимаются
+
+        Args:
+            data_set (DataSet): Набор данных
+            filter_list (str): Список с данными для фильтрации
+            sort (str): Параметр сортировки
+            reverse (str): Переворачивать список?
+            page_size (int): Количество строк на странице
+            fields_list (list): Список колонок, которые нужно вывести
+            output (str): Формат вывода: table, csv или jsonl
+            cursor (str or None): Курсор из предыдущего запуска
+            pages (int or None): Количество страниц, None - до конца результата
+        """
+        limit = page_size * pages if pages else None
+        position = InputConnect.cursor_position(cursor, filter_list, sort, reverse) if cursor else None
+        result = None
+        if data_set.store is not None:
+            store_cursor = InputConnect.parse_cursor(position) if position and ':' in position else None
+            result = InputConnect.store_pages(data_set.store, filter_list, sort, reverse, store_cursor, limit)
+            if result is not None and position and store_cursor is None:
+                CommonTools.exit_with_print('Некорректный курсор')
+        if result is None:
+            # Без хранилища курсор - количество уже выведенных строк
+            data = InputConnect.create_data(data_set, filter_list, sort, reverse)
+            skipped = InputConnect.parse_offset(position) if position else 0
+            rows = data[skipped:skipped + limit if limit else None]
+            remaining = len(data) - skipped
         else:
-            fields_list.insert(0, '№')
-            print(table.get_string(start=indexes[0], end=indexes[1], fields=fields_list))
+            rows, keys, skipped, remaining = result
+
+        names = InputConnect.create_table().field_names
+        fields = names if fields_list == [''] else ['№'] + fields_list
+        columns = [names.index(field) for field in fields]
+        if output == 'csv':
+            writer = csv.writer(sys.stdout)
+            writer.writerow(fields)
+        with profiling.stage('table_out', 'render', len(rows)):
+            for start in range(0, len(rows), page_size):
+                page = rows[start:start + page_size]
+                if result is not None:
+                    page = [InputConnect.format_row(InputConnect.formatter(Vacancy(data_set.store.row(row))), number)
+                            for row, number in zip(page, range(skipped + start + 1, skipped + start + len(page) + 1))]
+                if output == 'csv':
+                    writer.writerows([row[i] for i in columns] for row in page)
+                elif output == 'jsonl':
+                    for row in page:
+                        print(json.dumps({fields[j]: row[i] for j, i in enumerate(columns)}, ensure_ascii=False))
+                else:
+                    table = InputConnect.create_table()
+                    table.add_rows(page)
+                    print(table.get_string(fields=fields))
+                sys.stdout.flush()
+
+        if remaining > len(rows):
+            token = InputConnect.query_hash(filter_list, sort, reverse)
+            if result is None:
+                token += f':{skipped + len(rows)}'
+            else:
+                key = keys[-1].item()
+                token += f':{key!r}:{rows[-1]}'
+            print(f'Курсор следующей страницы: {token}', file=sys.stderr)
@@ -0,0 +1,163 @@
+"""
+Модуль запускает сеанс table_out: файл загружается один раз, после чего запросы
+вводятся построчно и выполняются на уже загруженных данных.
+
+Запрос - JSON объект с ключами filter, sort, reverse, range и fields, как в
+заданиях cli.py. Результаты фильтрации и сортировки последних запросов хранятся
+в LRU кэше, поэтому вывод следующих страниц того же запроса не повторяет
+фильтрацию и сортировку. После таблицы печатается время ответа.
+Пустая строка или "выход" завершает сеанс
+
+Запуск: python table_session.py vacancies.csv
+        Запрос: {"filter": "Навыки: Git", "sort": "Оклад", "range": [21, 40]}
+"""
+
+import collections
+import json
+import sys
+import time
+import table_out
+
+
+class QueryCache:
+    """
+    Класс хранит результаты последних запросов и вытесняет самый давно использованный
+
+    Attributes:
+        capacity (int): Количество хранимых результатов
+        items (OrderedDict): Ключ запроса -> результат в порядке использования
+        hits (int): Количество запросов, найденных в кэше
+        misses (int): Количество запросов, выполненных заново
+    """
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self.items = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Метод возвращает результат запроса и отмечает его как последний использованный
+
+        Args:
+            key (tuple): Ключ запроса
+
+        Returns:
+            Результат или None, если его нет в кэше
+        """
+        if key not in self.items:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key, value):
+        """
+        Метод сохраняет результат запроса
+
+        Args:
+            key (tuple): Ключ запроса
+            value: Результат
+        """
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.capacity:
+            self.items.popitem(last=False)
+
+
+class Session:
+    """
+    Класс хранит загруженный набор данных и кэш запросов
+
+    Attributes:
+        data_set (DataSet): Набор данных table_out
+        cache (QueryCache): Результаты последних запросов
+    """
+    def __init__(self, file_name, use_store=True, cache_size=32):
+        """
+        Конструктор загружает набор данных
+
+        Args:
+            file_name (str): Имя входного файла
+            use_store (bool): Открыть набор через хранилище вакансий
+            cache_size (int): Количество запросов в кэше
+        """
+        self.data_set = table_out.DataSet(file_name, use_store)
+        self.cache = QueryCache(cache_size)
+
+    def select(self, filter_list, sort, reverse):
+        """
+        Метод возвращает результат фильтрации и сортировки из кэша или выполняет их
+
+        Args:
+            filter_list (str): Параметр фильтрации
+            sort (str): Параметр сортировки
+            reverse (str): Обратный порядок сортировки
+
+        Returns:
+            (ndarray or list): Результат InputConnect.select
+        """
+        key = (filter_list, sort, reverse)
+        selection = self.cache.get(key)
+        if selection is None:
+            selection = table_out.InputConnect.select(self.data_set, filter_list, sort, reverse)
+            self.cache.put(key, selection)
+        return selection
+
+    def run(self, query):
+        """
+        Метод выполняет запрос и печатает таблицу
+
+        Args:
+            query (dict): Запрос с ключами filter, sort, reverse, range и fields
+        """
+        filter_list, sort, reverse = query.get('filter', ''), query.get('sort', ''), query.get('reverse', '')
+        fields = query.get('fields', '')
+        if isinstance(fields, str):
+            fields = fields.split(', ')
+        table_out.InputConnect.check_params(filter_list, sort, reverse)
+        selection = self.select(filter_list, sort, reverse)
+        table_out.InputConnect.print_selection(self.data_set, selection, list(query.get('range', [])), list(fields))
+
+    def run_line(self, line):
+        """
+        Метод выполняет запрос из строки ввода. Ошибки запроса печатаются, сеанс продолжается
+
+        Args:
+            line (str): JSON объект запроса
+        """
+        start = time.perf_counter()
+        try:
+            query = json.loads(line)
+            if not isinstance(query, dict):
+                raise ValueError('Запрос должен быть JSON объектом')
+            self.run(query)
+        except SystemExit:
+            # table_out завершает программу через exit() после печати сообщения об ошибке
+            pass
+        except (KeyError, ValueError) as error:
+            # KeyError - фильтр по колонке, которой нет в строках таблицы
+            print(f'Некорректный запрос: {error}')
+        print(f'Время ответа: {(time.perf_counter() - start) * 1000:.1f} мс, '
+              f'кэш: {self.cache.hits} попаданий, {self.cache.misses} промахов')
+
+    def loop(self, read_line=input):
+        """
+        Метод читает и выполняет запросы, пока не введена пустая строка или "выход"
+
+        Args:
+            read_line (function): Функция чтения строки запроса
+        """
+        while True:
+            try:
+                line = read_line('Запрос: ').strip()
+            except EOFError:
+                break
+            if line in ('', 'выход'):
+                break
+            self.run_line(line)
+
+
+if __name__ == '__main__':
+    Session(sys.argv[1] if len(sys.argv) > 1 else input('Введите название файла: ')).loop()
@@ -1,8 +1,14 @@
 import pandas as pd
 import numpy as np
-import pdfkit
-from task3_3_2 import create_vacancies
-from jinja2 import Environment, FileSystemLoader
+import categories
+import profiling
+import report_render
+import salary_distribution
+import timestamps
+import vacancy_schema
+from task3_3_2 import cache_is_fresh, convert_chunks
+from profession_matcher import ProfessionMatcher
+from name_index import NameIndex
 
 
 def get_params():
@@ -26,81 +32,547 @@ def mean_to_number(numb):
     Returns:
         (int): Либо ноль, либо целая часть от исходного числа
     """
-    if numb == np.NAN:
+    if np.isnan(numb):
         return 0
     else:
         return int(numb)
 
 
-def report_pdf(data_list, job_name):
+def report_pdf(data_list, job_name, output='report_new.pdf', embed_chart=False):
     """
-    Функция генерирует PDF отчет
+    Функция генерирует PDF отчет. Если имя файла заканчивается на .html,
+    отчет сохраняется в HTML без запуска wkhtmltopdf
 
     Args:
         data_list (list): Список со всеми данными
         job_name (list): Название вакансии
+        output (str): Имя PDF файла
+        embed_chart (bool): Встроить графики в отчет в виде SVG
+    """
+    with profiling.stage('task3.4.2', 'render'):
+        report_render.save_report(data_list, job_name, output, embed_chart)
+
+
+def load_vacancies(file_name, chunksize=None, cache=None):
+    """
+    Функция переводит зарплаты в рубли и передает переведенные вакансии в расчет
+    статистики без промежуточного файла
+
+    Args:
+        file_name (str): Имя исходного файла
+        chunksize (int or None): Количество строк, читаемых за раз. Если задано, файл
+            переводится по частям, а вместо таблицы возвращаются части для
+            get_chunked_statistics
+        cache (str or None): Файл переведенных вакансий. Если он создан после
+            изменения исходного файла и курсов, вакансии читаются из него, иначе
+            переведенные вакансии сохраняются в него
+
+    Returns:
+        (DataFrame or VacancyChunks): Вакансии с годом публикации в колонке published_at
     """
-    salary_key = list(data_list[4])
-    vacs_key = list(data_list[5])
-    vacs_by_cities = [str('{0:.2%}'.format(float(x))).replace('.', ',') for x in list(data_list[5].values())]
-    heads1 = ['Год', 'Средняя зарплата', f'Средняя зарплата - {job_name}', 'Количество вакансий',
-              f'Количество вакансий - {job_name}']
-    heads2 = ['Город', 'Уровень зарплат', 'Город', 'Доля вакансий']
-    env = Environment(loader=FileSystemLoader('.'))
-    template = env.get_template("pdf_template.html")
-    pdf_template = template.render({'heads1': heads1, 'job': job_name,
-                                    'salary_by_years': data_list[0],
-                                    'job_salary_by_years': data_list[2],
-                                    'vacs_by_years': data_list[1],
-                                    'job_count_by_years': data_list[3],
-                                    'heads2': heads2, 'salary_key': salary_key, 'vacs_key': vacs_key,
-                                    'salary_by_cities': data_list[4],
-                                    'vacs_by_cities': vacs_by_cities})
-
-    config = pdfkit.configuration(wkhtmltopdf=r'C:\source\wkhtmltox\bin\wkhtmltopdf.exe')
-    pdfkit.from_string(pdf_template, 'report_new.pdf', configuration=config, options={'enable-local-file-access': None})
-
-
-def create_report():
-    """
-        Функция создает отчетность по исходным данным
-    """
-    file_name, job_name = get_params()
-    create_vacancies(file_name)
     pd.set_option('expand_frame_repr', False)
-    print('Подгрузка файла вакансии')
-    df = pd.read_csv('vacancies_new.csv')
-    df['published_at'] = df['published_at'].apply(lambda x: x[:4])
+    chunks = VacancyChunks(file_name, chunksize, cache)
+    if chunksize is not None:
+        return chunks
+    with profiling.stage('task3.4.2', 'convert') as stage:
+        # Генератор дочитывается до конца, чтобы сохранить файл cache
+        [df] = chunks.converted()
+        stage.rows = len(df)
+    with profiling.stage('task3.4.2', 'parse', len(df)):
+        df['published_at'] = timestamps.parse_column(df['published_at'])[1].astype(str)
+    return df
+
+
+class VacancyChunks:
+    """
+    Вакансии с переведенными зарплатами, которые переводятся по частям при каждом
+    проходе, не загружая файл в память целиком
+
+    Attributes:
+        file_name (str): Имя исходного файла
+        chunksize (int or None): Количество строк в части, None - одна часть
+        cache (str or None): Файл переведенных вакансий из load_vacancies
+    """
+    def __init__(self, file_name, chunksize=None, cache=None):
+        self.file_name = file_name
+        self.chunksize = chunksize
+        self.cache = cache
+
+    def converted(self):
+        """
+        Метод возвращает части с переведенными зарплатами: из файла cache, если
+        он актуален, иначе переводом исходного файла
+
+        Returns:
+            (iterator): Части таблицы вакансий с колонкой salary
+        """
+        if self.cache is None or not cache_is_fresh(self.cache, self.file_name):
+            return convert_chunks(self.file_name, self.chunksize, self.cache)
+        print('Подгрузка файла вакансии')
+        if self.chunksize is None:
+            return iter([vacancy_schema.read_csv(self.cache, 'task3_4_2')])
+        return vacancy_schema.read_csv(self.cache, 'task3_4_2', chunksize=self.chunksize)
+
+    def __iter__(self):
+        """
+        Метод отдает части в формате load_vacancies
+
+        Returns:
+            (iterator): Части таблицы вакансий с годом публикации в колонке published_at
+        """
+        for df in self.converted():
+            df['published_at'] = timestamps.parse_column(df['published_at'])[1].astype(str)
+            yield df
+
+
+def load_name_index(file_name, df):
+    """
+    Функция загружает или строит индекс по названиям вакансий. Индекс хранится рядом
+    с исходным файлом: перевод валют сохраняет порядок и количество строк
+
+    Args:
+        file_name (str): Имя исходного файла
+        df (DataFrame): Вакансии из load_vacancies
+
+    Returns:
+        (NameIndex): Индекс по названиям
+    """
+    return NameIndex.for_file(file_name, df['name'])
+
+
+@profiling.profiled('task3.4.2', 'aggregate', rows_arg=0)
+def get_statistics(df, job_name, name_index=None, distribution=False):
+    """
+    Функция считает статистику по вакансиям
+
+    Args:
+        df (DataFrame): Вакансии из load_vacancies
+        job_name (str): Название профессии
+        name_index (NameIndex or None): Индекс по названиям из load_name_index. С ним
+            профессия ищется как подстрока, а не как регулярное выражение
+        distribution (bool): Добавить седьмым элементом распределение зарплат по
+            годам и городам (get_distribution)
+
+    Returns:
+        (list): Список словарей статистики по годам и городам
+    """
     years = df['published_at'].unique()
+    if name_index is None:
+        job_mask = df['name'].str.contains(job_name)
+    else:
+        job_mask = np.zeros(len(df), dtype=bool)
+        job_mask[name_index.search(job_name)] = True
+        job_mask = pd.Series(job_mask, index=df.index)
+
+    # Одна группировка по годам вместо фильтрации всей таблицы для каждого года
+    year_groups = df.groupby('published_at', sort=False)['salary'].agg(['mean', 'size'])
+    job_groups = df[job_mask].groupby('published_at', sort=False)['salary'].agg(['mean', 'size'])
 
-    salary_by_years = {year: [] for year in years}
-    vacs_by_years = {year: 0 for year in years}
-    job_salary_by_years = {year: [] for year in years}
+    salary_by_years = {year: int(year_groups.at[year, 'mean']) for year in years}
+    vacs_by_years = {year: int(year_groups.at[year, 'size']) for year in years}
+    job_salary_by_years = {year: 0 for year in years}
     job_count_by_years = {year: 0 for year in years}
 
-    for year in years:
-        year_df = df[df['published_at'] == year]
-        salary_by_years[year] = int(year_df['salary'].mean())
-        vacs_by_years[year] = len(year_df)
-        job_salary_by_years[year] = mean_to_number(year_df[year_df['name'].str.contains(job_name)]['salary'].mean())
-        job_count_by_years[year] = len(year_df[year_df['name'].str.contains(job_name)])
+    for year, row in job_groups.iterrows():
+        job_salary_by_years[year] = mean_to_number(row['mean'])
+        job_count_by_years[year] = int(row['size'])
 
     print('Создание первых четырех словарей')
 
+    salary_by_cities, vacs_by_cities = get_city_statistics(df)
+
+    data_list = [salary_by_years, vacs_by_years, job_salary_by_years, job_count_by_years, salary_by_cities,
+                 vacs_by_cities]
+    if distribution:
+        data_list.append(get_distribution(df, vacs_by_cities))
+    return data_list
+
+
+def regex_matches(names, job_names):
+    """
+    Функция сопоставляет названия с профессиями как регулярные выражения, как
+    str.contains в get_statistics
+
+    Args:
+        names (list): Уникальные названия вакансий
+        job_names (list): Названия профессий (регулярные выражения)
+
+    Returns:
+        (ndarray): Матрица профессия x название, True для совпадений
+    """
+    matches = np.zeros((len(job_names), len(names)), dtype=bool)
+    series = pd.Series(names, dtype=object)
+    for i, job_name in enumerate(job_names):
+        matches[i] = series.str.contains(job_name).fillna(False).to_numpy(dtype=bool)
+    return matches
+
+
+@profiling.profiled('task3.4.2', 'aggregate', rows_arg=0)
+def get_multi_statistics(df, job_names, name_index=None, distribution=False, regex=False):
+    """
+    Функция считает статистику сразу для нескольких профессий. Названия вакансий
+    просматриваются один раз автоматом Ахо-Корасик (поиск подстроки без регулярных
+    выражений) или, с regex, каждое уникальное название проверяется регулярными
+    выражениями профессий, после чего все профессии агрегируются одной группировкой
+
+    Args:
+        df (DataFrame): Вакансии из load_vacancies
+        job_names (list): Названия профессий
+        name_index (NameIndex or None): Индекс по названиям. Если передан, строки
+            профессий берутся из него без просмотра названий
+        distribution (bool): Добавить распределение зарплат, как get_statistics
+        regex (bool): Искать профессии как регулярные выражения, как get_statistics
+            (без name_index)
+
+    Returns:
+        (dict): Профессия -> список словарей в формате get_statistics
+    """
+    job_names = list(dict.fromkeys(job_names))
+    years = df['published_at'].unique()
+    year_groups = df.groupby('published_at', sort=False)['salary'].agg(['mean', 'size'])
+    salary_by_years = {year: int(year_groups.at[year, 'mean']) for year in years}
+    vacs_by_years = {year: int(year_groups.at[year, 'size']) for year in years}
+
+    if name_index is None:
+        codes, names = pd.factorize(df['name'])
+        if regex:
+            job_indexes, name_indexes = np.nonzero(regex_matches(list(names), job_names))
+        else:
+            name_indexes, job_indexes = ProfessionMatcher(job_names).match_pairs(list(names))
+        pairs = pd.DataFrame({'code': name_indexes, 'job': job_indexes})
+        rows = pd.DataFrame({'code': codes, 'year': df['published_at'].values, 'salary': df['salary'].values})
+        matched = rows.merge(pairs, on='code')
+    else:
+        postings = [name_index.search(job_name) for job_name in job_names]
+        row_indexes = np.array([row for posting in postings for row in posting], dtype=np.int64)
+        matched = pd.DataFrame({'job': np.repeat(np.arange(len(job_names)), [len(x) for x in postings]),
+                                'year': df['published_at'].values[row_indexes],
+                                'salary': df['salary'].values[row_indexes]})
+    job_groups = matched.groupby(['job', 'year'])['salary'].agg(['mean', 'size'])
+
+    salary_by_cities, vacs_by_cities = get_city_statistics(df)
+    distributions = get_distribution(df, vacs_by_cities) if distribution else None
+
+    result = {}
+    for i, job_name in enumerate(job_names):
+        job_salary_by_years = {year: 0 for year in years}
+        job_count_by_years = {year: 0 for year in years}
+        if i in job_groups.index.get_level_values('job'):
+            for year, row in job_groups.loc[i].iterrows():
+                job_salary_by_years[year] = 0 if np.isnan(row['mean']) else int(row['mean'])
+                job_count_by_years[year] = int(row['size'])
+        result[job_name] = [salary_by_years, vacs_by_years, job_salary_by_years, job_count_by_years,
+                            salary_by_cities, vacs_by_cities]
+        if distributions is not None:
+            result[job_name].append(distributions)
+    return result
+
+
+def get_distribution(df, vacs_by_cities):
+    """
+    Функция считает медиану, p10, p90 и гистограмму зарплат по годам и крупнейшим
+    городам одной сортировкой строк по группе
+
+    Args:
+        df (DataFrame): Вакансии из load_vacancies
+        vacs_by_cities (dict): Крупнейшие города из get_city_statistics
+
+    Returns:
+        (dict): Распределение зарплат в формате salary_distribution.compute
+    """
+    year_codes, years = pd.factorize(df['published_at'])
+    area_codes, areas = categories.encode(df['area_name'])
+    return salary_distribution.compute(year_codes, list(years), area_codes, areas, df['salary'].to_numpy(dtype=float),
+                                       list(vacs_by_cities))
+
+
+def get_city_statistics(df):
+    """
+    Функция считает уровень зарплат и долю вакансий для десяти самых крупных городов
+
+    Args:
+        df (DataFrame): Вакансии из load_vacancies
+
+    Returns:
+        (dict, dict): Уровень зарплат и доля вакансий по городам
+    """
     "3.4.3"
-    area = df['area_name'].value_counts().to_dict()
-    area = dict(sorted(area.items(), key=lambda x: x[1], reverse=True))
-    vacs_sum = len(df)
-    result_city = [city for city in area.keys() if area[city] / vacs_sum > 0.01]
-    salary_by_cities = {}
-    vacs_by_cities = {}
-
-    for i in range(10):
-        city = result_city[i]
-        salary_by_cities[city] = mean_to_number(df[df['area_name'] == city]['salary'].mean())
-        vacs_by_cities[city] = round((len(df[df['area_name'] == city]) / vacs_sum), 4)
+    top_cities, city_salary, city_share = categories.city_statistics(df['area_name'], df['salary'].to_numpy())
+    salary_by_cities = {city: mean_to_number(salary) for city, salary in zip(top_cities, city_salary)}
+    vacs_by_cities = {city: round(float(share), 4) for city, share in zip(top_cities, city_share)}
     "3.4.3/"
 
+    return salary_by_cities, vacs_by_cities
+
+
+def grow(values, size):
+    """
+    Функция дополняет массив сумм нулями по последней оси до нужного размера
+
+    Args:
+        values (ndarray): Массив сумм
+        size (int): Новый размер последней оси
+
+    Returns:
+        (ndarray): Исходный или дополненный массив
+    """
+    missing = size - values.shape[-1]
+    if missing <= 0:
+        return values
+    return np.concatenate([values, np.zeros(values.shape[:-1] + (missing,), dtype=values.dtype)], axis=-1)
+
+
+def global_codes(values, dictionary):
+    """
+    Функция переводит значения колонки части в коды общего для всех частей словаря
+
+    Args:
+        values (Series): Колонка части
+        dictionary (Dictionary): Словарь значений всех прочитанных частей
+
+    Returns:
+        (ndarray, list): Коды строк (-1 для пропусков) и значения части в порядке
+        локальных кодов
+    """
+    codes, uniques = categories.encode(values)
+    table = np.array([dictionary.encode(value) for value in uniques] + [-1], dtype=np.int64)
+    return table[codes], uniques
+
+
+class ChunkedStatistics:
+    """
+    Накопитель статистики get_multi_statistics по частям таблицы. Для годов, городов
+    и профессий копятся количество строк, количество зарплат и их сумма. Суммы
+    складываются np.add.at в порядке строк файла, как np.bincount в
+    categories.city_statistics, поэтому результат не зависит от размера частей
+
+    Attributes:
+        job_names (list): Названия профессий
+        regex (bool): Искать профессию как регулярное выражение, как get_statistics,
+            а не как подстроку, как get_multi_statistics
+        distribution (bool): Копить гистограммы и скетчи KllSketch зарплат по годам и
+            городам для распределения зарплат
+        year_seeds (SeedSequence): Источник зерен скетчей годов
+        city_seeds (SeedSequence): Источник зерен скетчей городов
+        rows (int): Количество прочитанных строк
+        names (Dictionary): Названия вакансий прочитанных частей
+        matches (ndarray): Матрица профессия x название, True для совпадений
+    """
+    def __init__(self, job_names, regex=False, distribution=False, seed=0):
+        self.job_names = list(dict.fromkeys(job_names))
+        self.regex = regex
+        self.distribution = distribution
+        self.matcher = None if regex else ProfessionMatcher(self.job_names)
+        self.rows = 0
+        self.years = categories.Dictionary()
+        self.cities = categories.Dictionary()
+        self.names = categories.Dictionary()
+        self.matches = np.zeros((len(self.job_names), 0), dtype=bool)
+        self.year_sizes = np.zeros(0, dtype=np.int64)
+        self.year_counts = np.zeros(0, dtype=np.int64)
+        self.year_sums = np.zeros(0)
+        self.job_sizes = np.zeros((len(self.job_names), 0), dtype=np.int64)
+        self.job_counts = np.zeros((len(self.job_names), 0), dtype=np.int64)
+        self.job_sums = np.zeros((len(self.job_names), 0))
+        self.city_sizes = np.zeros(0, dtype=np.int64)
+        self.city_counts = np.zeros(0, dtype=np.int64)
+        self.city_sums = np.zeros(0)
+        self.city_first = np.zeros(0, dtype=np.int64)
+        self.year_histograms = np.zeros((len(salary_distribution.SALARY_EDGES), 0), dtype=np.int64)
+        self.city_histograms = np.zeros((len(salary_distribution.SALARY_EDGES), 0), dtype=np.int64)
+        self.year_sketches = {}
+        self.city_sketches = {}
+        self.year_seeds, self.city_seeds = np.random.SeedSequence(seed).spawn(2)
+
+    def job_matches(self, names):
+        """
+        Метод сопоставляет новые уникальные названия с профессиями
+
+        Args:
+            names (list): Уникальные названия вакансий
+
+        Returns:
+            (ndarray): Матрица профессия x название, True для совпадений
+        """
+        if self.regex:
+            return regex_matches(names, self.job_names)
+        matches = np.zeros((len(self.job_names), len(names)), dtype=bool)
+        name_indexes, job_indexes = self.matcher.match_pairs(names)
+        matches[job_indexes, name_indexes] = True
+        return matches
+
+    def add(self, df):
+        """
+        Метод добавляет часть таблицы к накопленной статистике
+
+        Args:
+            df (DataFrame): Часть вакансий в формате load_vacancies
+        """
+        salary = df['salary'].to_numpy(dtype=float)
+        has_salary = ~np.isnan(salary)
+
+        years, _ = global_codes(df['published_at'], self.years)
+        self.year_sizes, self.year_counts, self.year_sums = (
+            grow(self.year_sizes, len(self.years)), grow(self.year_counts, len(self.years)),
+            grow(self.year_sums, len(self.years)))
+        self.job_sizes, self.job_counts, self.job_sums = (
+            grow(self.job_sizes, len(self.years)), grow(self.job_counts, len(self.years)),
+            grow(self.job_sums, len(self.years)))
+        has_year = years >= 0
+        self.add_group(self.year_sizes, self.year_counts, self.year_sums, years, has_year, has_salary, salary)
+
+        # Названия сопоставляются с профессиями один раз, при первом появлении
+        known = len(self.names)
+        name_codes, _ = global_codes(df['name'], self.names)
+        self.matches = np.concatenate([self.matches, self.job_matches(self.names.values[known:])], axis=1)
+        for i in range(len(self.job_names)):
+            job_rows = has_year & (name_codes >= 0) & np.append(self.matches[i], False)[name_codes]
+            self.add_group(self.job_sizes[i], self.job_counts[i], self.job_sums[i], years, job_rows, has_salary,
+                           salary)
+
+        cities, _ = global_codes(df['area_name'], self.cities)
+        self.city_sizes, self.city_counts, self.city_sums = (
+            grow(self.city_sizes, len(self.cities)), grow(self.city_counts, len(self.cities)),
+            grow(self.city_sums, len(self.cities)))
+        first = np.full(len(self.cities) - len(self.city_first), np.iinfo(np.int64).max)
+        self.city_first = np.concatenate([self.city_first, first])
+        has_city = cities >= 0
+        self.add_group(self.city_sizes, self.city_counts, self.city_sums, cities, has_city, has_salary, salary)
+        positions = np.flatnonzero(has_city)
+        np.minimum.at(self.city_first, cities[positions], self.rows + positions)
+        if self.distribution:
+            self.add_distribution(years, cities, salary)
+        self.rows += len(df)
+
+    def add_distribution(self, years, cities, salary):
+        """
+        Метод добавляет зарплаты части в гистограммы и скетчи годов и городов
+
+        Args:
+            years (ndarray): Коды годов строк части
+            cities (ndarray): Коды городов строк части
+            salary (ndarray): Зарплаты строк части
+        """
+        self.year_histograms = grow(self.year_histograms, len(self.years)) + salary_distribution.histograms(
+            years, salary, len(self.years))
+        self.city_histograms = grow(self.city_histograms, len(self.cities)) + salary_distribution.histograms(
+            cities, salary, len(self.cities))
+        salary_distribution.update_sketches(self.year_sketches, years, salary, self.year_seeds)
+        salary_distribution.update_sketches(self.city_sketches, cities, salary, self.city_seeds)
+
+    @staticmethod
+    def add_group(sizes, counts, sums, codes, rows, has_salary, salary):
+        """
+        Метод добавляет строки к суммам группировки
+
+        Args:
+            sizes (ndarray): Количество строк по кодам
+            counts (ndarray): Количество зарплат по кодам
+            sums (ndarray): Сумма зарплат по кодам
+            codes (ndarray): Коды строк части
+            rows (ndarray): Маска строк, входящих в группировку
+            has_salary (ndarray): Маска строк с зарплатой
+            salary (ndarray): Зарплаты строк
+        """
+        np.add.at(sizes, codes[rows], 1)
+        rows = rows & has_salary
+        np.add.at(counts, codes[rows], 1)
+        np.add.at(sums, codes[rows], salary[rows])
+
+    @staticmethod
+    def means(sums, counts):
+        """
+        Метод делит суммы на количество зарплат
+
+        Returns:
+            (ndarray): Средние, NaN для групп без зарплат
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    def city_statistics(self, share=0.01, limit=10):
+        """
+        Метод считает статистику городов как categories.city_statistics
+
+        Returns:
+            (dict, dict): Уровень зарплат и доля вакансий по городам
+        """
+        top = [code for code in categories.rank_by_size(self.city_sizes, self.city_first)
+               if self.city_sizes[code] / self.rows > share][:limit]
+        means = ChunkedStatistics.means(self.city_sums, self.city_counts)
+        salary_by_cities = {self.cities.values[code]: mean_to_number(means[code]) for code in top}
+        vacs_by_cities = {self.cities.values[code]: round(float(self.city_sizes[code] / self.rows), 4)
+                          for code in top}
+        return salary_by_cities, vacs_by_cities
+
+    def data_lists(self):
+        """
+        Метод возвращает накопленную статистику
+
+        Returns:
+            (dict): Профессия -> список словарей в формате get_statistics
+        """
+        years = self.years.values
+        means = ChunkedStatistics.means(self.year_sums, self.year_counts)
+        salary_by_years = {year: int(means[code]) for code, year in enumerate(years)}
+        vacs_by_years = {year: int(self.year_sizes[code]) for code, year in enumerate(years)}
+        salary_by_cities, vacs_by_cities = self.city_statistics()
+        distributions = None
+        if self.distribution:
+            top = list(vacs_by_cities)
+            distributions = {'buckets': salary_distribution.bucket_labels(),
+                             'years': salary_distribution.sketch_rows(years, list(range(len(years))),
+                                                                      self.year_sketches, self.year_histograms),
+                             'cities': salary_distribution.sketch_rows(top, [self.cities.codes[city] for city in top],
+                                                                       self.city_sketches, self.city_histograms)}
+
+        result = {}
+        for i, job_name in enumerate(self.job_names):
+            job_means = ChunkedStatistics.means(self.job_sums[i], self.job_counts[i])
+            job_salary_by_years = {year: 0 for year in years}
+            job_count_by_years = {year: 0 for year in years}
+            for code in np.flatnonzero(self.job_sizes[i]):
+                job_salary_by_years[years[code]] = mean_to_number(job_means[code])
+                job_count_by_years[years[code]] = int(self.job_sizes[i][code])
+            result[job_name] = [salary_by_years, vacs_by_years, job_salary_by_years, job_count_by_years,
+                                salary_by_cities, vacs_by_cities]
+            if distributions is not None:
+                result[job_name].append(distributions)
+        return result
+
+
+def get_chunked_statistics(chunks, job_names, regex=False, distribution=False, seed=0):
+    """
+    Функция считает статистику get_multi_statistics за один проход по частям таблицы,
+    не загружая ее в память целиком
+
+    Args:
+        chunks (iterable): Части вакансий, например VacancyChunks из load_vacancies
+        job_names (list): Названия профессий
+        regex (bool): Искать профессии как регулярные выражения, как get_statistics
+        distribution (bool): Добавить распределение зарплат; квантили считаются по
+            скетчам KllSketch, гистограммы - точно
+        seed (int): Зерно, из которого порождаются зерна скетчей
+
+    Returns:
+        (dict): Профессия -> список словарей в формате get_statistics
+    """
+    statistics = ChunkedStatistics(job_names, regex, distribution, seed)
+    for df in chunks:
+        with profiling.stage('task3.4.2', 'aggregate_chunk', len(df)):
+            statistics.add(df)
+    return statistics.data_lists()
+
+
+def print_statistics(data_list):
+    """
+    Функция печатает статистику
+
+    Args:
+        data_list (list): Список словарей статистики из get_statistics
+    """
+    salary_by_years, vacs_by_years, job_salary_by_years, job_count_by_years, salary_by_cities, \
+        vacs_by_cities = data_list[:6]
     print('Динамика уровня зарплат по годам:', salary_by_years)
     print('Динамика количества вакансий по годам:', vacs_by_years)
     print('Динамика уровня зарплат по годам для выбранной профессии:', job_salary_by_years)
@@ -109,9 +581,30 @@ def create_report():
     print('Уровень зарплат по городам (в порядке убывания):', salary_by_cities)
     print('Доля вакансий по городам (в порядке убывания):', vacs_by_cities)
 
-    data_list = [salary_by_years, vacs_by_years, job_salary_by_years, job_count_by_years, salary_by_cities,
-                 vacs_by_cities]
-    report_pdf(data_list, job_name)
+
+def create_report(file_name=None, job_name=None, output='report_new.pdf', chunksize=None, cache=None):
+    """
+    Функция создает отчетность по исходным данным
+
+    Args:
+        file_name (str or None): Имя исходного файла. Если не задано, параметры
+            запрашиваются у пользователя
+        job_name (str or None): Название профессии
+        output (str): Имя PDF файла
+        chunksize (int or None): Количество строк, читаемых за раз. Если задано,
+            файл обрабатывается по частям и не загружается в память целиком
+        cache (str or None): Файл для сохранения и повторного использования
+            переведенных вакансий
+    """
+    if file_name is None:
+        file_name, job_name = get_params()
+    if chunksize is None:
+        data_list = get_statistics(load_vacancies(file_name, cache=cache), job_name, distribution=True)
+    else:
+        data_list = get_chunked_statistics(load_vacancies(file_name, chunksize, cache), [job_name],
+                                           regex=True, distribution=True)[job_name]
+    print_statistics(data_list)
+    report_pdf(data_list, job_name, output)
 
 
 if __name__ == '__main__':
@@ -1,7 +1,7 @@
 import sqlite3
-import pandas as pd
 import numpy as np
 import math
+import vacancy_schema
 
 """
 Функциональность модуля заключается в формировании данных о вакансий и их сохранение в БД
@@ -35,7 +35,7 @@ def to_int(num):
     else:
         return int(num)
 
-df = pd.read_csv('vacancies_dif_currencies.csv')
+df = vacancy_schema.read_csv('vacancies_dif_currencies.csv', 'task3_5_2')
 print('Файл вакансий загружен')
 df.salary_from = df[['salary_from', 'salary_to']].mean(axis=1)
 df['published_at'] = df.published_at.apply(lambda z: z[:10])
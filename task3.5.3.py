@@ -1,12 +1,21 @@
 import sqlite3
+import numpy as np
 import pandas as pd
 
 """ Модуль посредством sql запросов получает статистику по вакансиям"""
 
-job_name = input('Введите название вакансии: ')
 
-with sqlite3.connect('Chaganov.db') as con:
-    pd.set_option('expand_frame_repr', False)
+def get_statistics(con, job_name):
+    """
+    Функция получает статистику по вакансиям из базы данных
+
+    Args:
+        con (Connection): Соединение с базой данных
+        job_name (str): Название вакансии
+
+    Returns:
+        (list): Список таблиц статистики по годам и городам
+    """
     salary_by_year = pd.read_sql("""
         SELECT strftime('%Y', published_at) as date, round(avg(salary)) as salary_by_year
         FROM salary
@@ -15,16 +24,16 @@ with sqlite3.connect('Chaganov.db') as con:
         SELECT strftime('%Y', published_at) as date, count(salary) as vacs_by_years
         FROM salary
         GROUP BY strftime('%Y', published_at)""", con)
-    job_salary_by_years = pd.read_sql(f"""
+    job_salary_by_years = pd.read_sql("""
         SELECT strftime('%Y', published_at) as date, round(avg(salary)) as job_salary_by_years
         FROM salary
-        WHERE name LIKE '{job_name}'
-        GROUP BY strftime('%Y', published_at)""", con)
-    job_count_by_years = pd.read_sql(f"""
+        WHERE name LIKE ?
+        GROUP BY strftime('%Y', published_at)""", con, params=(job_name,))
+    job_count_by_years = pd.read_sql("""
         SELECT strftime('%Y', published_at) as date, count(salary) as job_count_by_years
         FROM salary
-        WHERE name LIKE '{job_name}'
-        GROUP BY strftime('%Y', published_at)""", con)
+        WHERE name LIKE ?
+        GROUP BY strftime('%Y', published_at)""", con, params=(job_name,))
     salary_by_cities = pd.read_sql("""
         SELECT area_name as city, count(salary) as vacs_by_cities, round(avg(salary)) as salary_by_cities
         FROM salary
@@ -38,10 +47,64 @@ with sqlite3.connect('Chaganov.db') as con:
         GROUP BY area_name
         ORDER BY vacs_by_cities DESC
         LIMIT 10""", con)
+    return [salary_by_year, vacs_by_years, job_salary_by_years, job_count_by_years, salary_by_cities, vacs_by_cities]
+
+
+def get_approximate_statistics(con, job_name, sample, seed=0):
+    """
+    Функция оценивает статистику по простой случайной выборке строк таблицы:
+    номера строк (rowid) выбираются без возвращения, и запрос читает только их.
+    Строки без зарплаты не входят ни в выборку, ни в количество строк, как и в
+    count(salary) точных запросов; годы - домены выборки. Строки, для которых
+    strftime не получает год, образуют домен None, как группа NULL в GROUP BY
+
+    Args:
+        con (Connection): Соединение с базой данных
+        job_name (str): Название вакансии (шаблон LIKE, как в get_statistics)
+        sample (int): Количество выбираемых строк
+        seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        (dict): Оценки в формате approximate.stratified_statistics
+    """
+    import approximate
+    population, last_row = con.execute('SELECT count(salary), max(rowid) FROM salary').fetchone()
+    rowids = np.random.default_rng(seed).choice(last_row or 0, min(sample, last_row or 0), replace=False) + 1
+    rows = []
+    # Ограничение SQLite на количество параметров запроса
+    for start in range(0, len(rowids), 900):
+        batch = rowids[start:start + 900].tolist()
+        rows += con.execute(f"""
+            SELECT strftime('%Y', published_at), salary, area_name, name LIKE ?
+            FROM salary
+            WHERE salary IS NOT NULL AND rowid IN ({', '.join('?' * len(batch))})""", [job_name] + batch).fetchall()
+
+    present = {row[0] for row in rows}
+    # NULL в SQLite сортируется первым
+    years = ([None] if None in present else []) + sorted(present - {None})
+    codes = {year: code for code, year in enumerate(years)}
+    year_codes = np.array([codes[row[0]] for row in rows], dtype=np.int64)
+    salary = np.array([row[1] for row in rows], dtype=float)
+    cities = np.array([row[2] for row in rows], dtype=object)
+    job_mask = np.array([row[3] == 1 for row in rows], dtype=bool)
+    # Как и в get_statistics, берутся 10 городов с наибольшим количеством вакансий без порога доли
+    return approximate.stratified_statistics(np.zeros(len(rows), dtype=np.int64), [population], year_codes, years,
+                                             salary, cities, {job_name: job_mask}, share=0)
+
+
+def print_statistics(data_list):
+    """
+    Функция печатает таблицы статистики
+
+    Args:
+        data_list (list): Список таблиц из get_statistics
+    """
+    for table in data_list:
+        print(table.to_string() + '\n')
+
 
-    print(salary_by_year.to_string() + '\n')
-    print(vacs_by_years.to_string() + '\n')
-    print(job_salary_by_years.to_string() + '\n')
-    print(job_count_by_years.to_string() + '\n')
-    print(salary_by_cities.to_string() + '\n')
-    print(vacs_by_cities.to_string() + '\n')
+if __name__ == '__main__':
+    job_name = input('Введите название вакансии: ')
+    with sqlite3.connect('Chaganov.db') as con:
+        pd.set_option('expand_frame_repr', False)
+        print_statistics(get_statistics(con, job_name))
@@ -1,29 +1,142 @@
+import os
 import pandas as pd
 import numpy as np
+import timestamps
+import vacancy_schema
 
+CURRENCY_FILE = 'Currency_data.csv'
+
+
+def rate_lookup(currency_data, month_indexes, currencies):
+    """
+    Функция находит курс валюты для каждой вакансии. Курсы раскладываются в
+    таблицу по номеру месяца и коду валюты, поэтому поиск выполняется одной
+    выборкой из массива, а не обращением к DataFrame для каждой строки
+
+    Args:
+        currency_data (DataFrame): Курсы валют по месяцам, индекс - ключи вида 2007-12
+        month_indexes (ndarray): Номер месяца публикации каждой вакансии
+        currencies (Series): Код валюты каждой вакансии
+
+    Returns:
+        (ndarray): Курс валюты или NaN, если курса нет
+    """
+    table_months = np.array([timestamps.month_index(key) for key in currency_data.index])
+    first_month = table_months.min()
+    table = np.full((table_months.max() - first_month + 1, len(currency_data.columns)), np.nan)
+    table[table_months - first_month] = currency_data.to_numpy(dtype=float)
+
+    rows = np.asarray(month_indexes) - first_month
+    columns = pd.Index(currency_data.columns).get_indexer(np.asarray(currencies, dtype=object))
+    found = (rows >= 0) & (rows < len(table)) & (columns >= 0)
+    rates = np.full(len(rows), np.nan)
+    rates[found] = table[rows[found], columns[found]]
+    return rates
 
-def create_vacancies(file_name):
-    print('Запуск формирования файла по вакансиям')
-    pd.set_option('expand_frame_repr', False)
 
-    currency_data = pd.read_csv('Currency_data.csv')
+def convert_vacancies(df, currency_data):
+    """
+    Функция переводит зарплаты вакансий в рубли по курсу месяца публикации. Строки
+    обрабатываются независимо, поэтому таблицу можно переводить по частям
+
+    Args:
+        df (DataFrame): Вакансии с границами оклада и валютой
+        currency_data (DataFrame): Курсы валют по месяцам, индекс - ключи вида 2007-12
+
+    Returns:
+        (DataFrame): Вакансии с колонкой salary вместо границ оклада и валюты
+    """
+    df.salary_from = df[['salary_from', 'salary_to']].mean(axis=1)
+    rates = rate_lookup(currency_data, timestamps.parse_column(df['published_at'])[2], df['salary_currency'])
+    convert = (df['salary_currency'] != 'RUR').to_numpy() & ~np.isnan(df['salary_from'].to_numpy())
+    df['salary_from'] = np.where(convert, df['salary_from'].to_numpy() * rates, df['salary_from'].to_numpy())
+    return df.drop(['salary_to', 'salary_currency'], axis=1).rename(columns={'salary_from': 'salary'})
+
+
+def read_currency_data():
+    """
+    Функция загружает курсы валют по месяцам
+
+    Returns:
+        (DataFrame): Курсы валют, индекс - ключи вида 2007-12
+    """
+    currency_data = pd.read_csv(CURRENCY_FILE)
     currency_data = currency_data.set_index('date')
     print('Подгрузка файла по валютам')
     print(currency_data.head())
+    return currency_data
+
 
-    df = pd.read_csv(file_name)
+def cache_is_fresh(cache, file_name):
+    """
+    Функция проверяет, что файл переведенных вакансий создан после изменения
+    исходного файла и курсов валют
+
+    Args:
+        cache (str): Имя файла переведенных вакансий
+        file_name (str): Имя исходного файла
+
+    Returns:
+        (bool): Файл можно использовать вместо перевода
+    """
+    if not os.path.exists(cache):
+        return False
+    sources = [file_name] + ([CURRENCY_FILE] if os.path.exists(CURRENCY_FILE) else [])
+    return os.path.getmtime(cache) >= max(os.path.getmtime(source) for source in sources)
+
+
+def convert_chunks(file_name, chunksize=None, cache=None):
+    """
+    Генератор переводит зарплаты в рубли и отдает переведенные вакансии, не
+    записывая их на диск. Если задан cache, вакансии дополнительно сохраняются в
+    этот файл; файл заменяется только после перевода всех строк
+
+    Args:
+        file_name (str): Имя исходного файла
+        chunksize (int or None): Количество строк, читаемых за раз. Если не задано,
+            файл переводится одной таблицей
+        cache (str or None): Файл для сохранения переведенных вакансий
+
+    Returns:
+        (iterator): Таблицы вакансий с колонкой salary
+    """
+    print('Запуск формирования файла по вакансиям')
+    pd.set_option('expand_frame_repr', False)
+    currency_data = read_currency_data()
+
+    if chunksize is None:
+        chunks = [vacancy_schema.read_csv(file_name, 'task3_3_2')]
+    else:
+        chunks = vacancy_schema.read_csv(file_name, 'task3_3_2', chunksize=chunksize)
     print('Открытие файла по вакансиям')
-    df.salary_from = df[['salary_from', 'salary_to']].mean(axis=1)
-    df['date'] = df.published_at.apply(lambda z: z[:7])
-    df['salary_from'] = df.apply(
-        lambda x: float(x['salary_from'] * currency_data.at[x['date'], x['salary_currency']])
-        if (x['salary_currency'] != 'RUR' and not np.isnan(x['salary_from']))
-        else x['salary_from'], axis=1)
-
-    df = df.drop(['salary_to', 'date', 'salary_currency'], axis=1).rename(columns={'salary_from': 'salary'})
-    # df.head(100).to_csv('first100vacancies.csv', index=False)
-    df.to_csv('vacancies_new.csv', index=False)
-    print('Создание итогового файла по вакансиям')
+    partial = None if cache is None else f'{cache}.{os.getpid()}.tmp'
+    try:
+        for i, df in enumerate(chunks):
+            df = convert_vacancies(df, currency_data)
+            if partial is not None:
+                # df.head(100).to_csv('first100vacancies.csv', index=False)
+                df.to_csv(partial, index=False, mode='w' if i == 0 else 'a', header=i == 0)
+            yield df
+        if partial is not None and os.path.exists(partial):
+            os.replace(partial, cache)
+            print('Создание итогового файла по вакансиям')
+    finally:
+        if partial is not None and os.path.exists(partial):
+            os.remove(partial)
+
+
+def create_vacancies(file_name, chunksize=None, output='vacancies_new.csv'):
+    """
+    Функция переводит зарплаты в рубли и сохраняет вакансии в файл
+
+    Args:
+        file_name (str): Имя исходного файла
+        chunksize (int or None): Количество строк, читаемых за раз. Если задано, файл
+            переводится по частям и не загружается в память целиком
+        output (str): Имя файла переведенных вакансий
+    """
+    for _ in convert_chunks(file_name, chunksize, output):
+        pass
 
 
 if __name__ == '__main__':
@@ -0,0 +1,152 @@
+import contextlib
+import csv
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+import numpy as np
+import approximate
+import cli
+import report_out_old
+
+
+def write_vacancies(file_name, rows, quoted=False):
+    rng = np.random.default_rng(3)
+    with open(file_name, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file, quoting=csv.QUOTE_ALL if quoted else csv.QUOTE_MINIMAL)
+        writer.writerow(['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'])
+        for i in range(rows):
+            salary_from = float(rng.integers(1000, 100000))
+            writer.writerow([rng.choice(['Программист Python', 'Аналитик', 'Программист']),
+                             '' if i % 17 == 0 else salary_from, salary_from + float(rng.integers(0, 50000)),
+                             rng.choice(['RUR', 'USD', 'KZT']), rng.choice(['Москва', 'Казань', 'Уфа']),
+                             f'{rng.choice([2018, 2019, 2021])}-0{rng.integers(1, 10)}-01T10:00:00+0300'])
+
+
+class KllSketchTests(unittest.TestCase):
+    def test_quantiles_within_rank_error(self):
+        values = np.random.default_rng(1).lognormal(11, 0.5, 200000)
+        first, second = approximate.KllSketch(seed=1), approximate.KllSketch(seed=2)
+        first.update(values[:120000])
+        second.update(values[120000:])
+        sketch = first.merge(second)
+        self.assertEqual(sketch.count, len(values))
+        self.assertLess(sum(len(items) for items in sketch.levels), 1000)
+        estimates, lower, upper, error = sketch.quantile_bounds()
+        ranks = np.searchsorted(np.sort(values), estimates, side='right') / len(values)
+        self.assertTrue((np.abs(ranks - np.array(approximate.QUANTILES)) <= error).all())
+        self.assertTrue(((lower <= estimates) & (estimates <= upper)).all())
+
+    def test_group_sketches_use_independent_seeds(self):
+        values = np.tile(np.random.default_rng(3).lognormal(11, 0.5, 5000), 2)
+        codes = np.repeat([0, 1], 5000)
+        sketches = approximate.group_sketches(codes, ['a', 'b'], values, seed=4)
+        self.assertFalse(all(np.array_equal(first, second)
+                             for first, second in zip(sketches['a'].levels, sketches['b'].levels)))
+        again = approximate.group_sketches(codes, ['a', 'b'], values, seed=4)
+        self.assertTrue(all(np.array_equal(first, second) for first, second in zip(sketches['b'].levels, again['b'].levels)))
+
+
+class StratifiedReservoirTests(unittest.TestCase):
+    def test_merge_keeps_capacity_and_population(self):
+        strata = np.repeat([2020, 2021], [500, 300])
+        first, second = approximate.StratifiedReservoir(100, 1), approximate.StratifiedReservoir(100, 2)
+        first.add(strata[::2], row=np.arange(800)[::2])
+        second.add(strata[1::2], row=np.arange(800)[1::2])
+        years, codes, population, columns = first.merge(second).sample()
+        self.assertEqual(years, [2020, 2021])
+        self.assertEqual(population.tolist(), [500, 300])
+        self.assertEqual(np.bincount(codes).tolist(), [100, 100])
+        self.assertEqual(len(set(columns['row'].tolist())), 200)
+        self.assertTrue((strata[columns['row']] == np.array(years)[codes]).all())
+
+
+class SampleTests(unittest.TestCase):
+    def setUp(self):
+        self.start_dir = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        os.chdir(self.start_dir)
+        self.directory.cleanup()
+
+    def test_full_sample_matches_exact_statistics(self):
+        for quoted in (False, True):
+            write_vacancies('vacancies.csv', 3000, quoted)
+            exact = report_out_old.InputConnect.get_statistics(report_out_old.DataSet('vacancies.csv').vacancies_objects,
+                                                               'Программист')
+            data_set = report_out_old.DataSet('vacancies.csv', sample=3000)
+            result = report_out_old.InputConnect.get_approximate_statistics(data_set.vacancies_objects,
+                                                                            data_set.population, ['Программист'])
+            job = result['jobs']['Программист']
+            self.assertEqual({year: 0 if np.isnan(mean) else int(mean)
+                              for year, (mean, _) in result['salary_by_years'].items()}, exact[0])
+            self.assertEqual({year: approximate.format_count(*value) for year, value in
+                              result['vacs_by_years'].items()}, exact[1])
+            self.assertEqual(exact[1][2020], 0)
+            self.assertEqual({year: int(round(count)) for year, (count, _) in job['count'].items()}, exact[3])
+            self.assertEqual({city: int(mean) for city, (mean, error) in result['salary_by_cities'].items()},
+                             exact[4])
+            # Выборка совпадает с данными, поэтому интервалы нулевые (NaN для года без вакансий)
+            self.assertFalse(any(error > 1e-6 for _, error in job['salary'].values()))
+            for year, (estimates, lower, upper, error) in result['quantiles_by_years'].items():
+                if exact[1][year]:
+                    self.assertEqual(error, 0)
+                    np.testing.assert_array_equal(lower, estimates)
+                    np.testing.assert_array_equal(upper, estimates)
+
+    def test_sample_keeps_year_counts(self):
+        write_vacancies('vacancies.csv', 3000)
+        data_set = report_out_old.DataSet('vacancies.csv', sample=50)
+        exact = report_out_old.InputConnect.get_statistics(report_out_old.DataSet('vacancies.csv').vacancies_objects,
+                                                           'Программист')
+        self.assertEqual({year: count for year, count in exact[1].items() if count}, data_set.population)
+        self.assertEqual(len(data_set.vacancies_objects), 150)
+
+    def test_sql_sample(self):
+        task = cli.load_script('task3.5.3.py', 'task3_5_3')
+        rng = np.random.default_rng(5)
+        with sqlite3.connect('vacancies.db') as con:
+            con.execute('CREATE TABLE salary (name TEXT, salary INTEGER, area_name TEXT, published_at TEXT)')
+            con.executemany('INSERT INTO salary VALUES (?, ?, ?, ?)',
+                            [(str(rng.choice(['Программист', 'Аналитик'])),
+                              None if i % 9 == 0 else int(rng.integers(10000, 90000)),
+                              str(rng.choice(['Москва', 'Казань'])), f'{rng.choice([2020, 2022])}-05-01')
+                             for i in range(2000)])
+            exact = task.get_statistics(con, 'Программист')
+            result = task.get_approximate_statistics(con, 'Программист', 5000)
+            self.assertEqual({year: approximate.format_count(*value) for year, value in
+                              result['vacs_by_years'].items()}, dict(exact[1].values.tolist()))
+            self.assertEqual({year: round(mean) for year, (mean, _) in result['jobs']['Программист']['salary'].items()},
+                             dict(exact[2].values.tolist()))
+            result = task.get_approximate_statistics(con, 'Программист', 500)
+            self.assertEqual(result['population'], int(exact[1]['vacs_by_years'].sum()))
+            self.assertLess(result['sample_size'], 500)
+
+    def test_sql_sample_without_years(self):
+        task = cli.load_script('task3.5.3.py', 'task3_5_3')
+        with sqlite3.connect('vacancies.db') as con:
+            con.execute('CREATE TABLE salary (name TEXT, salary INTEGER, area_name TEXT, published_at TEXT)')
+            # strftime не разбирает дату с часовым поясом +0300 и возвращает NULL
+            con.executemany('INSERT INTO salary VALUES (?, ?, ?, ?)',
+                            [('Программист' if i % 2 else 'Аналитик', 10000 + i, 'Москва',
+                              '2022-05-01T10:00:00+0300' if i % 3 else '2021-05-01') for i in range(300)])
+            exact = task.get_statistics(con, 'Программист')
+            result = task.get_approximate_statistics(con, 'Программист', 2000)
+            self.assertEqual(result['years'], [None, '2021'])
+            # pandas читает NULL года как NaN
+            self.assertEqual({year: approximate.format_count(*value) for year, value in result['vacs_by_years'].items()},
+                             {year if isinstance(year, str) else None: count for year, count in exact[1].values.tolist()})
+            with contextlib.redirect_stdout(io.StringIO()):
+                approximate.print_statistics(result, 'Программист')
+            con.execute("UPDATE salary SET published_at = '2022-05-01T10:00:00+0300'")
+            result = task.get_approximate_statistics(con, 'Программист', 2000)
+            self.assertEqual(result['years'], [None])
+        empty = approximate.domain_estimates(np.zeros(3, dtype=np.int64), [3], np.full(3, -1), 0, np.ones(3))
+        self.assertEqual([len(values) for values in empty], [0, 0, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
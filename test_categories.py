@@ -0,0 +1,28 @@
+import unittest
+import numpy as np
+import pandas as pd
+import categories
+
+
+class CityStatisticsTests(unittest.TestCase):
+    def test_matches_value_counts(self):
+        rng = np.random.default_rng(1)
+        areas = pd.Series(rng.choice(['Москва', 'Уфа', 'Казань', 'Омск', 'Пермь'], 500, p=[0.4, 0.2, 0.2, 0.1, 0.1]))
+        salaries = rng.uniform(10000, 100000, 500)
+        salaries[rng.random(500) < 0.2] = np.nan
+        df = pd.DataFrame({'area_name': areas, 'salary': salaries})
+
+        counts = df['area_name'].value_counts()
+        expected_means = df.groupby('area_name')['salary'].mean()
+        for values in (df['area_name'], df['area_name'].astype('category')):
+            cities, means, shares = categories.city_statistics(values, salaries)
+            self.assertEqual(cities, list(counts.index))
+            np.testing.assert_allclose(means, expected_means[cities].to_numpy())
+            np.testing.assert_allclose(shares, counts.to_numpy() / len(df))
+
+    def test_read_csv(self):
+        import io
+        df = categories.read_csv(io.StringIO('name,area_name,salary_currency\nA,Москва,RUR\nB,Москва,\n'))
+        self.assertEqual(df['area_name'].dtype, 'category')
+        self.assertNotEqual(df['name'].dtype, 'category')
+        np.testing.assert_array_equal(categories.map_codes(df['salary_currency'], {'RUR': 1}), [1, np.nan])
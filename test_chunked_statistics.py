@@ -0,0 +1,69 @@
+import contextlib
+import io
+import unittest
+import numpy as np
+import pandas as pd
+import cli
+import salary_distribution
+
+task = cli.load_script('task3.4.2.py', 'task3_4_2')
+
+
+class ChunkedStatisticsTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        rows = 3000
+        names = np.array(['Программист Python', 'Аналитик', 'Программист', 'Тестировщик', 'Старший аналитик',
+                          'Инженер-программист'])
+        salary = rng.uniform(10000, 300000, rows)
+        salary[rng.random(rows) < 0.2] = np.nan
+        self.df = pd.DataFrame({'name': rng.choice(names, rows), 'salary': salary,
+                                'area_name': pd.Series(rng.choice(['Москва', 'Казань', 'Уфа', 'Омск', 'Сочи'], rows,
+                                                                  p=[0.5, 0.3, 0.15, 0.045, 0.005]), dtype='category'),
+                                'published_at': rng.choice(['2020', '2021', '2022', '2019'], rows)})
+
+    def chunks(self, size):
+        return [self.df.iloc[start:start + size].reset_index(drop=True) for start in range(0, len(self.df), size)]
+
+    def test_matches_multi_statistics(self):
+        jobs = ['Программист', 'Аналитик', 'Дизайнер']
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = task.get_multi_statistics(self.df, jobs)
+        for size in (1, 250, 1000, len(self.df)):
+            self.assertEqual(task.get_chunked_statistics(self.chunks(size), jobs), expected)
+
+    def test_matches_statistics(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = task.get_statistics(self.df, 'Программист|аналитик')
+        result = task.get_chunked_statistics(self.chunks(700), ['Программист|аналитик'], regex=True)
+        self.assertEqual(result['Программист|аналитик'], expected)
+
+    def test_regex_multi_statistics(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = task.get_statistics(self.df, 'Программист|аналитик')
+            result = task.get_multi_statistics(self.df, ['Программист|аналитик'], regex=True)
+            literal = task.get_multi_statistics(self.df, ['Программист|аналитик'])
+        self.assertEqual(result['Программист|аналитик'], expected)
+        self.assertEqual(sum(literal['Программист|аналитик'][3].values()), 0)
+
+    def test_distribution(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = task.get_multi_statistics(self.df, ['Программист'], distribution=True)['Программист']
+        result = task.get_chunked_statistics(self.chunks(400), ['Программист'], distribution=True)['Программист']
+        self.assertEqual(result[:6], expected[:6])
+        for part in ('years', 'cities'):
+            self.assertEqual(list(result[6][part]), list(expected[6][part]))
+            for key, row in expected[6][part].items():
+                self.assertEqual(result[6][part][key]['histogram'], row['histogram'])
+                # Квантили скетча отличаются от точных не больше, чем на несколько процентов
+                np.testing.assert_allclose(result[6][part][key]['quantiles'], row['quantiles'], rtol=0.1)
+        # В таблицах отчета квантили скетча помечены как приближенные, точные - нет
+        (_, heads, rows), _ = salary_distribution.tables(result[6])
+        self.assertEqual(heads[-1], salary_distribution.RANK_ERROR_HEAD)
+        self.assertTrue(all(str(value).startswith('≈') for value in rows[0][1:4]))
+        self.assertTrue(rows[0][-1].startswith('±'))
+        self.assertEqual(salary_distribution.tables(expected[6])[0][1], salary_distribution.heads('Год'))
+
+
+if __name__ == '__main__':
+    unittest.main()
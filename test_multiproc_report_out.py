@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import report_out
+import report_out_old
+from multiproc_report_out import MultiInputConnect
+
+
+class MultiInputConnectTests(unittest.TestCase):
+    def test_matches_report_out_old(self):
+        rng = np.random.default_rng(7)
+        rows = 2000
+        salary_from = rng.integers(1000, 200000, rows).astype(float)
+        salary_from[rng.random(rows) < 0.1] = np.nan
+        df = pd.DataFrame({'name': rng.choice(['Программист Python', 'Аналитик', 'Тестировщик', 'Программист'], rows),
+                           'salary_from': salary_from,
+                           'salary_to': salary_from + rng.integers(0, 50000, rows),
+                           'salary_currency': rng.choice(['RUR', 'USD', 'KZT', 'EUR'], rows, p=[0.7, 0.1, 0.1, 0.1]),
+                           'area_name': rng.choice(['Москва', 'Казань', 'Уфа', 'Омск', 'Пермь'], rows,
+                                                   p=[0.4, 0.3, 0.2, 0.095, 0.005]),
+                           'published_at': [f'{year}-0{month}-01T10:00:00+0300' for year, month in
+                                            zip(rng.choice([2018, 2019, 2021], rows), rng.integers(1, 10, rows))]})
+        start_dir = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                df.to_csv('vacancies.csv', index=False)
+                report_out.InputConnect.split_data(pd.read_csv('vacancies.csv'))
+                vacancies = report_out_old.DataSet('vacancies.csv').vacancies_objects
+                expected = report_out_old.InputConnect.get_multi_statistics(vacancies, ['Программист', 'Аналитик'])
+                for processes, chunksize in ((1, None), (2, 1), (2, 3)):
+                    engine = MultiInputConnect('csv_files', processes, chunksize)
+                    self.assertEqual(engine.get_multi_statistics(['Программист', 'Аналитик']), expected)
+            finally:
+                os.chdir(start_dir)
+        self.assertEqual(expected['Программист'][1][2020], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+from name_index import NameIndex
+
+names = ['Python разработчик', 'Разработчик Java', 'Java Developer', 'Python разработчик', 'Аналитик', 'QA']
+
+
+class SearchTests(unittest.TestCase):
+    def test_substring(self):
+        index = NameIndex(names)
+        for query in ['Java', 'разработчик', 'Python разработчик', 'QA', 'Go', 'тик', '']:
+            self.assertEqual(index.search(query), [i for i, name in enumerate(names) if query in name])
+
+    def test_missing_names(self):
+        index = NameIndex(['Аналитик', float('nan'), None, 'Аналитик данных'])
+        self.assertEqual(index.search('Аналитик'), [0, 3])
+        self.assertEqual(index.names, ['Аналитик', '', 'Аналитик данных'])
+
+    def test_token(self):
+        index = NameIndex(names)
+        self.assertEqual(index.search_token('JAVA'), [1, 2])
+
+
+class PersistTests(unittest.TestCase):
+    def test_for_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            with open(file_name, 'w', encoding='utf-8') as file:
+                file.write('name\n' + '\n'.join(names))
+            NameIndex.for_file(file_name, names)
+            self.assertTrue(os.path.exists(NameIndex.index_path(file_name)))
+            self.assertEqual(NameIndex.load(file_name, len(names)).search('Java'), [1, 2])
+            self.assertIsNone(NameIndex.load(file_name, len(names) + 1))
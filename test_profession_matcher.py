@@ -0,0 +1,31 @@
+import unittest
+from profession_matcher import ProfessionMatcher
+
+
+class FindTests(unittest.TestCase):
+    def test_overlapping(self):
+        matcher = ProfessionMatcher(['программист', 'Python программист', 'Python'])
+        self.assertEqual(matcher.find('Ведущий Python программист'), [0, 1, 2])
+
+    def test_case_sensitive(self):
+        matcher = ProfessionMatcher(['Аналитик'])
+        self.assertEqual(matcher.find('Системный аналитик'), [])
+
+    def test_same_as_substring(self):
+        professions = ['he', 'she', 'his', 'hers', 'аналитик', 'тик']
+        names = ['ushers', 'ahishers', 'Бизнес-аналитик', 'Логистик', '']
+        matcher = ProfessionMatcher(professions)
+        for name in names:
+            expected = [i for i, profession in enumerate(professions) if profession in name]
+            self.assertEqual(matcher.find(name), expected)
+
+    def test_match_pairs(self):
+        matcher = ProfessionMatcher(['Java', 'Developer'])
+        self.assertEqual(matcher.match_pairs(['Java Developer', 'Дизайнер', 'Developer']),
+                         ([0, 0, 2], [0, 1, 1]))
+
+    def test_cache_is_bounded(self):
+        matcher = ProfessionMatcher(['Java'], cache_size=3)
+        for i in range(10):
+            self.assertEqual(matcher.find(f'Java {i}'), [0])
+        self.assertEqual(matcher._cache.cache_info().currsize, 3)
@@ -0,0 +1,34 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import profiling
+
+
+@profiling.profiled('test', 'aggregate', rows_arg=0)
+def total(values):
+    return sum(values)
+
+
+class StageTests(unittest.TestCase):
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, {profiling.ENV_LOG: ''}):
+            with profiling.stage('test', 'read', 10) as stage:
+                stage.rows = 20
+            self.assertFalse(profiling.enabled())
+
+    def test_log(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log = os.path.join(directory, 'profile.jsonl')
+            with mock.patch.dict(os.environ):
+                profiling.configure(log)
+                with profiling.stage('test', 'read') as stage:
+                    stage.rows = 5
+                self.assertEqual(total([1, 2, 3]), 6)
+            with open(log, encoding='utf-8') as file:
+                records = [json.loads(line) for line in file]
+        self.assertEqual([(x['pipeline'], x['stage'], x['rows']) for x in records],
+                         [('test', 'read', 5), ('test', 'aggregate', 3)])
+        self.assertIn('peak_rss_mb', records[0])
+        self.assertNotIn('cprofile', records[0])
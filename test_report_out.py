@@ -0,0 +1,93 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import report_out
+
+
+class SalaryKernelTests(unittest.TestCase):
+    def test_matches_row_mean(self):
+        rng = np.random.default_rng(2)
+        salary_from = rng.uniform(1000, 300000, 2000)
+        salary_to = salary_from * rng.uniform(1, 2, 2000)
+        salary_from[rng.random(2000) < 0.3] = np.nan
+        salary_to[rng.random(2000) < 0.3] = np.nan
+        currency = pd.Series(rng.choice(['RUR', 'USD', 'KZT', 'XXX'], 2000), dtype='category')
+        rates = report_out.categories.map_codes(currency, report_out.currency_to_rub)
+
+        df = pd.DataFrame({'salary_from': rates * salary_from, 'salary_to': rates * salary_to})
+        expected = df[['salary_from', 'salary_to']].mean(axis=1)
+        salary = report_out.salary_midpoints(salary_from, salary_to, rates)
+        np.testing.assert_array_equal(salary, expected.to_numpy())
+        self.assertEqual(report_out.nan_mean(salary), expected.mean())
+        self.assertTrue(np.isnan(report_out.nan_mean(np.array([np.nan]))))
+
+    def test_prepare_data_matches_pandas(self):
+        df = pd.DataFrame({'name': ['Программист', 'Аналитик', 'Программист Java', 'Тестировщик'],
+                           'salary_from': [10000.0, np.nan, 300.0, np.nan],
+                           'salary_to': [20000.0, 50000.0, np.nan, np.nan],
+                           'salary_currency': ['RUR', 'RUR', 'USD', 'EUR'],
+                           'area_name': ['Москва'] * 4, 'published_at': [2020] * 4})
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'part_2020.csv')
+            df.to_csv(file_name, index=False)
+            result = report_out.new_prepare_data((file_name, 'Программист'))
+        rates = df['salary_currency'].map(report_out.currency_to_rub)
+        df['salary'] = pd.DataFrame({'from': rates * df['salary_from'], 'to': rates * df['salary_to']}).mean(axis=1)
+        job_salary = df.loc[df['name'].str.contains('Программист'), 'salary']
+        self.assertEqual(result, [2020, int(df['salary'].mean()), 4, int(job_salary.mean()), len(job_salary)])
+
+
+class QueryTests(unittest.TestCase):
+    def setUp(self):
+        self.start_dir = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        rng = np.random.default_rng(4)
+        self.df = pd.DataFrame({'name': rng.choice(['Программист', 'Аналитик'], 600),
+                                'salary_from': rng.uniform(1000, 90000, 600), 'salary_to': np.nan,
+                                'salary_currency': rng.choice(['RUR', 'USD'], 600),
+                                'area_name': rng.choice(['Москва', 'Казань', 'Уфа'], 600),
+                                'published_at': [f'{year}-03-01T10:00:00+0300'
+                                                 for year in rng.integers(2015, 2021, 600)]})
+        self.df.to_csv('vacancies.csv', index=False)
+
+    def tearDown(self):
+        os.chdir(self.start_dir)
+        self.directory.cleanup()
+
+    def statistics(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            report_out.InputConnect(*args)
+        return output.getvalue().splitlines()[:-1]
+
+    def test_read_vacancies(self):
+        df = report_out.read_vacancies('vacancies.csv', (2016, None), ['Москва', 'Уфа'], chunksize=100)
+        years = self.df['published_at'].str[:4].astype(int)
+        expected = self.df[(years >= 2016) & self.df['area_name'].isin(['Москва', 'Уфа'])]
+        self.assertEqual(df['published_at'].tolist(), expected['published_at'].tolist())
+        self.assertIsInstance(df['area_name'].dtype, pd.CategoricalDtype)
+        self.assertIs(report_out.select_rows(df), df)
+
+    def test_query_matches_filtered_file(self):
+        # Файлы годов из прошлого запуска не попадают в статистику другого диапазона
+        self.statistics(('vacancies.csv', 'Программист'))
+        result = self.statistics(('vacancies.csv', 'Программист'), None, None, (2016, 2018), ['Казань'])
+        self.assertEqual(report_out.partition_files('csv_files', [2016, 2018, 2030]),
+                         [os.path.join('csv_files', 'part_2016.csv'), os.path.join('csv_files', 'part_2018.csv')])
+        years = self.df['published_at'].str[:4].astype(int)
+        self.df[years.between(2016, 2018) & (self.df['area_name'] == 'Казань')].to_csv('filtered.csv', index=False)
+        self.assertEqual(result, self.statistics(('filtered.csv', 'Программист')))
+        self.assertIn("{'Казань': 1.0}", result[-1])
+
+    def test_empty_query(self):
+        result = self.statistics(('vacancies.csv', 'Программист'), None, None, (2030, None))
+        self.assertEqual(result[0], 'Динамика уровня зарплат по годам: {}')
+
+
+if __name__ == '__main__':
+    unittest.main()
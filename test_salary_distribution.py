@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from openpyxl import load_workbook
+import report_out_old
+import report_render
+import salary_distribution
+
+
+class SalaryDistributionTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.salary = rng.lognormal(11, 0.6, 5000)
+        self.salary[rng.random(5000) < 0.05] = np.nan
+        self.years = rng.integers(0, 4, 5000)
+        self.cities = rng.integers(-1, 6, 5000)
+
+    def test_matches_sorted_groups(self):
+        result = salary_distribution.compute(self.years, [2019, 2020, 2021, 2022], self.cities,
+                                             ['Москва', 'Казань', 'Уфа', 'Омск', 'Сочи', 'Пермь'], self.salary,
+                                             ['Казань', 'Москва', 'Тверь'])
+        self.assertEqual(list(result['cities']), ['Казань', 'Москва', 'Тверь'])
+        for key, rows in ((2021, self.years == 2), ('Казань', self.cities == 1)):
+            part = 'years' if key == 2021 else 'cities'
+            values = np.sort(self.salary[rows & ~np.isnan(self.salary)])
+            expected = [int(values[int(np.ceil(probability * len(values))) - 1]) for probability in (0.1, 0.5, 0.9)]
+            self.assertEqual(result[part][key]['quantiles'], expected)
+            counts = np.histogram(values, list(salary_distribution.SALARY_EDGES) + [np.inf])[0]
+            self.assertEqual(result[part][key]['histogram'], counts.tolist())
+        self.assertEqual(result['cities']['Тверь'], {'quantiles': [0, 0, 0],
+                                                     'histogram': [0] * len(salary_distribution.SALARY_EDGES)})
+
+    def test_report_tables(self):
+        result = salary_distribution.compute(self.years, [2019, 2020, 2021, 2022], self.cities,
+                                             ['Москва', 'Казань', 'Уфа', 'Омск', 'Сочи', 'Пермь'], self.salary,
+                                             ['Москва'])
+        data_list = [{2019: 1}, {2019: 2}, {2019: 3}, {2019: 4}, {'Москва': 5}, {'Москва': 0.5}]
+        self.assertNotIn('Распределение', report_render.render_html(data_list, 'Программист'))
+        html = report_render.render_html(data_list + [result], 'Программист')
+        self.assertIn('Распределение по городам', html)
+        self.assertIn(f'<td>{result["cities"]["Москва"]["quantiles"][1]}</td>', html)
+
+
+    def test_combined_html_report(self):
+        data_list = [{2019: 1}, {2019: 2}, {2019: 3}, {2019: 4}, {'Москва': 5}, {'Москва': 0.5}]
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'reports.html')
+            report_render.save_reports([(data_list, 'Программист'), (data_list, 'Аналитик')], output)
+            with open(output, encoding='utf-8') as file:
+                html = file.read()
+        self.assertEqual((html.count('<!DOCTYPE html>'), html.count('<body>'), html.count('</html>')), (1, 1, 1))
+        self.assertEqual(html.count('page-break-before'), 1)
+        self.assertLess(html.index('профессии Программист'), html.index('профессии Аналитик'))
+
+    def test_excel_reports_use_separate_files(self):
+        result = salary_distribution.compute(self.years, [2019, 2020, 2021, 2022], self.cities,
+                                             ['Москва', 'Казань', 'Уфа', 'Омск', 'Сочи', 'Пермь'], self.salary,
+                                             ['Москва'])
+        data_list = [{2019: 1}, {2019: 2}, {2019: 3}, {2019: 4}, {'Москва': 5}, {'Москва': 0.5}, result]
+        start_dir = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                report_out_old.Report.render(data_list, 'Программист', ('xlsx', 'xlsx_stream'))
+                self.assertEqual(load_workbook('report.xlsx').sheetnames,
+                                 load_workbook('report_stream.xlsx').sheetnames)
+            finally:
+                os.chdir(start_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -139,3 +139,10 @@ class SortTests(unittest.TestCase):
                        'salary_from': '40000 - 80000 (Рубли) (С вычетом налогов)', 'area_name': 'Санкт-Петербург',
                        'published_at': '2022-05-31T17:44:23+0300'}]
         self.assertEqual(table_out.InputConnect.do_sort(first_list, sort, reverse), equal_data)
+
+
+class ImportTests(unittest.TestCase):
+    def test_modes_do_not_load_heavy_libraries(self):
+        from benchmarks import import_time
+        for mode, libraries in import_time.FORBIDDEN.items():
+            self.assertEqual(import_time.loaded_modules(import_time.MODES[mode], libraries), [], mode)
@@ -0,0 +1,62 @@
+import contextlib
+import csv
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import table_out
+import table_session
+from test_vacancy_store import COLUMNS, ROWS
+
+
+class QueryCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = table_session.QueryCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(list(cache.items), ['a', 'c'])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class SessionTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.directory, 'vacancies.csv')
+        with open(self.file_name, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            writer.writerows(ROWS)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_pages_match_print_vacancies(self):
+        session = table_session.Session(self.file_name)
+        data_set = table_out.DataSet(self.file_name)
+        for page in (['1', '2'], ['3', '4']):
+            expected = io.StringIO()
+            with contextlib.redirect_stdout(expected):
+                table_out.InputConnect.print_vacancies(data_set, '', 'Оклад', 'Да', list(page), ['Название'])
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                session.run({'sort': 'Оклад', 'reverse': 'Да', 'range': page, 'fields': 'Название'})
+            self.assertEqual(output.getvalue(), expected.getvalue())
+        self.assertEqual((session.cache.hits, session.cache.misses), (1, 1))
+
+    def test_errors_keep_session(self):
+        session = table_session.Session(self.file_name)
+        lines = iter(['{"filter": "Название: нет такой"}', 'не json', '{"filter": "Компания: Сбер"}', 'выход'])
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            session.loop(lambda prompt: next(lines))
+        self.assertIn('Ничего не найдено', output.getvalue())
+        self.assertIn('Некорректный запрос', output.getvalue())
+        self.assertIn('Казань', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import pandas as pd
+import task3_3_2
+
+
+class ConvertChunksTests(unittest.TestCase):
+    def setUp(self):
+        self.start_dir = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        pd.DataFrame({'date': ['2022-04', '2022-05'], 'USD': [80.0, 70.0], 'EUR': [90.0, 75.0]}).to_csv(
+            task3_3_2.CURRENCY_FILE, index=False)
+        pd.DataFrame({'name': ['Программист', 'Аналитик', 'Тестировщик', 'Инженер', 'Менеджер'],
+                      'description': ['Текст'] * 5,
+                      'salary_from': [100.0, None, 1000.0, 50000.0, None],
+                      'salary_to': [200.0, 3000.0, None, 70000.0, None],
+                      'salary_currency': ['USD', 'EUR', 'USD', 'RUR', 'RUR'],
+                      'area_name': ['Москва', 'Казань', 'Москва', 'Уфа', 'Москва'],
+                      'published_at': ['2022-04-02T04:51:11+0300', '2022-05-14T16:31:50+0300',
+                                       '2022-05-01T10:00:00+0300', '2022-04-30T23:59:59+0300',
+                                       '2022-05-31T17:32:31+0300']}).to_csv('source.csv', index=False)
+
+    def tearDown(self):
+        os.chdir(self.start_dir)
+        self.directory.cleanup()
+
+    def convert(self, chunksize=None, cache=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return list(task3_3_2.convert_chunks('source.csv', chunksize, cache))
+
+    def test_chunks_match_whole_file(self):
+        [whole] = self.convert()
+        self.assertEqual(list(whole.columns), ['name', 'salary', 'area_name', 'published_at'])
+        self.assertEqual(whole['salary'].tolist()[:4], [12000.0, 225000.0, 70000.0, 60000.0])
+        chunks = pd.concat(self.convert(chunksize=2), ignore_index=True)
+        pd.testing.assert_frame_equal(chunks.astype({'area_name': str}), whole.astype({'area_name': str}))
+        self.assertEqual(os.listdir('.').count('vacancies_new.csv'), 0)
+
+    def test_cache_is_opt_in(self):
+        [whole] = self.convert(chunksize=None, cache='cache.csv')
+        self.assertTrue(task3_3_2.cache_is_fresh('cache.csv', 'source.csv'))
+        pd.testing.assert_frame_equal(pd.read_csv('cache.csv'), pd.read_csv(io.StringIO(whole.to_csv(index=False))))
+        self.assertEqual(sorted(os.listdir('.')), ['Currency_data.csv', 'cache.csv', 'source.csv'])
+
+        source_time = os.path.getmtime('cache.csv') + 10
+        os.utime('source.csv', (source_time, source_time))
+        self.assertFalse(task3_3_2.cache_is_fresh('cache.csv', 'source.csv'))
+        self.assertFalse(task3_3_2.cache_is_fresh('missing.csv', 'source.csv'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import timestamps
+from task3_3_2 import rate_lookup
+
+dates = ['2007-12-03T17:34:36+0300', '2022-07-01T00:00:00+0500', '2000-02-29T23:59:59-0530',
+         '1970-01-01T00:00:00+0000', '2016-01-01T01:00:00+0300']
+
+
+class ParseTests(unittest.TestCase):
+    def test_parse(self):
+        for line in dates:
+            moment = datetime.strptime(line, '%Y-%m-%dT%H:%M:%S%z')
+            self.assertEqual(timestamps.parse(line),
+                             (int(moment.timestamp()), moment.year, moment.year * 12 + moment.month - 1))
+            self.assertEqual(timestamps.display_date(line[:10]), moment.strftime('%d.%m.%Y'))
+
+    def test_column(self):
+        expected = np.array([timestamps.parse(line) for line in dates])
+        for values in (pd.Series(dates), np.array(dates, dtype=object)):
+            self.assertTrue((np.column_stack(timestamps.parse_column(values)) == expected).all())
+
+    def test_column_fallback(self):
+        # Строка длиннее формата разбирается построчно
+        epoch, year, month = timestamps.parse_column(pd.Series(dates + ['2007-12-03T17:34:36+0300 ']))
+        self.assertEqual(list(year), [2007, 2022, 2000, 1970, 2016, 2007])
+        self.assertEqual(epoch[-1], epoch[0])
+
+    def test_year_column(self):
+        self.assertEqual(list(timestamps.year_column(pd.Series(dates))), [2007, 2022, 2000, 1970, 2016])
+        self.assertEqual(list(timestamps.year_column(np.array(['2016-01-01', '1999'], dtype=object))), [2016, 1999])
+
+
+class RateTests(unittest.TestCase):
+    def test_lookup(self):
+        currency_data = pd.DataFrame({'USD': [30.0, 31.0], 'EUR': [40.0, np.nan]}, index=['2007-11', '2007-12'])
+        months = np.array([timestamps.month_index(key) for key in ['2007-12', '2007-11', '2007-12', '2008-01']])
+        rates = rate_lookup(currency_data, months, pd.Series(['USD', 'EUR', 'EUR', 'USD']))
+        np.testing.assert_array_equal(rates, [31.0, 40.0, np.nan, np.nan])
@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+import vacancy_schema
+
+
+class VacancySchemaTests(unittest.TestCase):
+    def test_reads_consumer_columns(self):
+        df = pd.DataFrame({'name': ['Программист', 'Аналитик'], 'description': ['<p>Текст</p>', 'Текст'],
+                           'key_skills': ['Python', 'SQL'], 'salary_from': [100, None], 'salary_to': [200, 300],
+                           'salary_currency': ['RUR', 'USD'], 'area_name': ['Москва', 'Казань'],
+                           'published_at': ['2022-05-31T17:32:31+0300', '2021-03-01T10:00:00+0300']})
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'vacancies.csv')
+            df.to_csv(file_name, index=False)
+            result = vacancy_schema.read_csv(file_name, 'report_out')
+            chunks = list(vacancy_schema.read_csv(file_name, 'report_out', chunksize=1))
+        self.assertEqual(list(result.columns), vacancy_schema.STATISTICS_COLUMNS)
+        self.assertEqual(result['salary_from'].dtype, 'float64')
+        self.assertEqual(result['salary_to'].dtype, 'float64')
+        self.assertEqual(result['area_name'].dtype, 'category')
+        self.assertEqual(result['salary_currency'].tolist(), ['RUR', 'USD'])
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 2)
+
+    def test_consumers_read_known_columns(self):
+        for consumer in vacancy_schema.CONSUMER_COLUMNS:
+            self.assertLessEqual(set(vacancy_schema.dtypes(consumer)), set(vacancy_schema.CONSUMER_COLUMNS[consumer]))
+        self.assertEqual(vacancy_schema.dtypes('partition')['name'], 'category')
+        self.assertIn(vacancy_schema.engine(), ('c', 'pyarrow'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import contextlib
+import csv
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import table_out
+from vacancy_store import VacancyStore
+
+COLUMNS = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+           'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+ROWS = [
+    ['Программист Python', '<p>Разработка</p>', 'Python\nGit', 'between1And3', 'False', 'Яндекс', '80000.0',
+     '120000.0', 'True', 'RUR', 'Москва', '2022-05-31T17:32:31+0300'],
+    ['Аналитик', 'Анализ данных', 'SQL', 'noExperience', 'True', 'Тинькофф', '1000.0', '2000.0', 'False', 'USD',
+     'Санкт-Петербург', '2021-03-01T10:00:00+0300'],
+    ['Тестировщик', 'Тестирование', 'Git\nLinux\nPython', 'between1And3', 'False', 'Яндекс', '50000.0', '90000.0',
+     'True', 'RUR', 'Москва', '2022-05-31T09:00:00+0300'],
+    ['Программист Python', 'Поддержка', 'Python', 'moreThan6', 'False', 'Сбер', '100000.0', '100000.0', 'True',
+     'EUR', 'Казань', '2020-12-31T23:59:59+0300'],
+]
+
+
+class VacancyStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.directory, 'vacancies.csv')
+        with open(self.file_name, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            writer.writerows(ROWS)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def print_table(self, data_set, *params):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            table_out.InputConnect.print_vacancies(data_set, *params[:3], list(params[3]), list(params[4]))
+        return output.getvalue()
+
+    def test_rows_match_csv_filter(self):
+        store = table_out.DataSet(self.file_name, use_store=True).store
+        rows = table_out.DataSet.load_rows(self.file_name)[0]
+        self.assertEqual([store.row(i) for i in range(store.row_count)], rows)
+        self.assertIn('salary_currency', store.dictionaries)
+        np.testing.assert_array_equal(store.equal_rows('name', 'Программист Python'), [0, 3])
+        np.testing.assert_array_equal(store.code_rows('area_name', ['Москва', 'Казань']), [0, 2, 3])
+        np.testing.assert_array_equal(store.list_rows('key_skills', ['Python', 'Git']), [0, 2])
+        np.testing.assert_array_equal(store.postings('published_day', 20220531), [0, 2])
+        np.testing.assert_array_equal(store.rank('name'), [1, 0, 2, 1])
+
+    def test_interval_rows(self):
+        rng = np.random.default_rng(3)
+        starts = rng.integers(0, 1000, 5000)
+        ends = starts + rng.integers(-50, 300, 5000)
+        VacancyStore.write_intervals(self.directory, 'salary', starts, ends)
+        store = VacancyStore.__new__(VacancyStore)
+        store.path = self.directory
+        for point in (-1, 0, 1, 17, 500, 999, 1100, 1400):
+            np.testing.assert_array_equal(store.interval_rows('salary', point),
+                                          np.flatnonzero((starts <= point) & (point <= ends)))
+
+    def test_load_checks_source(self):
+        table_out.DataSet(self.file_name, use_store=True)
+        self.assertIsNotNone(VacancyStore.load(self.file_name))
+        with open(self.file_name, 'a', encoding='utf-8') as file:
+            file.write('\n')
+        self.assertIsNone(VacancyStore.load(self.file_name))
+
+    def test_queries_match_objects(self):
+        objects = table_out.DataSet(self.file_name)
+        stored = table_out.DataSet(self.file_name, use_store=True)
+        queries = [('', '', '', [], ['']),
+                   ('Навыки: Python, Git', 'Оклад', 'Да', [], ['']),
+                   ('Опыт работы: От 1 года до 3 лет', 'Название', '', ['2'], ['']),
+                   ('Идентификатор валюты оклада: Рубли', 'Дата публикации вакансии', 'Да', [], ['Название']),
+                   ('Дата публикации вакансии: 31.05.2022', 'Навыки', '', ['1', '2'], ['']),
+                   ('Компания: Яндекс', 'Опыт работы', 'Да', [], ['']),
+                   ('Оклад: 1500', 'Компания', '', [], [''])]
+        for query in queries:
+            self.assertEqual(self.print_table(stored, *query), self.print_table(objects, *query))
+
+    def test_pages_follow_cursor(self):
+        stored = table_out.DataSet(self.file_name, use_store=True)
+
+        def pages(cursor, count):
+            output, errors = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+                table_out.InputConnect.print_pages(stored, '', 'Оклад', 'Да', 1, ['Название'], 'jsonl', cursor, count)
+            token = errors.getvalue().split(': ')[-1].strip() or None
+            return output.getvalue(), token
+
+        everything, token = pages(None, None)
+        self.assertIsNone(token)
+        walked, token = pages(None, 1)
+        while token:
+            page, token = pages(token, 1)
+            walked += page
+        self.assertEqual(walked, everything)
+        self.assertEqual(len(everything.splitlines()), len(ROWS))
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            table_out.InputConnect.print_pages(stored, '', 'Название', '', 2, [''], 'table', None, 1)
+        self.assertEqual(output.getvalue(), self.print_table(stored, '', 'Название', '', ['1', '3'], ['']))
+
+    def test_rejects_foreign_cursor(self):
+        stored = table_out.DataSet(self.file_name, use_store=True)
+        objects = table_out.DataSet(self.file_name)
+
+        def fail(data_set, cursor, sort='Оклад'):
+            output, errors = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors), \
+                    self.assertRaises(SystemExit):
+                table_out.InputConnect.print_pages(data_set, '', sort, '', 1, [''], 'jsonl', cursor, 1)
+            return output.getvalue().strip()
+
+        prefix = table_out.InputConnect.query_hash('', 'Оклад', '')
+        self.assertEqual(fail(stored, 'abc'), 'Некорректный курсор')
+        self.assertEqual(fail(stored, f'{prefix}:abc'), 'Некорректный курсор')
+        self.assertEqual(fail(objects, f'{prefix}:5.0:3'), 'Некорректный курсор')
+        self.assertEqual(fail(stored, f'{prefix}:5.0:3', 'Название'), 'Курсор получен для другого запроса')
+
+    def test_unsupported_filter_uses_objects(self):
+        stored = table_out.DataSet(self.file_name, use_store=True)
+        self.assertIsNone(table_out.InputConnect.store_filter(stored.store, 'Оклад указан до вычета налогов: Да'))
+        self.assertEqual(len(stored.vacancies_objects), len(ROWS))
+
+
+if __name__ == '__main__':
+    unittest.main()
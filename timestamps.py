@@ -0,0 +1,204 @@
+"""
+Модуль разбирает дату публикации вакансии вида 2007-12-03T17:34:36+0300.
+
+Из даты получаются три значения: время в секундах от начала эпохи (UTC), год и
+номер месяца year * 12 + month - 1, по которому удобно искать курс валюты.
+Для объектов Vacancy дата разбирается один раз при загрузке, разбор дня
+кэшируется, поэтому строки одного дня не разбираются заново. Для таблиц pandas
+колонки считаются векторно по символам строк фиксированной ширины (numpy
+импортируется только в этих функциях)
+"""
+
+import datetime
+import functools
+
+DATE_LENGTH = len('2007-12-03T17:34:36+0300')
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+@functools.lru_cache(maxsize=None)
+def parse_day(day):
+    """
+    Функция разбирает дату без времени
+
+    Args:
+        day (str): Дата вида 2007-12-03
+
+    Returns:
+        (int, int, int): Начало дня в секундах от начала эпохи, год и номер месяца
+
+    >>> parse_day('1970-01-02')
+    (86400, 1970, 23640)
+    """
+    year, month, date = int(day[:4]), int(day[5:7]), int(day[8:10])
+    return (datetime.date(year, month, date).toordinal() - EPOCH_ORDINAL) * 86400, year, year * 12 + month - 1
+
+
+def parse(line):
+    """
+    Функция разбирает дату публикации
+
+    Args:
+        line (str): Дата вида 2007-12-03T17:34:36+0300
+
+    Returns:
+        (int, int, int): Время в секундах от начала эпохи, год и номер месяца
+
+    >>> parse('2007-12-03T17:34:36+0300')
+    (1196692476, 2007, 24095)
+    """
+    day_seconds, year, month_index = parse_day(line[:10])
+    offset = int(line[20:22]) * 3600 + int(line[22:24]) * 60
+    if line[19] == '-':
+        offset = -offset
+    return day_seconds + int(line[11:13]) * 3600 + int(line[14:16]) * 60 + int(line[17:19]) - offset, \
+        year, month_index
+
+
+def year(line):
+    """
+    Функция возвращает год публикации
+
+    Args:
+        line (str): Дата публикации
+
+    Returns:
+        (int): Год
+
+    >>> year('2007-12-03T17:34:36+0300')
+    2007
+    """
+    return parse_day(line[:10])[1]
+
+
+@functools.lru_cache(maxsize=None)
+def display_date(day):
+    """
+    Функция переводит дату в формат для печати
+
+    Args:
+        day (str): Дата публикации или ее первые 10 символов
+
+    Returns:
+        (str): Дата вида 03.12.2007
+
+    >>> display_date('2007-12-03T17:34:36+0300'[:10])
+    '03.12.2007'
+    """
+    return f'{day[8:10]}.{day[5:7]}.{day[:4]}'
+
+
+def month_key(month_index):
+    """
+    Функция переводит номер месяца в ключ вида 2007-12, как в Currency_data.csv
+
+    Args:
+        month_index (int): Номер месяца
+
+    Returns:
+        (str): Год и месяц
+
+    >>> month_key(24095)
+    '2007-12'
+    """
+    return f'{month_index // 12}-{month_index % 12 + 1:02}'
+
+
+def month_index(key):
+    """
+    Функция переводит ключ вида 2007-12 в номер месяца
+
+    Args:
+        key (str): Год и месяц
+
+    Returns:
+        (int): Номер месяца
+
+    >>> month_index('2007-12')
+    24095
+    """
+    return int(key[:4]) * 12 + int(key[5:7]) - 1
+
+
+def parse_column(values):
+    """
+    Функция векторно разбирает колонку дат. Если хотя бы одна дата не в формате
+    фиксированной ширины, колонка разбирается построчно функцией parse
+
+    Args:
+        values (Series or ndarray): Даты публикации
+
+    Returns:
+        (ndarray, ndarray, ndarray): Время в секундах от начала эпохи, год и номер месяца
+    """
+    import numpy as np
+    values = np.asarray(values)
+    if len(values) == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int64)
+    chars = values.astype(f'U{DATE_LENGTH + 1}').view(np.uint32).reshape(len(values), DATE_LENGTH + 1)
+    digits = chars.astype(np.int64) - ord('0')
+    digit_columns = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 20, 21, 22, 23]
+    fixed_width = (chars[:, DATE_LENGTH] == 0).all() and (chars[:, DATE_LENGTH - 1] != 0).all()
+    if not fixed_width or not ((digits[:, digit_columns] >= 0) & (digits[:, digit_columns] <= 9)).all():
+        parsed = np.array([parse(line) for line in values], dtype=np.int64).reshape(-1, 3)
+        return parsed[:, 0], parsed[:, 1], parsed[:, 2]
+
+    def number(start, width):
+        result = digits[:, start]
+        for i in range(start + 1, start + width):
+            result = result * 10 + digits[:, i]
+        return result
+
+    years, months, days = number(0, 4), number(5, 2), number(8, 2)
+    # Количество дней от 1970-01-01 по алгоритму days_from_civil (Howard Hinnant)
+    shifted_year = years - (months <= 2)
+    era = shifted_year // 400
+    year_of_era = shifted_year - era * 400
+    day_of_year = (153 * (months + np.where(months > 2, -3, 9)) + 2) // 5 + days - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    epoch_days = era * 146097 + day_of_era - 719468
+
+    offset = number(20, 2) * 3600 + number(22, 2) * 60
+    offset = np.where(chars[:, 19] == ord('-'), -offset, offset)
+    seconds = epoch_days * 86400 + number(11, 2) * 3600 + number(14, 2) * 60 + number(17, 2) - offset
+    return seconds, years, years * 12 + months - 1
+
+
+def year_column(values):
+    """
+    Функция векторно получает год из колонки дат по первым четырем символам. Если
+    хотя бы одна дата начинается не с года, колонка разбирается parse_column
+
+    Args:
+        values (Series or ndarray): Даты публикации
+
+    Returns:
+        (ndarray): Год
+
+    >>> import numpy as np
+    >>> year_column(np.array(['2007-12-03T17:34:36+0300', '2022-01-01T00:00:00+0300'], dtype=object))
+    array([2007, 2022])
+    """
+    import numpy as np
+    values = np.asarray(values)
+    if len(values) == 0:
+        return np.empty(0, np.int64)
+    digits = values.astype('U4').view(np.uint32).reshape(len(values), 4).astype(np.int64) - ord('0')
+    if not ((digits >= 0) & (digits <= 9)).all():
+        return parse_column(values)[1]
+    return digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+
+
+def add_columns(df, column='published_at'):
+    """
+    Функция добавляет в таблицу колонки published_epoch, published_year и published_month
+
+    Args:
+        df (DataFrame): Таблица вакансий
+        column (str): Колонка с датой публикации
+
+    Returns:
+        (DataFrame): Та же таблица
+    """
+    df['published_epoch'], df['published_year'], df['published_month'] = parse_column(df[column])
+    return df
@@ -0,0 +1,81 @@
+"""
+Модуль описывает схему CSV с вакансиями для чтения через pandas.
+
+Типы колонок задаются один раз: границы оклада и зарплата читаются как float64,
+повторяющиеся строковые колонки - как category (categories.CATEGORY_COLUMNS).
+Для каждого потребителя перечислены колонки, которые он использует, остальные
+колонки (например, описание и навыки) не разбираются. Если установлен pyarrow,
+файл читается движком pyarrow (кроме чтения по частям, которое он не поддерживает)
+"""
+
+import functools
+import importlib.util
+import pandas as pd
+import categories
+
+DTYPES = {'salary_from': 'float64', 'salary_to': 'float64', 'salary': 'float64', **categories.column_dtypes()}
+
+STATISTICS_COLUMNS = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
+# Потребитель -> колонки, которые он читает
+CONSUMER_COLUMNS = {
+    'report_out': STATISTICS_COLUMNS,
+    'partition': ['name', 'salary_from', 'salary_to', 'salary_currency', 'published_at'],
+    'multiproc_report_out': STATISTICS_COLUMNS,
+    'split_data': STATISTICS_COLUMNS,
+    'task3_3_2': STATISTICS_COLUMNS,
+    'task3_4_2': ['name', 'salary', 'area_name', 'published_at'],
+    'task3_5_2': STATISTICS_COLUMNS,
+}
+
+# Потребитель -> типы, отличающиеся от DTYPES. В файлах годов published_at - число,
+# а названия читаются как category, чтобы str.contains проверял каждое название один раз
+CONSUMER_DTYPES = {
+    'partition': {'name': 'category', 'published_at': 'int64'},
+}
+
+
+@functools.lru_cache(maxsize=None)
+def engine():
+    """
+    Функция выбирает движок pd.read_csv
+
+    Returns:
+        (str): pyarrow, если он установлен, иначе c
+    """
+    return 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+
+
+def dtypes(consumer):
+    """
+    Функция возвращает типы колонок потребителя
+
+    Args:
+        consumer (str): Потребитель из CONSUMER_COLUMNS
+
+    Returns:
+        (dict): Колонка -> тип
+
+    >>> dtypes('task3_4_2')
+    {'salary': 'float64', 'area_name': 'category'}
+    """
+    result = {column: DTYPES[column] for column in CONSUMER_COLUMNS[consumer] if column in DTYPES}
+    result.update(CONSUMER_DTYPES.get(consumer, {}))
+    return result
+
+
+def read_csv(file_name, consumer, **kwargs):
+    """
+    Функция читает колонки потребителя с заданными типами
+
+    Args:
+        file_name (str): Имя файла
+        consumer (str): Потребитель из CONSUMER_COLUMNS
+        **kwargs: Дополнительные параметры pd.read_csv
+
+    Returns:
+        (DataFrame): Таблица вакансий
+    """
+    if 'chunksize' not in kwargs and 'iterator' not in kwargs:
+        kwargs.setdefault('engine', engine())
+    return pd.read_csv(file_name, usecols=CONSUMER_COLUMNS[consumer], dtype=dtypes(consumer), **kwargs)
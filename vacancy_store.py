@@ -0,0 +1,438 @@
+"""
+Модуль хранит очищенный набор вакансий table_out на диске в виде, который
+открывается без чтения и очистки CSV.
+
+Хранилище - каталог рядом с файлом данных (vacancies.csv.store):
+    meta.json          - версия, ключ исходного файла, колонки и словари повторяющихся колонок
+    <колонка>.codes    - коды повторяющихся колонок (город, опыт, компания, валюта, премиум)
+    <колонка>.heap     - строки колонки подряд в UTF-8 и <колонка>.offsets - их смещения
+    <колонка>.rank     - порядковый номер строки колонки при сортировке строк
+    <колонка>.npy      - числовые колонки, которые готовит table_out для фильтров и сортировок
+    <список>.items     - коды элементов списков (навыков) и <список>.rows - номера их строк
+    <индекс>.keys, .starts, .postings - вторичный индекс равенства: отсортированные значения,
+                         границы и номера строк каждого значения (для кодов повторяющихся
+                         колонок, элементов списков и выбранных числовых колонок)
+    <интервал>.tree, .from_*, .to_* - дерево интервалов для поиска строк, в интервал
+                         которых попадает число (вилка оклада)
+
+Все массивы открываются через np.load(mmap_mode='r') или np.memmap, поэтому
+фильтрация и сортировка выполняются над отображенными в память массивами, а
+строки вакансий декодируются только для выводимых строк. Избирательные фильтры
+по индексам читают только номера подходящих строк
+"""
+
+import json
+import os
+import numpy as np
+import category_dictionary
+
+STORE_VERSION = 2
+# Узлы дерева интервалов с меньшим количеством интервалов не делятся и просматриваются целиком
+TREE_LEAF_SIZE = 64
+
+
+class VacancyStore:
+    """
+    Хранилище вакансий, отображенное в память
+
+    Attributes:
+        path (str): Каталог хранилища
+        row_count (int): Количество вакансий
+        columns (list): Колонки исходного файла
+        dictionaries (dict): Повторяющаяся колонка -> значения в порядке кодов
+        lists (dict): Колонка со списками -> значения элементов в порядке кодов
+    """
+    def __init__(self, path):
+        """
+        Конструктор открывает массивы хранилища
+
+        Args:
+            path (str): Каталог хранилища
+        """
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as file:
+            meta = json.load(file)
+        self.meta = meta
+        self.row_count = meta['row_count']
+        self.columns = meta['columns']
+        self.dictionaries = meta['dictionaries']
+        self.lists = meta['lists']
+        self.codes = {column: self.array(f'{column}.codes') for column in self.dictionaries}
+        self.offsets = {}
+        self.heaps = {}
+        for column in self.columns:
+            if column not in self.dictionaries:
+                self.offsets[column] = self.array(f'{column}.offsets')
+                heap = os.path.join(path, f'{column}.heap')
+                self.heaps[column] = np.memmap(heap, np.uint8, 'r') if os.path.getsize(heap) else np.zeros(0, np.uint8)
+
+    def array(self, name):
+        """
+        Метод открывает массив хранилища без чтения в память
+
+        Args:
+            name (str): Имя массива
+
+        Returns:
+            (ndarray): Массив, отображенный в память
+        """
+        return np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+
+    def string(self, column, row):
+        """
+        Метод возвращает значение колонки в строке
+
+        Args:
+            column (str): Колонка
+            row (int): Номер строки
+
+        Returns:
+            (str): Значение
+        """
+        if column in self.dictionaries:
+            return self.dictionaries[column][self.codes[column][row]]
+        offsets = self.offsets[column]
+        return bytes(self.heaps[column][offsets[row]:offsets[row + 1]]).decode('utf-8')
+
+    def row(self, row):
+        """
+        Метод возвращает строку в виде словаря, как DataSet.csv_filter
+
+        Args:
+            row (int): Номер строки
+
+        Returns:
+            (dict): Колонка -> значение
+        """
+        return {column: self.string(column, int(row)) for column in self.columns}
+
+    def equal_rows(self, column, value):
+        """
+        Метод находит строки, в которых значение колонки равно value. Для
+        повторяющихся колонок строки берутся из индекса, для остальных сравниваются
+        байты строк одинаковой длины
+
+        Args:
+            column (str): Колонка
+            value (str): Значение
+
+        Returns:
+            (ndarray): Номера строк по возрастанию
+        """
+        if column in self.dictionaries:
+            return self.code_rows(column, [value])
+        target = value.encode('utf-8')
+        offsets = np.asarray(self.offsets[column])
+        heap = self.heaps[column]
+        rows = np.flatnonzero(np.diff(offsets) == len(target))
+        return rows[[bytes(heap[offsets[row]:offsets[row + 1]]) == target for row in rows]]
+
+    def postings(self, name, key):
+        """
+        Метод возвращает строки со значением key по индексу равенства
+
+        Args:
+            name (str): Имя индекса
+            key (int): Значение (код или число)
+
+        Returns:
+            (ndarray): Номера строк по возрастанию
+        """
+        keys = self.array(f'{name}.keys')
+        i = np.searchsorted(keys, key)
+        if i == len(keys) or keys[i] != key:
+            return np.zeros(0, dtype=np.int64)
+        starts = self.array(f'{name}.starts')
+        return self.array(f'{name}.postings')[starts[i]:starts[i + 1]]
+
+    def code_rows(self, column, values):
+        """
+        Метод находит строки повторяющейся колонки со значением из списка
+
+        Args:
+            column (str): Повторяющаяся колонка
+            values (iterable): Значения
+
+        Returns:
+            (ndarray): Номера строк по возрастанию
+        """
+        values = set(values)
+        parts = [self.postings(column, code) for code, value in enumerate(self.dictionaries[column]) if value in values]
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    def list_rows(self, column, values):
+        """
+        Метод находит строки, в списке которых есть все элементы: пересекаются
+        индексы элементов, начиная с самого короткого
+
+        Args:
+            column (str): Колонка со списками
+            values (list): Элементы
+
+        Returns:
+            (ndarray): Номера строк по возрастанию
+        """
+        codes = []
+        for value in values:
+            if value not in self.lists[column]:
+                return np.zeros(0, dtype=np.int64)
+            codes.append(self.lists[column].index(value))
+        parts = sorted((np.asarray(self.postings(column, code)) for code in codes), key=len)
+        # Элемент может повторяться в списке строки, повторы номеров строк идут подряд
+        rows = parts[0][np.append(True, np.diff(parts[0]) != 0)] if len(parts[0]) else parts[0]
+        for part in parts[1:]:
+            # Индексы отсортированы, поэтому каждая строка ищется двоичным поиском
+            found = np.searchsorted(part, rows)
+            inside = found < len(part)
+            inside[inside] = part[found[inside]] == rows[inside]
+            rows = rows[inside]
+        return rows
+
+    def interval_rows(self, name, point):
+        """
+        Метод находит строки, интервал которых [from, to] содержит число, по дереву
+        интервалов. В каждом узле подходящие интервалы образуют непрерывный отрезок
+        отсортированного массива, поэтому просматриваются только подходящие строки и
+        один лист дерева
+
+        Args:
+            name (str): Имя дерева интервалов
+            point (int): Число
+
+        Returns:
+            (ndarray): Номера строк по возрастанию
+        """
+        tree = self.array(f'{name}.tree')
+        from_values, from_rows = self.array(f'{name}.from_values'), self.array(f'{name}.from_rows')
+        to_values, to_rows = self.array(f'{name}.to_values'), self.array(f'{name}.to_rows')
+        parts = []
+        node = 0 if len(tree) > 1 else -1
+        while node >= 0:
+            center, left, right, leaf, start = tree[node]
+            end = tree[node + 1][4]
+            if leaf:
+                # Интервалы листа хранятся в обоих массивах в одном порядке
+                match = (from_values[start:end] <= point) & (-to_values[start:end] >= point)
+                parts.append(from_rows[start:end][match])
+                break
+            if point < center:
+                count = np.searchsorted(from_values[start:end], point, side='right')
+                parts.append(from_rows[start:start + count])
+                node = left
+            elif point > center:
+                # Концы интервалов хранятся со знаком минус, чтобы массив был отсортирован по возрастанию
+                count = np.searchsorted(to_values[start:end], -point, side='right')
+                parts.append(to_rows[start:start + count])
+                node = right
+            else:
+                parts.append(from_rows[start:end])
+                break
+        return np.sort(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    def rank(self, column):
+        """
+        Метод возвращает порядковые номера значений колонки при сортировке строк:
+        равные строки получают равные номера
+
+        Args:
+            column (str): Колонка
+
+        Returns:
+            (ndarray): Номер значения в каждой строке
+        """
+        if column in self.dictionaries:
+            values = self.dictionaries[column]
+            order = {value: i for i, value in enumerate(sorted(values))}
+            return np.array([order[value] for value in values], dtype=np.int64)[self.codes[column]]
+        return self.array(f'{column}.rank')
+
+    @staticmethod
+    def store_path(file_name):
+        """
+        Метод возвращает каталог хранилища для файла данных
+
+        Args:
+            file_name (str): Имя файла данных
+
+        Returns:
+            (str): Каталог хранилища
+        """
+        return file_name + '.store'
+
+    @staticmethod
+    def source_key(file_name):
+        """
+        Метод возвращает ключ, по которому проверяется актуальность хранилища
+
+        Args:
+            file_name (str): Имя файла данных
+
+        Returns:
+            (list): Версия хранилища, размер и время изменения файла
+        """
+        stat = os.stat(file_name)
+        return [STORE_VERSION, stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def load(file_name):
+        """
+        Метод открывает хранилище, если оно существует и соответствует файлу данных
+
+        Args:
+            file_name (str): Имя файла данных
+
+        Returns:
+            (VacancyStore or None): Хранилище или None, если его нужно построить заново
+        """
+        path = VacancyStore.store_path(file_name)
+        meta = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta):
+            return None
+        with open(meta, encoding='utf-8') as file:
+            if json.load(file).get('source') != VacancyStore.source_key(file_name):
+                return None
+        return VacancyStore(path)
+
+    @staticmethod
+    def write_postings(path, name, keys, rows=None):
+        """
+        Метод записывает индекс равенства: строки, сгруппированные по значению
+
+        Args:
+            path (str): Каталог хранилища
+            name (str): Имя индекса
+            keys (ndarray): Значение каждой строки (или элемента списка)
+            rows (ndarray or None): Номер строки каждого значения, если значения - элементы списков
+        """
+        keys = np.asarray(keys)
+        rows = np.arange(len(keys), dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        # Устойчивая сортировка оставляет строки каждого значения по возрастанию
+        order = np.argsort(keys, kind='stable')
+        unique_keys, starts = np.unique(keys[order], return_index=True)
+        np.save(os.path.join(path, f'{name}.keys.npy'), unique_keys)
+        np.save(os.path.join(path, f'{name}.starts.npy'), np.append(starts, len(keys)).astype(np.int64))
+        np.save(os.path.join(path, f'{name}.postings.npy'), rows[order])
+
+    @staticmethod
+    def write_intervals(path, name, starts, ends):
+        """
+        Метод записывает дерево интервалов [starts, ends]. В узле хранятся интервалы,
+        содержащие центр узла (медиану концов интервалов), отсортированные по началу и
+        по концу; интервалы левее и правее центра уходят в дочерние узлы. Пустые
+        интервалы (начало больше конца) не содержат ни одного числа и не сохраняются
+
+        Args:
+            path (str): Каталог хранилища
+            name (str): Имя дерева
+            starts (ndarray): Начала интервалов (целые числа)
+            ends (ndarray): Концы интервалов
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        nodes, from_parts, to_parts = [], [], []
+
+        def add_node(rows):
+            node = len(nodes)
+            nodes.append(None)
+            if len(rows) <= TREE_LEAF_SIZE:
+                nodes[node] = [0, -1, -1, 1]
+                from_parts.append(rows)
+                to_parts.append(rows)
+                return node
+            bounds = np.concatenate((starts[rows], ends[rows]))
+            center = np.partition(bounds, len(bounds) // 2)[len(bounds) // 2]
+            inside = (starts[rows] <= center) & (ends[rows] >= center)
+            node_rows = rows[inside]
+            from_parts.append(node_rows[np.argsort(starts[node_rows], kind='stable')])
+            to_parts.append(node_rows[np.argsort(-ends[node_rows], kind='stable')])
+            left, right = rows[ends[rows] < center], rows[starts[rows] > center]
+            nodes[node] = [center, add_node(left) if len(left) else -1, add_node(right) if len(right) else -1, 0]
+            return node
+
+        valid = np.flatnonzero(starts <= ends)
+        if len(valid):
+            add_node(valid)
+        sizes = np.array([len(part) for part in from_parts], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        # Строка узла: центр, левый и правый узлы, признак листа, начало интервалов узла в массивах from и to
+        tree = np.zeros((len(nodes) + 1, 5), dtype=np.int64)
+        if nodes:
+            tree[:-1, :4] = nodes
+        tree[:, 4] = offsets
+        from_rows = np.concatenate(from_parts) if from_parts else np.zeros(0, dtype=np.int64)
+        to_rows = np.concatenate(to_parts) if to_parts else np.zeros(0, dtype=np.int64)
+        np.save(os.path.join(path, f'{name}.tree.npy'), tree)
+        np.save(os.path.join(path, f'{name}.from_rows.npy'), from_rows)
+        np.save(os.path.join(path, f'{name}.from_values.npy'), starts[from_rows])
+        np.save(os.path.join(path, f'{name}.to_rows.npy'), to_rows)
+        np.save(os.path.join(path, f'{name}.to_values.npy'), -ends[to_rows])
+
+    @staticmethod
+    def build(file_name, columns, rows, numeric=None, lists=None, indexes=(), intervals=None):
+        """
+        Метод записывает хранилище рядом с файлом данных. Для повторяющихся колонок
+        и списков всегда строятся индексы равенства
+
+        Args:
+            file_name (str): Имя файла данных
+            columns (list): Колонки
+            rows (list): Строки в виде словарей колонка -> строка
+            numeric (dict or None): Имя -> числовой массив длиной len(rows)
+            lists (dict or None): Имя -> список списков строк (например, навыков) для каждой строки
+            indexes (iterable): Числовые колонки, для которых строятся индексы равенства
+            intervals (dict or None): Имя дерева интервалов -> (числовая колонка начал, числовая колонка концов)
+
+        Returns:
+            (VacancyStore): Открытое хранилище
+        """
+        path = VacancyStore.store_path(file_name)
+        os.makedirs(path, exist_ok=True)
+        # meta.json пишется последним: пока его нет, хранилище считается неготовым
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            os.remove(os.path.join(path, 'meta.json'))
+
+        dictionaries = {}
+        for column in columns:
+            values = [row[column] for row in rows]
+            if column in category_dictionary.CATEGORY_COLUMNS:
+                dictionary = category_dictionary.Dictionary()
+                codes = np.array([dictionary.encode(value) for value in values], dtype=np.int32)
+                np.save(os.path.join(path, f'{column}.codes.npy'), codes)
+                VacancyStore.write_postings(path, column, codes)
+                dictionaries[column] = dictionary.values
+                continue
+            encoded = [value.encode('utf-8') for value in values]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            with open(os.path.join(path, f'{column}.heap'), 'wb') as file:
+                file.write(b''.join(encoded))
+            np.save(os.path.join(path, f'{column}.offsets.npy'), offsets)
+            # np.unique сортирует строки так же, как sorted
+            rank = np.unique(np.array(values, dtype=object), return_inverse=True)[1] if values else []
+            np.save(os.path.join(path, f'{column}.rank.npy'), np.asarray(rank, dtype=np.int64).ravel())
+
+        numeric = numeric or {}
+        for name, values in numeric.items():
+            np.save(os.path.join(path, f'{name}.npy'), np.asarray(values))
+        for name in indexes:
+            VacancyStore.write_postings(path, name, numeric[name])
+        for name, (starts, ends) in (intervals or {}).items():
+            VacancyStore.write_intervals(path, name, numeric[starts], numeric[ends])
+
+        list_values = {}
+        for name, items in (lists or {}).items():
+            dictionary = category_dictionary.Dictionary()
+            codes = np.array([dictionary.encode(value) for row_items in items for value in row_items], dtype=np.int32)
+            item_rows = np.repeat(np.arange(len(items), dtype=np.int64), [len(row_items) for row_items in items])
+            np.save(os.path.join(path, f'{name}.items.npy'), codes)
+            np.save(os.path.join(path, f'{name}.rows.npy'), item_rows)
+            VacancyStore.write_postings(path, name, codes, item_rows)
+            list_values[name] = dictionary.values
+
+        meta = {'source': VacancyStore.source_key(file_name), 'row_count': len(rows), 'columns': list(columns),
+                'dictionaries': dictionaries, 'lists': list_values}
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump(meta, file, ensure_ascii=False)
+        return VacancyStore(path)